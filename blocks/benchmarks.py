@@ -0,0 +1,66 @@
+"""
+CSV table renderer benchmark, stdlib csv backend against pandas Styler backend.
+Run with ./manage.py benchmark_csv_table, results are written as JSON like core.benchmarks.
+"""
+import os
+import platform
+import subprocess
+import sys
+import time
+from itertools import cycle, islice
+
+from django.conf import settings
+
+from core.benchmarks import measure
+
+from .csv_renderer import render_csv_table
+from .views.csv_table import pd, render_html_table_pandas
+
+DEFAULT_ROWS = [20, 100, 1_000, 5_000]
+DEFAULT_FILE = os.path.join(settings.BASE_DIR, "040.csv")
+
+
+def scaled_csv(path, rows):
+    """Return the csv at path with its data rows repeated to make rows rows"""
+    with open(path, newline="") as file:
+        header, *lines = file.read().splitlines()
+    return "\n".join([header, *islice(cycle(lines), rows)])
+
+
+def import_time(module):
+    """Seconds for a fresh interpreter to import module"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return round(time.perf_counter() - start, 3)
+
+
+def run_csv_table_benchmark(path=DEFAULT_FILE, rows=None, samples=20):
+    """Render path scaled to each row count with each backend, returns a JSON serialisable report"""
+    backends = {"csv": render_csv_table}
+    if pd is not None:
+        backends["pandas"] = render_html_table_pandas
+
+    results = []
+    for size in rows or DEFAULT_ROWS:
+        table_block = {
+            "data": scaled_csv(path, size),
+            "precision": 2,
+            "column_headers": True,
+            "row_headers": False,
+            "compact": True,
+        }
+        for name, render in backends.items():
+            results.append(measure(f"render_{name}", size, samples, lambda n: render(table_block)))
+
+    return {
+        "benchmark": "csv_table",
+        "file": os.path.basename(path),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "import_seconds": {
+            "csv": import_time("csv"),
+            **({"pandas": import_time("pandas, bs4")} if pd is not None else {}),
+        },
+        "results": results,
+    }
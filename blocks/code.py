@@ -68,6 +68,7 @@ class BlogCodeBlock(StructBlock):
         label = _("Code Block")
         label_format = _("Code") + ": {language}"
         form_classname = "struct-block code-block"
+        text_fields = ()
 
 
 class CodeBlockAdapter(StructBlockAdapter):
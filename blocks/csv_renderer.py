@@ -0,0 +1,274 @@
+"""
+Pandas-free CSV table renderer for CSVTableBlock.
+Produces the same table markup as the pandas Styler backend (blocks.views.csv_table.render_html_table_pandas)
+without the random element ids and empty style element, using the stdlib csv module.
+
+Column types follow pandas read_csv + convert_dtypes:
+    - boolean: every value True/TRUE/true/False/FALSE/false
+    - integer: every value an integer, or a float with no fractional part (1.0, 1e3)
+    - float: every value numeric, formatted to the block precision
+    - string: anything else, right aligned if every value looks like currency (is_currency_column)
+Empty and NA values (pandas default na_values) are rendered as empty cells and ignored for typing.
+Boolean, integer and float columns are right aligned.
+"""
+import csv
+import math
+import re
+from html import escape
+from io import StringIO
+
+NA_VALUES = frozenset((
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+))
+TRUE_VALUES = frozenset(("True", "TRUE", "true"))
+FALSE_VALUES = frozenset(("False", "FALSE", "false"))
+RE_INTEGER = re.compile(r"[+-]?\d+")
+RE_FLOAT = re.compile(r"[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf|infinity)", re.IGNORECASE)
+RE_CURRENCY = re.compile(r"^\s*[+-]?\s*\$?\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*$")
+RE_CURRENCY_SYMBOLS = re.compile(r"[\s$,]")
+
+BOOLEAN, INTEGER, FLOAT, STRING = "boolean", "integer", "float", "string"
+
+# index (row header) floats use the Styler default precision
+INDEX_PRECISION = 6
+
+
+def is_na(value):
+    return value in NA_VALUES
+
+
+def infer_column_type(values):
+    """Return the column type for a list of raw csv values"""
+    values = [value.strip() for value in values if not is_na(value)]
+    if not values:
+        # all NA, pandas types this as Int64
+        return INTEGER
+    if all(value in TRUE_VALUES or value in FALSE_VALUES for value in values):
+        return BOOLEAN
+    if all(map(RE_INTEGER.fullmatch, values)):
+        return INTEGER
+    if all(map(RE_FLOAT.fullmatch, values)):
+        floats = [float(value) for value in values]
+        if all(math.isfinite(value) and value.is_integer() for value in floats):
+            return INTEGER
+        return FLOAT
+    return STRING
+
+
+def infer_index_type(values):
+    """
+    Column type for the row header column: pandas doesn't convert_dtypes the index, integral floats and
+    integers with NA values stay float
+    """
+    column_type = infer_column_type(values)
+    if column_type == INTEGER and not all(RE_INTEGER.fullmatch(value.strip()) for value in values):
+        return FLOAT
+    return column_type
+
+
+def is_currency_values(values):
+    """is_currency_column for raw csv values: every non-empty value matches the currency pattern"""
+    values = [value for value in values if not is_na(value)]
+    return all(map(RE_CURRENCY.match, values))
+
+
+def format_value(value, column_type, precision):
+    if is_na(value):
+        return ""
+    if column_type == BOOLEAN:
+        return "True" if value.strip() in TRUE_VALUES else "False"
+    if column_type == INTEGER:
+        value = value.strip()
+        return str(int(value)) if RE_INTEGER.fullmatch(value) else str(int(float(value)))
+    if column_type == FLOAT:
+        return f"{float(value):.{precision}f}"
+    return value
+
+
+def column_names(header):
+    """Column labels as pandas names them: blank headers become 'Unnamed: n', duplicates get .1, .2 suffixes"""
+    names = []
+    seen = {}
+    for index, name in enumerate(header):
+        name = name or f"Unnamed: {index}"
+        label = name
+        while label in seen:
+            seen[name] += 1
+            label = f"{name}.{seen[name]}"
+        seen.setdefault(label, 0)
+        names.append(label)
+    return names
+
+
+def read_csv(data, column_headers=True):
+    """
+    Return (header, rows) from csv text, header is None without column headers.
+    Blank lines are skipped and short rows padded, rows longer than the header are an error as in pandas.
+    """
+    rows = [row for row in csv.reader(StringIO(data)) if row]
+    if not rows:
+        raise ValueError("No columns to parse from file")
+    header = rows.pop(0) if column_headers else None
+    width = len(header) if header is not None else len(rows[0])
+    for line, row in enumerate(rows, start=2 if column_headers else 1):
+        if len(row) > width:
+            raise ValueError(f"Error tokenizing data. Expected {width} fields in line {line}, saw {len(row)}")
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+    return header, rows
+
+
+def parse_table(table_block):
+    """
+    Parse table_block data into a columnar table:
+    names (column labels or None), index_name, types, right_align and columns (raw values per column).
+    With row headers the first column is the index, it stays in the column lists.
+    """
+    column_headers = table_block["column_headers"]
+    header, rows = read_csv(table_block["data"], column_headers)
+    columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in header or []]
+    types = [
+        infer_index_type(column) if table_block["row_headers"] and col == 0 else infer_column_type(column)
+        for col, column in enumerate(columns)
+    ]
+    return {
+        "names": column_names(header) if header is not None else None,
+        # pandas drops the index name if the header was blank
+        "index_name": header[0] if table_block["row_headers"] and header and header[0] else None,
+        "row_headers": bool(table_block["row_headers"]),
+        "precision": int(table_block["precision"]),
+        "types": types,
+        "right_align": [
+            column_type != STRING or is_currency_values(column)
+            for column, column_type in zip(columns, types)
+        ],
+        "columns": columns,
+        "row_count": len(rows),
+    }
+
+
+def sort_key(value, column_type, currency=False):
+    # NA last, numbers and currency by value, strings case insensitive
+    if is_na(value):
+        return (1, 0)
+    if column_type in (INTEGER, FLOAT):
+        return (0, float(value))
+    if currency:
+        return (0, float(RE_CURRENCY_SYMBOLS.sub("", value)))
+    if column_type == BOOLEAN:
+        return (0, value.strip() in TRUE_VALUES)
+    return (0, value.casefold())
+
+
+def format_table_rows(table, row_numbers):
+    """Rows of a parsed table as lists of formatted cells"""
+    columns, types = table["columns"], table["types"]
+    cell_precision = [
+        INDEX_PRECISION if table["row_headers"] and col == 0 else table["precision"] for col in range(len(columns))
+    ]
+    return [
+        [
+            format_value(column[row_number], column_type, cell_precision[col])
+            for col, (column, column_type) in enumerate(zip(columns, types))
+        ]
+        for row_number in row_numbers
+    ]
+
+
+def match_table_rows(table, sort=None, descending=False, query=None):
+    """
+    Row numbers of a parsed table in display order.
+    sort is a column number (the index is column 0 with row headers), query filters rows containing the text.
+    """
+    columns, types = table["columns"], table["types"]
+    row_numbers = range(table["row_count"])
+    if query:
+        query = query.casefold()
+        row_numbers = [
+            row_number for row_number, row in zip(row_numbers, format_table_rows(table, row_numbers))
+            if any(query in cell.casefold() for cell in row)
+        ]
+    if sort is not None and 0 <= sort < len(columns):
+        column, column_type = columns[sort], types[sort]
+        currency = column_type == STRING and table["right_align"][sort]
+        na_rows = [row_number for row_number in row_numbers if is_na(column[row_number])]
+        rows = sorted(
+            (row_number for row_number in row_numbers if not is_na(column[row_number])),
+            key=lambda row_number: sort_key(column[row_number], column_type, currency),
+            reverse=descending,
+        )
+        # NA rows always last
+        row_numbers = rows + na_rows
+    return list(row_numbers)
+
+
+def table_rows(table, offset=0, limit=100, sort=None, descending=False, query=None, row_numbers=None):
+    """
+    Return (matching row count, rows) for a page of a parsed table, rows are lists of formatted cells.
+    Arguments as match_table_rows, or pass row_numbers already matched.
+    """
+    if row_numbers is None:
+        row_numbers = match_table_rows(table, sort, descending, query)
+    return len(row_numbers), format_table_rows(table, row_numbers[offset:offset + limit])
+
+
+def render_csv_table(table_block):
+    """
+    Render table_block (data, precision, column_headers, row_headers, compact) as an html table.
+    If table_block has inline_rows, only that many rows are rendered (large table mode).
+    """
+    column_headers = table_block["column_headers"]
+    table = parse_table(table_block)
+    precision = table["precision"]
+    columns, types, right_align = table["columns"], table["types"], table["right_align"]
+    names, index_name = table["names"], table["index_name"]
+
+    index = None
+    if table["row_headers"]:
+        index = (columns[0], types[0])
+        columns, types, right_align = columns[1:], types[1:], right_align[1:]
+        names = names[1:] if names is not None else None
+
+    classes = "csv-table table table-striped table-hover"
+    if table_block["compact"]:
+        classes += " table-sm"
+    if column_headers:
+        classes += " csv-table-column-headers"
+    if index:
+        classes += " csv-table-row-headers"
+
+    html = [f'<table class="{classes}">']
+
+    if column_headers:
+        html.append("<thead><tr>")
+        if index:
+            html.append('<th class="blank level0">&nbsp;</th>')
+        for col, name in enumerate(names):
+            align = " csv-table-right-align" if right_align[col] else ""
+            html.append(f'<th class="col_heading level0 col{col}{align}">{escape(name, False)}</th>')
+        html.append("</tr>")
+        if index and index_name is not None:
+            html.append(f'<tr><th class="index_name level0">{escape(index_name, False)}</th>')
+            html.extend(f'<th class="blank col{col}">&nbsp;</th>' for col in range(len(names)))
+            html.append("</tr>")
+        html.append('</thead><tbody class="table-group-divider">')
+    else:
+        html.append("<tbody>")
+
+    row_count = table["row_count"]
+    if table_block.get("inline_rows"):
+        row_count = min(row_count, table_block["inline_rows"])
+    for row_number in range(row_count):
+        html.append("<tr>")
+        if index:
+            value = format_value(index[0][row_number], index[1], INDEX_PRECISION)
+            html.append(f'<th class="row_heading level0 row{row_number}">{escape(value, False)}</th>')
+        for col, column in enumerate(columns):
+            value = format_value(column[row_number], types[col], precision)
+            align = " csv-table-right-align" if right_align[col] else ""
+            html.append(f'<td class="data row{row_number} col{col}{align}">{escape(value, False)}</td>')
+        html.append("</tr>")
+
+    html.append("</tbody></table>")
+    return "".join(html)
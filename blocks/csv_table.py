@@ -1,3 +1,12 @@
+import csv
+import hashlib
+import json
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from wagtail.blocks import BooleanBlock, RichTextBlock, StructBlock
@@ -6,11 +15,109 @@ from wagtail.blocks.struct_block import (StructBlockAdapter,
                                          StructBlockValidationError)
 from wagtail.admin.telepath import register
 
+from core.streamfield_text import html_to_text, iter_block_text
+
 from .choices import TextAlignmentChoiceBlock
 from .heading import HeadingBlock
-from .hidden import HiddenBooleanBlock, HiddenCharBlock
+from .hidden import HiddenBooleanBlock, HiddenCharBlock, HiddenIntegerBlock
 from .import_text import ImportTextBlock
 
+# Increment when the table html produced by blocks.views.csv_table changes,
+# stored tables with an older version are re-rendered (rerender_csv_tables command)
+CSV_TABLE_RENDERER_VERSION = 3
+
+
+def get_inline_rows():
+    # large table mode: tables with more rows render this many inline, the rest are fetched from CSVTableRows
+    return getattr(settings, "CSV_TABLE_INLINE_ROWS", 200)
+
+def get_cache_timeout():
+    return getattr(settings, "CSV_TABLE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def get_table_options(value):
+    """Table render options from a block value or proxy POST data, normalised for hashing"""
+    return {
+        # browsers submit textarea newlines as \r\n and the form field strips whitespace
+        "data": (value.get("data") or "").replace("\r\n", "\n").strip(),
+        "precision": int(value.get("precision") or 0),
+        "column_headers": bool(value.get("column_headers")),
+        "row_headers": bool(value.get("row_headers")),
+        "compact": bool(value.get("compact")),
+    }
+
+def get_render_options(value):
+    # deployment settings are kept out of the content hash, changing them doesn't invalidate stored html
+    return {**get_table_options(value), "inline_rows": get_inline_rows()}
+
+def count_html_rows(html):
+    """Number of body rows in rendered table html"""
+    return html[html.find("<tbody"):].count("<tr")
+
+def get_table_hash(value):
+    """Content hash of the data and options that determine the rendered table html"""
+    options = json.dumps(get_table_options(value), sort_keys=True)
+    return hashlib.sha256(f"{CSV_TABLE_RENDERER_VERSION}:{options}".encode()).hexdigest()
+
+def has_current_html(value):
+    """True if the stored html was rendered from the block's current data/options by the current renderer"""
+    return bool(
+        value.get("html")
+        and value.get("html_version") == CSV_TABLE_RENDERER_VERSION
+        and value.get("html_hash") == get_table_hash(value)
+    )
+
+def render_table_html(value):
+    # imported here so page rendering doesn't load the renderer for tables with current stored html
+    # rendered synchronously, the preview pool and its limits are for the admin preview proxy only
+    from .views.csv_table import render_table_now
+    return render_table_now(value)
+
+def get_table_html(value):
+    """
+    Return the table html for a block value.
+    The stored html is used when its hash matches, stale tables are re-rendered and cached by hash.
+    """
+    if has_current_html(value):
+        return value["html"]
+    table_hash = get_table_hash(value)
+    return cache.get_or_set(f"csv-table-{table_hash}", lambda: render_table_html(value), get_cache_timeout())
+
+def get_table_columns(value, table_hash=None):
+    """Parsed columnar table for a block value (blocks.csv_renderer.parse_table), cached by hash"""
+    from .csv_renderer import parse_table
+    return cache.get_or_set(
+        f"csv-table-columns-{table_hash or get_table_hash(value)}",
+        lambda: parse_table(get_table_options(value)),
+        get_cache_timeout(),
+    )
+
+def get_large_table(value, page=None, table_html=None):
+    """
+    Large table mode details for the template if table_html (rendered with CSV_TABLE_INLINE_ROWS at the time)
+    has fewer rows than value, else None.
+    Rows beyond the inline rows are served by the csv-table-rows endpoint for the live page.
+    """
+    if not page:
+        return None
+    table_html = table_html if table_html is not None else get_table_html(value)
+    if not table_html:
+        return None
+    inline_rows = count_html_rows(table_html)
+    # line count (less the header line) is an upper bound for the row count, avoids parsing small tables
+    options = get_table_options(value)
+    if options["data"].count("\n") + 1 - options["column_headers"] <= inline_rows:
+        return None
+    table_hash = get_table_hash(value)
+    table = get_table_columns(value, table_hash)
+    if table["row_count"] <= inline_rows:
+        return None
+    return {
+        "total_rows": table["row_count"],
+        "inline_rows": inline_rows,
+        "rows_url": reverse("csv-table-rows", args=[page.pk, table_hash]),
+    }
+
 
 class CSVTableBlock(StructBlock):
     title = HeadingBlock(
@@ -62,6 +169,8 @@ class CSVTableBlock(StructBlock):
         required=False,
     )
     html = HiddenCharBlock()
+    html_hash = HiddenCharBlock()
+    html_version = HiddenIntegerBlock()
     rendered = HiddenBooleanBlock(default=True)
 
     class Meta:
@@ -70,11 +179,44 @@ class CSVTableBlock(StructBlock):
         label = "CSV Table"
         form_classname = "struct-block flex-block csv-table-block"
 
+    def get_raw_text(self, value, strip_tags):
+        """
+        Text for core.streamfield_text: title, table cells read from the csv data and caption.
+        The hidden pre-rendered html is ignored.
+        """
+        yield from iter_block_text(self.child_blocks["title"], value.get("title"), strip_tags)
+        for row in csv.reader(StringIO(value.get("data") or "")):
+            yield from (cell for cell in row if cell)
+        yield html_to_text(value.get("caption"), strip_tags)
+
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        try:
+            context["table_html"] = get_table_html(value)
+            context["large_table"] = get_large_table(
+                value, (parent_context or {}).get("page"), context["table_html"]
+            )
+        except Exception as e:
+            print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+            context["table_html"] = ""
+        return context
+
     def clean(self, value):
         rendered = value.get('rendered')
         if not rendered:
             raise StructBlockValidationError(non_block_errors=['There was an error rendering the CSV table.'])
-        return super().clean(value)
+        value = super().clean(value)
+        if not has_current_html(value):
+            # html missing or rendered from other data/options (e.g. edited during the preview debounce)
+            from .views.csv_table import check_table_limits
+            try:
+                check_table_limits(get_table_options(value)["data"])
+                value["html"] = render_table_html(value)
+            except Exception as e:
+                raise StructBlockValidationError(block_errors={'data': ValidationError(str(e))})
+            value["html_hash"] = get_table_hash(value)
+            value["html_version"] = CSV_TABLE_RENDERER_VERSION
+        return value
     
 class CSVTableBlockAdapter(StructBlockAdapter):
     js_constructor = "blocks.csv_table.CSVTableBlock"
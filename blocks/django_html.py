@@ -7,6 +7,7 @@ class DjangoTemplateFragmentBlock(StructBlock):
     )
     class Meta:
         template='blocks/django_code_block.html'
+        text_fields = ()
         icon = 'laptop-code'
         label = _("Django Fragment")
         label_format = label
\ No newline at end of file
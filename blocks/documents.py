@@ -48,6 +48,7 @@ class DocumentBlock(StructBlock):
         label = _("Document Block")
         label_format = _("Document") +": {link_label}"
         form_classname = 'struct-block flex-block document-block'
+        text_fields = ("link_label",)
 
     
 class DocumentListSortChoiceBlock(DefaultChoiceBlock):
@@ -103,3 +104,4 @@ class DocumentListBlock(StructBlock):
         label = "Document List"
         label_format = label
         form_classname = 'struct-block flex-block document-list-block'
+        text_fields = ()
@@ -22,6 +22,7 @@ class ExternalLinkEmbedBlock(StructBlock):
         template='blocks/external_link_embed.html',
         icon = 'link-external'
         label = _("Embed External Article")
+        text_fields = ("description",)
     
 class ExternalLinkEmbedBlockAdapter(StructBlockAdapter):
     js_constructor = "blocks.models.ExternalLinkEmbedBlock"
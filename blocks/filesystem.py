@@ -52,6 +52,7 @@ class LinkBlock(StructBlock):
     class Meta:
         icon = 'link'
         value_class = LinkBlockValue
+        text_fields = ("name",)
 
 
 class FolderContents(StreamBlock):
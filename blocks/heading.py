@@ -47,6 +47,7 @@ class HeadingBlock(StructBlock):
         label = _("Heading Block")
         form_classname = "struct-block heading-block"
         icon = 'title'
+        text_fields = ("title",)
 
     def clean(self, value):
         errors = {}
@@ -1,4 +1,4 @@
-from wagtail.blocks import CharBlock, TextBlock, BooleanBlock
+from wagtail.blocks import CharBlock, TextBlock, BooleanBlock, IntegerBlock
 
 class HiddenBlockMixin:
     def __init__(self, attrs={}, **kwargs):
@@ -17,4 +17,7 @@ class HiddenTextBlock(HiddenBlockMixin, TextBlock):
     pass
 
 class HiddenBooleanBlock(HiddenBlockMixin, BooleanBlock):
-    pass
\ No newline at end of file
+    pass
+
+class HiddenIntegerBlock(HiddenBlockMixin, IntegerBlock):
+    pass
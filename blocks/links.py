@@ -209,6 +209,7 @@ class LinkBlock(StructBlock):
         icon = "link"
         form_classname = "struct-block link-block"
         label_format = _("Link")
+        text_fields = ("link_text",)
 
     def clean(self, value):
         errors = {}
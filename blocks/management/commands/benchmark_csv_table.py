@@ -0,0 +1,25 @@
+import json
+
+from django.core.management import BaseCommand
+
+from blocks.benchmarks import DEFAULT_FILE, DEFAULT_ROWS, run_csv_table_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark the stdlib csv and pandas CSV table renderers on 040.csv style data, output JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", default=DEFAULT_FILE, help="CSV file, data rows are repeated to each size")
+        parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+        parser.add_argument("--samples", type=int, default=20, help="Renders per backend per size")
+        parser.add_argument("--output", default=None, help="Write JSON to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        report = run_csv_table_benchmark(path=options["file"], rows=options["rows"], samples=options["samples"])
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stdout.write(f"Benchmark results written to {options['output']}")
+        else:
+            self.stdout.write(output)
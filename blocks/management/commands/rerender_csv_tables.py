@@ -0,0 +1,58 @@
+from django.core.management import BaseCommand
+from wagtail.blocks.stream_block import StreamValue
+from wagtail.models import Page, get_page_models
+
+from blocks.csv_table import (CSV_TABLE_RENDERER_VERSION, CSVTableBlock,
+                              get_table_hash, has_current_html,
+                              render_table_html)
+from core.block_usage import BlockUsage, get_streamfields, iter_block_usage
+
+
+def rerender_stream(stream_value, force=False):
+    """
+    Re-render stale CSVTableBlock html in the raw data of stream_value.
+    Returns (raw stream data, number of tables re-rendered).
+    """
+    raw_data = stream_value.get_prep_value()
+    count = 0
+    for path, block, value in iter_block_usage(stream_value.stream_block, raw_data):
+        if isinstance(block, CSVTableBlock) and (force or not has_current_html(value)):
+            value["html"] = render_table_html(value)
+            value["html_hash"] = get_table_hash(value)
+            value["html_version"] = CSV_TABLE_RENDERER_VERSION
+            value["rendered"] = True
+            count += 1
+    return raw_data, count
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render stored CSV table html rendered by an older renderer version or from outdated data. "
+        "Updates live page content in place, no revisions are created."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Scan every page instead of the block usage index")
+        parser.add_argument("--force", action="store_true", help="Re-render tables with current html")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            models = [model for model in get_page_models() if get_streamfields(model)]
+            pages = Page.objects.type(*models) if models else Page.objects.none()
+        else:
+            pages = BlockUsage.objects.for_block_class(CSVTableBlock).pages()
+
+        page_count = table_count = 0
+        for page in pages.specific().iterator(chunk_size=100):
+            changes = {}
+            for field in get_streamfields(page.__class__):
+                raw_data, count = rerender_stream(getattr(page, field.name), options["force"])
+                if count:
+                    changes[field.name] = StreamValue(field.stream_block, raw_data, is_lazy=True)
+                    table_count += count
+            if changes:
+                page.__class__.objects.filter(pk=page.pk).update(**changes)
+                page_count += 1
+                self.stdout.write(f"{page.title}: {', '.join(changes)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Re-rendered {table_count} tables on {page_count} pages"))
@@ -146,6 +146,7 @@ class MapBlock(StructBlock):
         label = _("Interactive Map")
         label_format = label
         form_classname = "struct-block map-block"
+        text_fields = ()
 
 class MapBlockAdapter(StructBlockAdapter):
     @cached_property
@@ -201,6 +201,7 @@ class ProcedureBlock(StructBlock):
         form_classname = "struct-block procedure-block"
         icon = 'list-ol'
         value_class = ProcedureValue
+        text_fields = ("title", "introduction", "items")
 
     def clean(self, value):
         errors = {}
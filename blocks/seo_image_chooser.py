@@ -34,6 +34,7 @@ class SEOImageChooserBlock(StructBlock):
         label_format = '{seo_title}'
         template = 'blocks/image_block.html'
         form_classname = "structblock seo-image-chooser-block"
+        text_fields = ()
 
     def clean(self, value):
         # standard form validation
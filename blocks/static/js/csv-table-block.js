@@ -20,6 +20,8 @@ class CSVTableBlockDefinition extends window.wagtailStreamField.blocks
         this.renderTimeout = null;
         this.renderField = this.csvTableBlock.structBlock.querySelector(`#${prefix}-html`)
         this.renderSuccess = this.csvTableBlock.structBlock.querySelector(`#${prefix}-rendered`)
+        this.renderHash = this.csvTableBlock.structBlock.querySelector(`#${prefix}-html_hash`)
+        this.renderVersion = this.csvTableBlock.structBlock.querySelector(`#${prefix}-html_version`)
         this.inputElements = {
             'data': this.csvTableBlock.structBlock.querySelector(`#${prefix}-data`),
             'precision': this.csvTableBlock.structBlock.querySelector(`#${prefix}-precision`),
@@ -53,6 +55,7 @@ class CSVTableBlockDefinition extends window.wagtailStreamField.blocks
     renderTable() {
         this.renderSuccess.checked = false;
         this.renderField.value = '';
+        this.renderHash.value = '';
         this.renderingMessageDiv.classList.add('working');
         this.renderingMessageDiv.style.display = 'block';
         if (!this.footerButtons) {
@@ -81,6 +84,9 @@ class CSVTableBlockDefinition extends window.wagtailStreamField.blocks
                         throw new Error(errorMessage);
                     });
                 }
+                // hash of the data/options this html was rendered from, checked on save
+                this.renderHash.value = response.headers.get('X-CSV-Table-Hash') || '';
+                this.renderVersion.value = response.headers.get('X-CSV-Table-Version') || '';
                 return response.text(); 
             })
             .then(data => {
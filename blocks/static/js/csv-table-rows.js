@@ -0,0 +1,114 @@
+// js/csv-table-rows.js
+// Large table mode for CSVTableBlock: fetch further rows on scroll, sort on header click, filter rows
+
+class CSVTableRows {
+  constructor(container) {
+    container.dataset.initialised = true;
+    this.container = container;
+    this.url = container.dataset.rowsUrl;
+    this.total = parseInt(container.dataset.totalRows);
+    this.loaded = parseInt(container.dataset.inlineRows);
+    this.pageSize = 100;
+    this.sort = null;
+    this.order = 'asc';
+    this.query = '';
+    this.loading = false;
+    this.table = container.querySelector('table');
+    this.tbody = this.table.querySelector('tbody');
+    this.rowHeaders = this.table.classList.contains('csv-table-row-headers');
+
+    // scroll within the table container
+    container.style.maxHeight = '70vh';
+    container.style.overflowY = 'auto';
+    container.addEventListener('scroll', () => {
+      if (container.scrollTop + container.clientHeight >= container.scrollHeight - 200) {
+        this.fetchRows();
+      }
+    });
+
+    this.table.querySelectorAll('thead th.col_heading').forEach((th) => {
+      th.style.cursor = 'pointer';
+      th.addEventListener('click', () => this.sortBy(th));
+    });
+
+    const filter = container.parentElement.querySelector('input.csv-table-filter');
+    if (filter) {
+      let filterTimeout = null;
+      filter.addEventListener('input', () => {
+        clearTimeout(filterTimeout);
+        filterTimeout = setTimeout(() => {
+          this.query = filter.value.trim();
+          this.reload();
+        }, 400);
+      });
+    }
+  }
+
+  sortBy(th) {
+    // data column number from the colN class, the index is column 0 with row headers
+    const column = parseInt([...th.classList].find(c => /^col\d+$/.test(c)).slice(3)) + (this.rowHeaders ? 1 : 0);
+    this.order = (this.sort === column && this.order === 'asc') ? 'desc' : 'asc';
+    this.sort = column;
+    this.table.querySelectorAll('thead th.col_heading').forEach((heading) => {
+      heading.removeAttribute('aria-sort');
+    });
+    th.setAttribute('aria-sort', this.order === 'asc' ? 'ascending' : 'descending');
+    this.reload();
+  }
+
+  reload() {
+    this.tbody.replaceChildren();
+    this.loaded = 0;
+    this.total = null;
+    this.container.scrollTop = 0;
+    this.fetchRows();
+  }
+
+  fetchRows() {
+    if (this.loading || (this.total !== null && this.loaded >= this.total)) return;
+    this.loading = true;
+    const params = new URLSearchParams({ offset: this.loaded, limit: this.pageSize });
+    if (this.sort !== null) {
+      params.set('sort', this.sort);
+      params.set('order', this.order);
+    }
+    if (this.query) params.set('q', this.query);
+
+    fetch(`${this.url}?${params}`)
+      .then(response => {
+        if (!response.ok) throw new Error(`CSV table rows: ${response.status}`);
+        return response.json();
+      })
+      .then(data => {
+        const fragment = document.createDocumentFragment();
+        data.rows.forEach((cells, i) => {
+          fragment.appendChild(this.buildRow(cells, data.offset + i, data));
+        });
+        this.tbody.appendChild(fragment);
+        this.loaded = data.offset + data.rows.length;
+        this.total = data.total;
+      })
+      .catch(error => console.error(error.message))
+      .finally(() => {
+        this.loading = false;
+      });
+  }
+
+  buildRow(cells, rowNumber, data) {
+    const tr = document.createElement('tr');
+    cells.forEach((value, i) => {
+      let cell;
+      if (data.row_headers && i === 0) {
+        cell = document.createElement('th');
+        cell.className = `row_heading level0 row${rowNumber}`;
+      } else {
+        cell = document.createElement('td');
+        cell.className = `data row${rowNumber} col${data.row_headers ? i - 1 : i}`;
+        if (data.right_align[i]) cell.classList.add('csv-table-right-align');
+      }
+      cell.textContent = value;
+      tr.appendChild(cell);
+    });
+    return tr;
+  }
+}
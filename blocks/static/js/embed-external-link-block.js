@@ -1,5 +1,58 @@
 // js/embed-external-link-blocks.js
 
+// Metadata requests made within a few ms of each other (e.g. several blocks at once) are sent as one
+// request to the batch proxy, which fetches them concurrently and streams back one NDJSON line per url.
+const externalLinkMetadata = {
+    pending: [],
+    timer: null,
+    maxBatch: 25,
+
+    get(url) {
+        return new Promise((resolve, reject) => {
+            this.pending.push({ url, resolve, reject });
+            if (!this.timer) {
+                this.timer = setTimeout(() => this.flush(), 20);
+            }
+        });
+    },
+
+    flush() {
+        this.timer = null;
+        while (this.pending.length) {
+            this.send(this.pending.splice(0, this.maxBatch));
+        }
+    },
+
+    async send(batch) {
+        const params = new URLSearchParams();
+        batch.forEach((item) => params.append('url', item.url));
+        try {
+            const response = await fetch(`/blocks/external-content-proxy/batch/?${params}`);
+            if (!response.ok) {
+                throw new Error(`Metadata request failed (${response.status})`);
+            }
+            // resolve each url as its line arrives
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            for (;;) {
+                const { done, value } = await reader.read();
+                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.filter((line) => line.trim()).forEach((line) => {
+                    const metadata = JSON.parse(line);
+                    batch[metadata.index].resolve(metadata);
+                });
+                if (done) break;
+            }
+            batch.forEach((item) => item.reject(new Error('No metadata returned')));
+        } catch (error) {
+            batch.forEach((item) => item.reject(error));
+        }
+    },
+};
+
 class ExternalLinkEmbedBlockDefinition extends window.wagtailStreamField.blocks
     .StructBlockDefinition {
     render(placeholder, prefix, initialState, initialError) {
@@ -36,8 +89,7 @@ class ExternalLinkEmbedBlockDefinition extends window.wagtailStreamField.blocks
             if (url) {
                 try {
                     block.getMetadataButton.classList.toggle('spinner', true);
-                    const response = await fetch(`/blocks/external-content-proxy/?url=${encodeURIComponent(url)}`);
-                    const metadata = await response.json();
+                    const metadata = await externalLinkMetadata.get(url);
 
                     // Handle metadata error
                     block.externalLinkErrors.innerText = metadata.error || '';
@@ -0,0 +1,142 @@
+import re
+from types import SimpleNamespace
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from bs4 import BeautifulSoup
+
+from blocks.csv_renderer import parse_table, render_csv_table
+from blocks.csv_table import get_large_table, get_table_hash, get_table_options
+from blocks.views.csv_table import find_table_rows, pd, render_html_table_pandas
+
+
+def csv_value(rows, column_headers=True):
+    lines = (["name,count"] if column_headers else []) + [f"row {i},{i}" for i in range(rows)]
+    return {"data": "\n".join(lines), "precision": 0, "column_headers": column_headers, "row_headers": False, "compact": False}
+
+
+def table_html(rows):
+    return "<table><thead><tr><th>name</th></tr></thead><tbody>" + "<tr><td></td></tr>" * rows + "</tbody></table>"
+
+
+def normalize_table_html(markup):
+    # the pandas Styler adds random element ids and an empty style element
+    soup = BeautifulSoup(markup, "html.parser")
+    for style in soup.find_all("style"):
+        style.decompose()
+    for element in soup.find_all(True):
+        element.attrs.pop("id", None)
+    return re.sub(r">\s+<", "><", str(soup)).strip()
+
+
+@skipIf(pd is None, "pandas isn't installed")
+class RendererParityTests(SimpleTestCase):
+    """blocks.csv_renderer output matches the pandas Styler backend"""
+
+    # no markup in cells, csv_renderer escapes cell text and the Styler doesn't
+    tables = {
+        "mixed": "name,count,price,ratio,flag\nA,1,$1.00,0.5,True\nB,,\"$2,500.00\",,False\nC,3,,1.25,True",
+        "integers": "a,b\n1,2\n3,4",
+        "integral floats": "a,b\n1.0,2\n3.0,4e1",
+        "integers with NA": "a,b\n1,2\n,4\n3,5",
+        "strings": "a,b\nx,y\nz,",
+        "short rows": "a,b,c\n1,2\n3",
+        "duplicate headers": "a,a,\n1,2,3",
+    }
+
+    def test_parity(self):
+        for name, data in self.tables.items():
+            for column_headers in (True, False):
+                for row_headers in (True, False):
+                    for precision in (0, 2):
+                        table_block = {
+                            "data": data,
+                            "precision": precision,
+                            "column_headers": column_headers,
+                            "row_headers": row_headers,
+                            "compact": precision == 2,
+                        }
+                        if name == "integers with NA" and row_headers:
+                            # known difference: NA row headers are empty rather than 'nan'
+                            continue
+                        with self.subTest(name, **table_block):
+                            self.assertEqual(
+                                normalize_table_html(render_csv_table(table_block)),
+                                normalize_table_html(render_html_table_pandas(table_block)),
+                            )
+
+    def test_na_row_headers(self):
+        table_block = {"data": "a,b\n1,2\n,4", "precision": 0, "column_headers": True, "row_headers": True, "compact": False}
+        row_headers = BeautifulSoup(render_csv_table(table_block), "html.parser").find_all("th", class_="row_heading")
+        self.assertEqual([th.get_text() for th in row_headers], ["1.000000", ""])
+
+
+class LargeTableTests(SimpleTestCase):
+    """get_large_table thresholds against the inline rows rendered in table_html"""
+
+    page = SimpleNamespace(pk=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rows_within_inline_rows(self):
+        for column_headers in (True, False):
+            with self.subTest(column_headers=column_headers):
+                self.assertIsNone(get_large_table(csv_value(3, column_headers), self.page, table_html(3)))
+
+    def test_header_line_not_counted_as_a_row(self):
+        # 4 lines, 3 data rows: decided from the line count without parsing the table
+        with mock.patch("blocks.csv_table.get_table_columns") as get_table_columns:
+            self.assertIsNone(get_large_table(csv_value(3), self.page, table_html(3)))
+        get_table_columns.assert_not_called()
+
+    def test_rows_beyond_inline_rows(self):
+        for column_headers in (True, False):
+            with self.subTest(column_headers=column_headers):
+                value = csv_value(4, column_headers)
+                large_table = get_large_table(value, self.page, table_html(3))
+                self.assertEqual(large_table["total_rows"], 4)
+                self.assertEqual(large_table["inline_rows"], 3)
+                self.assertIn(get_table_hash(value), large_table["rows_url"])
+
+    def test_no_page(self):
+        self.assertIsNone(get_large_table(csv_value(4), None, table_html(3)))
+
+
+@override_settings(CSV_TABLE_QUERY_MAX_LENGTH=10)
+class CSVTableRowsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.value = csv_value(50)
+        self.table_hash = get_table_hash(self.value)
+        self.table = parse_table(get_table_options(self.value))
+
+    def get(self, table_hash=None, **params):
+        with mock.patch("blocks.views.csv_table.find_table_columns", return_value=self.table):
+            return self.client.get(f"/blocks/csv-table-rows/1/{table_hash or self.table_hash}/", params)
+
+    def test_rows(self):
+        response = self.get(offset=10, limit=5, q="row 1")
+        self.assertEqual(response.status_code, 200)
+        # row 1, row 10-19
+        self.assertEqual(response.json()["total"], 11)
+        self.assertEqual([row[0] for row in response.json()["rows"]], ["row 19"])
+
+    def test_invalid_table_hash(self):
+        for table_hash in ("abc", self.table_hash.upper(), self.table_hash + "0", "x" * 64):
+            with self.subTest(table_hash=table_hash):
+                self.assertEqual(self.get(table_hash).status_code, 404)
+
+    def test_query_too_long(self):
+        self.assertEqual(self.get(q="x" * 11).status_code, 400)
+
+    def test_matches_cached(self):
+        rows = find_table_rows(self.table, self.table_hash, None, False, "row 2")
+        self.assertEqual(len(rows), 11)
+        with mock.patch("blocks.views.csv_table.match_table_rows") as match_table_rows:
+            self.assertEqual(find_table_rows(self.table, self.table_hash, None, False, "row 2"), rows)
+        match_table_rows.assert_not_called()
+        # plain paging needs no row numbers
+        self.assertIsNone(find_table_rows(self.table, self.table_hash, None, False, ""))
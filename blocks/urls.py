@@ -1,10 +1,13 @@
 from django.urls import path
 
-from .views.external_link import ExternalContentProxy, check_image_url
-from .views.csv_table import RenderCSVTableProxy
+from .views.external_link import (ExternalContentBatchProxy, ExternalContentProxy,
+                                  check_image_url)
+from .views.csv_table import CSVTableRows, RenderCSVTableProxy
 
 urlpatterns = [
     path('render-csv-table-proxy/', RenderCSVTableProxy.as_view(), name='render-csv-table-proxy'),
+    path('csv-table-rows/<int:page_id>/<str:table_hash>/', CSVTableRows.as_view(), name='csv-table-rows'),
     path('external-content-proxy/', ExternalContentProxy.as_view(), name='external-content-proxy'),
+    path('external-content-proxy/batch/', ExternalContentBatchProxy.as_view(), name='external-content-batch-proxy'),
     path('check-image-url/', check_image_url, name='check_image_url'),
 ]
\ No newline at end of file
@@ -1,22 +1,53 @@
+import csv
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from io import StringIO
 
 import minify_html
-import pandas as pd
-from bs4 import BeautifulSoup
-from django.http import HttpResponse
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.defaultfilters import filesizeformat
+from django.utils.cache import patch_cache_control
 from django.views import View
+from wagtail.models import Page
+
+from core.block_usage import get_streamfields, iter_block_usage
+
+from ..csv_renderer import (RE_CURRENCY, match_table_rows, render_csv_table,
+                           table_rows)
+from ..csv_table import (CSV_TABLE_RENDERER_VERSION, CSVTableBlock,
+                         get_cache_timeout, get_render_options,
+                         get_table_columns, get_table_hash)
+
+try:
+    import pandas as pd
+    from bs4 import BeautifulSoup
+except ImportError:
+    pd = None
 
 
 def is_currency_column(column):
     # Ignore empty values
     non_empty_values = column.dropna().astype(str)
-    # Regular expression pattern to match currency values
-    currency_pattern = r'^\s*[+-]?\s*\$?\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*$'
     # Check if all values in the column match the currency pattern
-    is_currency = non_empty_values.str.match(currency_pattern).all()
+    is_currency = non_empty_values.str.match(RE_CURRENCY.pattern).all()
     return is_currency
 
 def render_html_table(table_block):
+    """
+    Render table_block with the backend set by CSV_TABLE_RENDERER: 'csv' (default, stdlib csv module)
+    or 'pandas' (pandas Styler, falls back to 'csv' if pandas isn't installed)
+    """
+    if getattr(settings, "CSV_TABLE_RENDERER", "csv") == "pandas" and pd is not None:
+        return render_html_table_pandas(table_block)
+    return render_csv_table(table_block)
+
+def render_html_table_pandas(table_block):
     try:
         if table_block["row_headers"]:
             df = pd.read_csv(
@@ -32,6 +63,9 @@ def render_html_table(table_block):
 
         # Note: NaN is considered float by pandas 1.x, upgrade to >=2.2 to avoid this bug
         df = df.convert_dtypes()
+        # large table mode, dtypes are inferred from all rows
+        if table_block.get("inline_rows"):
+            df = df.head(table_block["inline_rows"])
 
         # set decimal places for float, set NA value representation as empty string
         dfs = df.style.format(precision=table_block["precision"], na_rep="")
@@ -84,6 +118,119 @@ def render_html_table(table_block):
     except Exception as e:
         raise e
 
+def render_minified_table(table_block):
+    html_table = render_html_table(table_block).replace('\n','').replace('> <', '><')
+    return minify_html.minify(html_table, minify_js=True, minify_css=True)
+
+
+class CSVTableTooLarge(ValueError):
+    pass
+
+class CSVTableRendererBusy(RuntimeError):
+    pass
+
+def check_table_limits(data):
+    """Raise CSVTableTooLarge if data exceeds CSV_TABLE_MAX_BYTES or CSV_TABLE_MAX_ROWS"""
+    max_bytes = getattr(settings, "CSV_TABLE_MAX_BYTES", 5 * 2**20)
+    max_rows = getattr(settings, "CSV_TABLE_MAX_ROWS", 50_000)
+    size = len(data.encode())
+    if max_bytes and size > max_bytes:
+        raise CSVTableTooLarge(
+            f"CSV data is {filesizeformat(size)}, the maximum is {filesizeformat(max_bytes)}. "
+            "Split the data into smaller tables."
+        )
+    # line count is an upper bound, quoted cells may contain newlines
+    rows = data.count("\n") + 1
+    if max_rows and rows > max_rows and sum(1 for row in csv.reader(StringIO(data)) if row) > max_rows:
+        raise CSVTableTooLarge(
+            f"CSV data has more than {max_rows:,} rows. Split the data into smaller tables."
+        )
+
+
+class TableRenderer:
+    """
+    Renders minified CSV tables on a bounded thread pool with an in-process LRU/TTL cache by table hash,
+    so a few editors previewing large tables can't tie up every admin worker.
+    Identical renders already in progress are shared. When CSV_TABLE_RENDER_QUEUE renders are waiting
+    or a render takes longer than CSV_TABLE_RENDER_TIMEOUT seconds, CSVTableRendererBusy is raised.
+    render_now() shares the cache but renders in the calling thread without limits (page renders, saves).
+    """
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(
+            max_workers=getattr(settings, "CSV_TABLE_RENDER_WORKERS", 2),
+            thread_name_prefix="csv-table-render",
+        )
+        self.cache = TTLCache(
+            maxsize=getattr(settings, "CSV_TABLE_RENDER_CACHE_SIZE", 128),
+            ttl=getattr(settings, "CSV_TABLE_RENDER_CACHE_TTL", 60 * 10),
+        )
+        self.slots = threading.BoundedSemaphore(getattr(settings, "CSV_TABLE_RENDER_QUEUE", 8))
+        self.timeout = getattr(settings, "CSV_TABLE_RENDER_TIMEOUT", 30)
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def render(self, table_block):
+        table_block = get_render_options(table_block)
+        check_table_limits(table_block["data"])
+        key = get_table_hash(table_block)
+
+        submitted = False
+        with self.lock:
+            html = self.cache.get(key)
+            if html is not None:
+                return html
+            future = self.pending.get(key)
+            if future is None:
+                if not self.slots.acquire(blocking=False):
+                    raise CSVTableRendererBusy("The table renderer is busy, try again in a moment.")
+                future = self.pool.submit(render_minified_table, table_block)
+                self.pending[key] = future
+                submitted = True
+        # outside the lock, the callback runs immediately if the render has already finished
+        if submitted:
+            future.add_done_callback(lambda f: self._done(key, f))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise CSVTableRendererBusy("Rendering the table timed out, try again in a moment.")
+
+    def render_now(self, table_block):
+        table_block = get_render_options(table_block)
+        key = get_table_hash(table_block)
+        with self.lock:
+            html = self.cache.get(key)
+        if html is None:
+            html = render_minified_table(table_block)
+            with self.lock:
+                self.cache[key] = html
+        return html
+
+    def _done(self, key, future):
+        with self.lock:
+            self.pending.pop(key, None)
+            if not future.cancelled() and future.exception() is None:
+                self.cache[key] = future.result()
+        self.slots.release()
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def get_renderer():
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = TableRenderer()
+        return _renderer
+
+def render_table(table_block):
+    """Minified table html for table_block (block value or options), cached and rendered on the pool"""
+    return get_renderer().render(table_block)
+
+def render_table_now(table_block):
+    """Minified table html for table_block, cached and rendered in the calling thread"""
+    return get_renderer().render_now(table_block)
+
 class RenderCSVTableProxy(View):
     def post(self, request):
         try:
@@ -96,9 +243,96 @@ class RenderCSVTableProxy(View):
                 'compact': (data.get("compact", False)=='true')
             }
             # Process the data and generate minified HTML table
-            html_table = render_html_table(table_block).replace('\n','').replace('> <', '><')
-            return HttpResponse(minify_html.minify(html_table, minify_js=True, minify_css=True))
+            response = HttpResponse(render_table(table_block))
+            # stamp for the block's hidden html_hash/html_version fields, see CSVTableBlock.clean()
+            response['X-CSV-Table-Hash'] = get_table_hash(table_block)
+            response['X-CSV-Table-Version'] = CSV_TABLE_RENDERER_VERSION
+            return response
+        except CSVTableTooLarge as e:
+            return HttpResponse(str(e), status=413)
+        except CSVTableRendererBusy as e:
+            return HttpResponse(str(e), status=503)
         except Exception as e:
             # print(str(e))
             return HttpResponse(str(e), status=400)
-        
+
+def find_table_columns(page_id, table_hash):
+    """
+    Parsed table for the CSVTableBlock with table_hash on page_id, None unless the page is live and publicly
+    viewable and its live content has the table.
+    Found tables are remembered per live revision, so the page's blocks are only scanned once per publish.
+    """
+    page = Page.objects.live().public().filter(pk=page_id).first()
+    if not page:
+        return None
+    found_key = f"csv-table-on-page-{page.pk}-{page.live_revision_id}-{table_hash}"
+    if cache.get(found_key):
+        table = cache.get(f"csv-table-columns-{table_hash}")
+        if table is not None:
+            return table
+    page = page.specific
+    for field in get_streamfields(page.__class__):
+        stream_value = getattr(page, field.name)
+        for path, block, value in iter_block_usage(stream_value.stream_block, stream_value.raw_data):
+            if isinstance(block, CSVTableBlock) and get_table_hash(value) == table_hash:
+                cache.set(found_key, True, get_cache_timeout())
+                return get_table_columns(value, table_hash)
+    return None
+
+RE_TABLE_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+def find_table_rows(table, table_hash, sort, descending, query):
+    """Matching row numbers for a filtered or sorted table, cached so paging through results doesn't rescan"""
+    if not (query or sort is not None):
+        return None
+    query_hash = hashlib.md5(query.encode()).hexdigest()
+    return cache.get_or_set(
+        f"csv-table-match-{table_hash}-{sort}-{int(descending)}-{query_hash}",
+        lambda: match_table_rows(table, sort, descending, query),
+        getattr(settings, "CSV_TABLE_MATCH_CACHE_TIMEOUT", 60 * 10),
+    )
+
+class CSVTableRows(View):
+    """
+    JSON row pages for large CSV tables, see CSVTableBlock large table mode.
+    GET parameters: offset, limit, sort (column number), order (asc/desc), q (filter text,
+    at most CSV_TABLE_QUERY_MAX_LENGTH characters).
+    Only tables on live, publicly viewable pages are served. Rows come from the parsed table cached by
+    content hash, or from the live page if evicted. Filtered and sorted row numbers are cached briefly.
+    """
+    def get(self, request, page_id, table_hash):
+        if not RE_TABLE_HASH.match(table_hash):
+            raise Http404("Table not found")
+        table = find_table_columns(page_id, table_hash)
+        if table is None:
+            raise Http404("Table not found")
+        try:
+            offset = max(int(request.GET.get("offset", 0)), 0)
+            limit = min(max(int(request.GET.get("limit", 100)), 1), getattr(settings, "CSV_TABLE_ROWS_MAX_LIMIT", 1000))
+            sort = int(request.GET["sort"]) if request.GET.get("sort") else None
+        except ValueError:
+            return JsonResponse({"error": "offset, limit and sort must be integers"}, status=400)
+        query = request.GET.get("q", "").strip()
+        if len(query) > getattr(settings, "CSV_TABLE_QUERY_MAX_LENGTH", 100):
+            return JsonResponse({"error": "q is too long"}, status=400)
+
+        descending = request.GET.get("order") == "desc"
+        total, rows = table_rows(
+            table,
+            offset=offset,
+            limit=limit,
+            sort=sort,
+            descending=descending,
+            query=query,
+            row_numbers=find_table_rows(table, table_hash, sort, descending, query),
+        )
+        response = JsonResponse({
+            "total": total,
+            "offset": offset,
+            "rows": rows,
+            "row_headers": table["row_headers"],
+            "right_align": table["right_align"],
+        })
+        # content addressed by table hash
+        patch_cache_control(response, public=True, max_age=get_cache_timeout())
+        return response
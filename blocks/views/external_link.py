@@ -1,125 +1,226 @@
 import html
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse, urlsplit
 
 import requests
 import validators
 from bs4 import BeautifulSoup
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
 from django.views import View
+from wagtail.admin.auth import require_admin_access
+
+from core import http
+from core.link_metadata import LinkMetadata
+
+
+class MetadataError(Exception):
+    pass
+
+
+def clean_url(url):
+    """Return url with a scheme, raise MetadataError if missing or invalid"""
+    if not url:
+        raise MetadataError("Missing URL parameter")
+    # Validate the URL format
+    if not urlsplit(url).scheme:
+        url = f'https://{url}'
+    if not validators.url(url):
+        raise MetadataError("Invalid URL format")
+    return url
+
+
+def extract_metadata(soup, keys):
+    for key in keys:
+        meta_tag = soup.find("meta", attrs={"property": key})
+        if not meta_tag:
+            meta_tag = soup.find("meta", attrs={"itemprop": key})
+        if not meta_tag:
+            meta_tag = soup.find("meta", attrs={"name": key})
+        if meta_tag:
+            if keys[0] == "og:title" and not meta_tag["content"]:
+                title_tag = soup.find("title")
+                if title_tag:
+                    return title_tag.string
+            return meta_tag["content"]
+
+    if keys[0] == 'meta[name="description"]':
+        description_tag = soup.find("meta", attrs={"name": "description"})
+        if description_tag:
+            return description_tag["content"]
+
+    if keys[0] == "og:title":
+        title_tag = soup.find("title")
+        if title_tag:
+            return title_tag.string
+
+    return None
+
+
+def parse_metadata(url, content):
+    """Return the metadata dict (url, title, description, image) from the <head> of an html page"""
+    # Find the start and end positions of the <head> tag
+    head_start = content.find("<head")
+    head_end = content.find("</head>", head_start)
+
+    if head_start == -1 or head_end == -1:
+        raise MetadataError("No <head> tag found")
+
+    # Extract and parse the <head> content using BeautifulSoup
+    head_content = content[head_start:head_end + len("</head>")]
+    head_soup = BeautifulSoup(head_content, "html.parser")
+
+    title = extract_metadata(
+        head_soup,
+        [
+            "og:title",
+            "itemprop:name",
+            "twitter:title",
+        ],
+    )
+
+    description = extract_metadata(
+        head_soup,
+        [
+            "og:description",
+            "itemprop:description",
+            "twitter:description",
+            'meta[name="description"]',
+        ],
+    )
+    if description:
+        description = html.unescape(description)
+
+    image = (
+        extract_metadata(
+            head_soup,
+            [
+                "og:image",
+                "itemprop:image",
+                "twitter:image",
+            ],
+        )
+        or ""
+    )
+
+    # attempt to fix relative image url
+    if image and image.startswith("/"):
+        parsed_url = urlparse(url)
+        image = f"{parsed_url.scheme}://{parsed_url.netloc}{image}"
+
+    return {
+        "url": url,
+        "title": title,
+        "description": description,
+        "image": image,
+    }
+
+
+def fetch_metadata(url):
+    """Fetch url and return its metadata dict, raise MetadataError with a message for the editor on failure"""
+    try:
+        # only the <head> is read, url is updated with the resolved address
+        url, content = http.fetch_head(url)
+        return parse_metadata(url, content)
+    except requests.exceptions.Timeout:
+        raise MetadataError(f"Timed out fetching {url}.")
+    except requests.exceptions.ConnectionError as e:
+        if "getaddrinfo failed" in str(e):
+            raise MetadataError(f"Failed to resolve {url}.")
+        raise MetadataError(str(e))
+    except MetadataError:
+        raise
+    except Exception as e:
+        raise MetadataError(str(e))
+
+
+def get_metadata(url, refresh=False):
+    """
+    Metadata for url from the LinkMetadata cache, fetched and stored if missing or expired (or refresh=True).
+    Returns the json for the proxy response, {"error": ...} for invalid urls and failed fetches.
+    """
+    try:
+        url = clean_url(url)
+    except MetadataError as e:
+        return {"error": str(e)}
+
+    if not refresh:
+        cached = LinkMetadata.get_cached(url)
+        if cached:
+            return cached.as_json(url)
+
+    try:
+        metadata = fetch_metadata(url)
+    except MetadataError as e:
+        return LinkMetadata.store(url, error=str(e)).as_json(url)
+    return LinkMetadata.store(url, metadata).as_json(url)
 
 
+@method_decorator(require_admin_access, name="dispatch")
 class ExternalContentProxy(View):
     def get(self, request):
         url = request.GET.get("url", "")  # Get the URL parameter from the query string
-
-        if not url:
-            return JsonResponse({"error": "Missing URL parameter"})
-
-        # Validate the URL format
-        if not urlsplit(url).scheme: 
-            url = f'https://{url}'
-        if not validators.url(url):
-            return JsonResponse({"error": "Invalid URL format"})
-
-        try:
-            response = requests.get(url)
-
-            # update url with resolved address
-            url = response.url
-
-            # Find the start and end positions of the <head> tag
-            content = response.text
-            head_start = content.find("<head")
-            head_end = content.find("</head>", head_start) + len("</head>")
-
-            if head_start == -1 or head_end == -1:
-                return JsonResponse({"error": "No <head> tag found"})
-
-            # Extract and parse the <head> content using BeautifulSoup
-            head_content = content[head_start:head_end]
-            head_soup = BeautifulSoup(head_content, "html.parser")
-
-            title = self.extract_metadata(
-                head_soup,
-                [
-                    "og:title",
-                    "itemprop:name",
-                    "twitter:title",
-                ],
-            )
-
-            description = self.extract_metadata(
-                head_soup,
-                [
-                    "og:description",
-                    "itemprop:description",
-                    "twitter:description",
-                    'meta[name="description"]',
-                ],
-            )
-            if description:
-                description = html.unescape(description)
-
-            image = (
-                self.extract_metadata(
-                    head_soup,
-                    [
-                        "og:image",
-                        "itemprop:image",
-                        "twitter:image",
-                    ],
-                )
-                or ""
-            )
-
-            # attempt to fix relative image url
-            if image and image.startswith("/"):
-                parsed_url = urlparse(url)
-                image = f"{parsed_url.scheme}://{parsed_url.netloc}{image}"
-
-            metadata = {
-                "url": url,
-                "title": title,
-                "description": description,
-                "image": image,
-            }
-
-            return JsonResponse(metadata)
-
-        except requests.exceptions.ConnectionError as e:
-            if "getaddrinfo failed" in str(e):
-                return JsonResponse({"error": f"Failed to resolve {url}."})
-            return JsonResponse({"error": str(e)})
-        except Exception as e:
-            return JsonResponse({"error": str(e)})
-
-    def extract_metadata(self, soup, keys):
-        for key in keys:
-            meta_tag = soup.find("meta", attrs={"property": key})
-            if not meta_tag:
-                meta_tag = soup.find("meta", attrs={"itemprop": key})
-            if not meta_tag:
-                meta_tag = soup.find("meta", attrs={"name": key})
-            if meta_tag:
-                if keys[0] == "og:title" and not meta_tag["content"]:
-                    title_tag = soup.find("title")
-                    if title_tag:
-                        return title_tag.string
-                return meta_tag["content"]
-
-        if keys[0] == 'meta[name="description"]':
-            description_tag = soup.find("meta", attrs={"name": "description"})
-            if description_tag:
-                return description_tag["content"]
-
-        if keys[0] == "og:title":
-            title_tag = soup.find("title")
-            if title_tag:
-                return title_tag.string
-
-        return None
-
-
+        refresh = request.GET.get("refresh") == "1"
+        return JsonResponse(get_metadata(url, refresh=refresh))
+
+
+@method_decorator(require_admin_access, name="dispatch")
+class ExternalContentBatchProxy(View):
+    """
+    Metadata for several urls at once: ?url=...&url=...[&refresh=1]
+    Responds with NDJSON, one {"index": n, "requested": url, ...metadata} line per url as soon as it resolves.
+    Cached urls are returned first, the rest are fetched concurrently on a bounded thread pool,
+    so the response takes as long as the slowest fetch rather than the sum of them.
+    Pool threads only make the requests, results are stored in the cache from the response thread.
+    Used by the ExternalLinkEmbedBlock editor js, admin access is required.
+    """
+    def get(self, request):
+        urls = request.GET.getlist("url")
+        refresh = request.GET.get("refresh") == "1"
+        max_urls = getattr(settings, "LINK_METADATA_BATCH_MAX", 25)
+        if not urls:
+            return JsonResponse({"error": "Missing URL parameter"}, status=400)
+        if len(urls) > max_urls:
+            return JsonResponse({"error": f"No more than {max_urls} URLs per request"}, status=400)
+        response = StreamingHttpResponse(self.stream(urls, refresh), content_type="application/x-ndjson")
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def stream(self, urls, refresh):
+        pending = {}
+        cached = {}
+        for index, url in enumerate(urls):
+            try:
+                pending[index] = clean_url(url)
+            except MetadataError as e:
+                yield self.line(index, url, {"error": str(e)})
+        if not refresh:
+            cached = LinkMetadata.get_cached_many(set(pending.values()))
+        for index, url in list(pending.items()):
+            if url in cached:
+                del pending[index]
+                yield self.line(index, urls[index], cached[url].as_json(url))
+        if not pending:
+            return
+
+        workers = min(len(pending), getattr(settings, "LINK_METADATA_BATCH_WORKERS", 8))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="link-metadata") as executor:
+            futures = {executor.submit(fetch_metadata, url): index for index, url in pending.items()}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    row = LinkMetadata.store(pending[index], future.result())
+                except MetadataError as e:
+                    row = LinkMetadata.store(pending[index], error=str(e))
+                yield self.line(index, urls[index], row.as_json(pending[index]))
+
+    def line(self, index, url, metadata):
+        return json.dumps({"index": index, "requested": url, **metadata}) + "\n"
+
+
+@require_admin_access
 def check_image_url(request):
     image_url = request.GET.get("url")
 
@@ -127,7 +228,7 @@ def check_image_url(request):
         return JsonResponse({"valid": False})
 
     try:
-        response = requests.head(image_url)
+        response = http.head(image_url)
         if response.status_code == 200 and response.headers.get(
             "Content-Type", ""
         ).startswith("image/"):
@@ -9,5 +9,7 @@ class BlogConfig(AppConfig):
         # Import the model here to ensure it's registered with the app
         from .video_page import VideoPage  # noqa: F401
         from .categories import BlogCategory
+        from . import wordcloud  # noqa: F401
+        from .term_index import PageTerm  # noqa: F401
         ReferenceIndex.register_model(BlogCategory)
 
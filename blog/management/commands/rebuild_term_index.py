@@ -0,0 +1,48 @@
+import os
+
+from django.core.management import BaseCommand
+
+from blog.models import BlogPage
+from blog.term_index import PageTerm
+from core.process_pool import delete_not_live, map_chunks
+
+
+def index_chunk(pks, force=False):
+    """
+    Index the terms of the live BlogPages in pks, skipping pages already indexed at their current corpus.
+    Returns (indexed, skipped), pages whose index rows were already current count as skipped with force.
+    """
+    indexed = skipped = 0
+    pages = BlogPage.objects.filter(pk__in=pks).only("pk", "content", *BlogPage.CORPUS_FIELDS)
+    for page in pages:
+        if PageTerm.update_for_page(page, force=force):
+            indexed += 1
+        else:
+            skipped += 1
+    return indexed, skipped
+
+
+class Command(BaseCommand):
+    help = "Rebuild the term frequency index for every live BlogPage using a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+        parser.add_argument("--chunk-size", type=int, default=100, help="Pages per worker task")
+        parser.add_argument("--force", action="store_true", help="Re-index pages already indexed at their current corpus")
+
+    def handle(self, *args, **options):
+        pks = list(BlogPage.objects.live().order_by("pk").values_list("pk", flat=True))
+        if not pks:
+            self.stdout.write("No live blog pages found")
+            return
+
+        delete_not_live(PageTerm.objects.all())
+        indexed = skipped = 0
+        for done, total, (chunk_indexed, chunk_skipped) in map_chunks(
+            index_chunk, pks, options["chunk_size"], options["workers"], options["force"]
+        ):
+            indexed += chunk_indexed
+            skipped += chunk_skipped
+            self.stdout.write(f"[{done}/{total}] {indexed} indexed, {skipped} unchanged")
+
+        self.stdout.write(self.style.SUCCESS(f"Term index rebuilt for {indexed} pages, {skipped} unchanged"))
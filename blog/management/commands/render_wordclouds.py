@@ -0,0 +1,40 @@
+import os
+
+from django.core.management import BaseCommand, CommandError
+
+from blog.models import BlogPage
+from blog.wordcloud import get_wordcloud_renditions, render_page_wordclouds
+from core.process_pool import map_chunks
+
+
+def render_chunk(pks):
+    """Render missing WORDCLOUD_RENDITIONS for the BlogPages in pks, returns the number of pages done"""
+    for pk in pks:
+        render_page_wordclouds(pk)
+    return len(pks)
+
+
+class Command(BaseCommand):
+    help = "Pre-render the WORDCLOUD_RENDITIONS word clouds for every BlogPage using a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+        parser.add_argument("--chunk-size", type=int, default=10, help="Pages per worker task")
+        parser.add_argument("--live", action="store_true", help="Only render live pages")
+
+    def handle(self, *args, **options):
+        if not get_wordcloud_renditions():
+            raise CommandError("No word cloud renditions configured, set WORDCLOUD_RENDITIONS")
+
+        pages = BlogPage.objects.live() if options["live"] else BlogPage.objects.all()
+        pks = list(pages.order_by("pk").values_list("pk", flat=True))
+        if not pks:
+            self.stdout.write("No blog pages found")
+            return
+
+        rendered = 0
+        for done, total, pages_done in map_chunks(render_chunk, pks, options["chunk_size"], options["workers"]):
+            rendered += pages_done
+            self.stdout.write(f"[{done}/{total}] {rendered} pages")
+
+        self.stdout.write(self.style.SUCCESS(f"Word clouds rendered for {rendered} pages"))
@@ -0,0 +1,47 @@
+import os
+
+from django.core.management import BaseCommand
+
+from blog.models import BlogPage
+from core.process_pool import map_chunks
+
+
+def update_chunk(pks, force=False):
+    """
+    Update stored corpus fields for the BlogPages in pks, skipping pages whose content hash is unchanged.
+    Writes with queryset.update() (BlogPage.store_corpus) so no revisions are created and no save hooks run.
+    Returns (updated, skipped).
+    """
+    updated = skipped = 0
+    pages = BlogPage.objects.filter(pk__in=pks).only("pk", "content", *BlogPage.CORPUS_FIELDS)
+    for page in pages:
+        if page.store_corpus(force=force):
+            updated += 1
+        else:
+            skipped += 1
+    return updated, skipped
+
+
+class Command(BaseCommand):
+    help = "Backfill stored word counts and corpus text for every BlogPage using a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+        parser.add_argument("--chunk-size", type=int, default=100, help="Pages per worker task")
+        parser.add_argument("--force", action="store_true", help="Recompute pages with unchanged content")
+
+    def handle(self, *args, **options):
+        pks = list(BlogPage.objects.order_by("pk").values_list("pk", flat=True))
+        if not pks:
+            self.stdout.write("No blog pages found")
+            return
+
+        updated = skipped = 0
+        for done, total, (chunk_updated, chunk_skipped) in map_chunks(
+            update_chunk, pks, options["chunk_size"], options["workers"], options["force"]
+        ):
+            updated += chunk_updated
+            skipped += chunk_skipped
+            self.stdout.write(f"[{done}/{total}] {updated} updated, {skipped} unchanged")
+
+        self.stdout.write(self.style.SUCCESS(f"Word counts updated for {updated} pages, {skipped} unchanged"))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0028_alter_blogpage_content"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpage",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpage",
+            name="corpus_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpage",
+            name="corpus_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
@@ -0,0 +1,1040 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:01
+
+import blocks.collapsible_card
+import blocks.map
+import wagtail.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0029_blogpage_corpus"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="blogpage",
+            name="content",
+            field=wagtail.fields.StreamField(
+                [
+                    ("rich_text", 0),
+                    ("code", 6),
+                    ("import_text_block", 7),
+                    ("csv_table", 24),
+                    ("collapsible_card_block", 28),
+                    ("product", 29),
+                    ("external_link", 33),
+                    ("link", 42),
+                    ("flex_card", 54),
+                    ("seo_image", 57),
+                    ("heading", 60),
+                    ("django_template_fragment", 62),
+                    ("external_video", 65),
+                    ("document", 74),
+                    ("link_list", 77),
+                    ("map", 90),
+                    ("procedure", 105),
+                    ("file_system", 120),
+                ],
+                blank=True,
+                block_lookup={
+                    0: ("blocks.rich_text.RichTextBlock", (), {}),
+                    1: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Title", "required": False},
+                    ),
+                    2: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("", "Not Collapsible"),
+                                ("collapsible", "Collapsible"),
+                                ("collapsed", "Collapsed"),
+                            ],
+                            "label": "Format",
+                            "required": False,
+                        },
+                    ),
+                    3: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("plaintext", "Plain Text"),
+                                ("python", "Python"),
+                                ("css", "CSS"),
+                                ("scss", "SCSS"),
+                                ("django", "Django Template"),
+                                ("javascript", "Javascript"),
+                                ("typescript", "Typescript"),
+                                ("xml", "HTML / XML"),
+                                ("shell", "Bash/Shell"),
+                                ("json", "JSON"),
+                                ("markdown", "Markdown"),
+                                ("nginx", "Nginx"),
+                                ("sql", "SQL"),
+                                ("r", "R"),
+                                ("powershell", "PowerShell"),
+                            ],
+                            "label": "Language",
+                        },
+                    ),
+                    4: ("wagtail.blocks.RawHTMLBlock", (), {"label": "Code"}),
+                    5: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {
+                            "default": True,
+                            "label": "Include extra space beneath code block?",
+                            "required": False,
+                        },
+                    ),
+                    6: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 1),
+                                ("collapsible", 2),
+                                ("language", 3),
+                                ("code", 4),
+                                ("bottom_padding", 5),
+                            ]
+                        ],
+                        {},
+                    ),
+                    7: ("blocks.import_text.ImportTextBlock", (), {}),
+                    8: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [("h3", "H3"), ("h4", "H4"), ("h5", "H5")],
+                            "label": "Size",
+                        },
+                    ),
+                    9: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("justify", "Justified"),
+                                ("start", "Left"),
+                                ("center", "Centre"),
+                                ("end", "Right"),
+                            ],
+                            "label": "Alignment",
+                        },
+                    ),
+                    10: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Optional Anchor Identifier", "required": False},
+                    ),
+                    11: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 1),
+                                ("heading_size", 8),
+                                ("alignment", 9),
+                                ("anchor_id", 10),
+                            ]
+                        ],
+                        {"label": "Optional Table Title"},
+                    ),
+                    12: (
+                        "blocks.import_text.ImportTextBlock",
+                        (),
+                        {
+                            "file_type_filter": ".csv",
+                            "help_text": "Paste in CSV data or import from .csv file",
+                            "label": "Comma Separated Data",
+                        },
+                    ),
+                    13: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 2, "label": "Float Precision"},
+                    ),
+                    14: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": True, "label": "Column Headers", "required": False},
+                    ),
+                    15: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"label": "Row Headers", "required": False},
+                    ),
+                    16: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": True, "label": "Compact", "required": False},
+                    ),
+                    17: (
+                        "wagtail.blocks.RichTextBlock",
+                        (),
+                        {
+                            "editor": "minimal",
+                            "help_text": "Caption displayed beneath the table. Use as explanation or annotation.",
+                            "label": "Table Caption",
+                            "required": False,
+                        },
+                    ),
+                    18: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("justify", "Justified"),
+                                ("start", "Left"),
+                                ("center", "Centre"),
+                                ("end", "Right"),
+                            ],
+                            "label": "Caption Alignment",
+                        },
+                    ),
+                    19: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 100, "label": "Table Width (%)"},
+                    ),
+                    20: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"label": "Maximum Table Width (rem)", "required": False},
+                    ),
+                    21: ("blocks.hidden.HiddenCharBlock", (), {}),
+                    22: ("blocks.hidden.HiddenIntegerBlock", (), {}),
+                    23: ("blocks.hidden.HiddenBooleanBlock", (), {"default": True}),
+                    24: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 11),
+                                ("data", 12),
+                                ("precision", 13),
+                                ("column_headers", 14),
+                                ("row_headers", 15),
+                                ("compact", 16),
+                                ("caption", 17),
+                                ("caption_alignment", 18),
+                                ("width", 19),
+                                ("max_width", 20),
+                                ("html", 21),
+                                ("html_hash", 21),
+                                ("html_version", 22),
+                                ("rendered", 23),
+                            ]
+                        ],
+                        {},
+                    ),
+                    25: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("bg-transparent", "Transparent"),
+                                ("bg-primary", "Primary"),
+                                ("bg-secondary", "Secondary"),
+                                ("bg-success", "Success"),
+                                ("bg-info", "Info"),
+                                ("bg-warning", "Warning"),
+                                ("bg-danger", "Danger"),
+                                ("bg-light", "Light"),
+                                ("bg-dark", "Dark"),
+                                ("bg-black", "Black"),
+                            ],
+                            "label": "Card Header Background Colour",
+                        },
+                    ),
+                    26: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("bg-transparent", "Transparent"),
+                                ("bg-primary", "Primary"),
+                                ("bg-secondary", "Secondary"),
+                                ("bg-success", "Success"),
+                                ("bg-info", "Info"),
+                                ("bg-warning", "Warning"),
+                                ("bg-danger", "Danger"),
+                                ("bg-light", "Light"),
+                                ("bg-dark", "Dark"),
+                                ("bg-black", "Black"),
+                            ],
+                            "label": "Card Body Background Colour",
+                        },
+                    ),
+                    27: (
+                        "wagtail.blocks.ListBlock",
+                        (blocks.collapsible_card.CollapsibleCard,),
+                        {"min_num": 2},
+                    ),
+                    28: (
+                        "wagtail.blocks.StructBlock",
+                        [[("header_colour", 25), ("body_colour", 26), ("cards", 27)]],
+                        {},
+                    ),
+                    29: ("product.blocks.ProductChooserBlock", (), {}),
+                    30: (
+                        "wagtail.blocks.URLBlock",
+                        (),
+                        {
+                            "help_text": "Use the 'Get Metadata' button to retrieve information from the external website.",
+                            "label": "URL to External Article",
+                        },
+                    ),
+                    31: ("wagtail.blocks.RichTextBlock", (), {}),
+                    32: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"max_length": 200, "required": False},
+                    ),
+                    33: (
+                        "wagtail.blocks.StructBlock",
+                        [[("external_link", 30), ("description", 31), ("image", 32)]],
+                        {},
+                    ),
+                    34: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                (None, "No Link"),
+                                ("page", "Page Link"),
+                                ("url_link", "URL Link"),
+                                ("document", "Document Link"),
+                                ("product", "Product Link"),
+                            ],
+                            "label": "Link Type",
+                            "required": False,
+                        },
+                    ),
+                    35: (
+                        "wagtail.blocks.static_block.StaticBlock",
+                        (),
+                        {"admin_text": "", "label": "No link selected."},
+                    ),
+                    36: (
+                        "blocks.data_blocks.DataPageChooserBlock",
+                        (),
+                        {
+                            "attrs": {"data-link-block-type": "page"},
+                            "chooser_attrs": {"show_edit_link": False},
+                            "label": "Link to internal page",
+                            "required": False,
+                        },
+                    ),
+                    37: (
+                        "blocks.data_blocks.DataCharBlock",
+                        (),
+                        {
+                            "attrs": {"data-link-block-type": "page"},
+                            "label": "Optional anchor target (#)",
+                            "required": False,
+                        },
+                    ),
+                    38: (
+                        "blocks.data_blocks.DataExtendedURLBlock",
+                        (),
+                        {
+                            "attrs": {"data-link-block-type": "url_link"},
+                            "label": "Link to external site or internal URL",
+                            "required": False,
+                        },
+                    ),
+                    39: (
+                        "blocks.data_blocks.DataDocumentChooserBlock",
+                        (),
+                        {
+                            "attrs": {"data-link-block-type": "document"},
+                            "chooser_attrs": {"show_edit_link": False},
+                            "label": "Link to document",
+                            "required": False,
+                        },
+                    ),
+                    40: (
+                        "blocks.data_blocks.DataProductChooserBlock",
+                        (),
+                        {
+                            "attrs": {"data-link-block-type": "product"},
+                            "chooser_attrs": {"show_edit_link": False},
+                            "label": "Link to product",
+                            "required": False,
+                        },
+                    ),
+                    41: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Link text", "required": False},
+                    ),
+                    42: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("link_type", 34),
+                                ("not_selected", 35),
+                                ("page", 36),
+                                ("anchor_target", 37),
+                                ("url_link", 38),
+                                ("document", 39),
+                                ("product", 40),
+                                ("link_text", 41),
+                            ]
+                        ],
+                        {},
+                    ),
+                    43: (
+                        "blocks.rich_text.RichTextBlock",
+                        (),
+                        {
+                            "help_text": "Body text for this card.",
+                            "label": "Card Body Text",
+                        },
+                    ),
+                    44: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("bg-transparent", "Transparent"),
+                                ("bg-primary", "Primary"),
+                                ("bg-secondary", "Secondary"),
+                                ("bg-success", "Success"),
+                                ("bg-info", "Info"),
+                                ("bg-warning", "Warning"),
+                                ("bg-danger", "Danger"),
+                                ("bg-light", "Light"),
+                                ("bg-dark", "Dark"),
+                                ("bg-black", "Black"),
+                            ],
+                            "label": "Card Background Colour",
+                        },
+                    ),
+                    45: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {
+                            "default": True,
+                            "help_text": "Draw a border around the card?",
+                            "label": "Border",
+                            "required": False,
+                        },
+                    ),
+                    46: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("link_type", 34),
+                                ("not_selected", 35),
+                                ("page", 36),
+                                ("anchor_target", 37),
+                                ("url_link", 38),
+                                ("document", 39),
+                                ("product", 40),
+                                ("link_text", 41),
+                            ]
+                        ],
+                        {
+                            "help_text": "If using a link, setting a link label will render a hyperlink button.<br>                    Leave link label blank to make the whole card a clickable link.",
+                            "label": "Optional Card Link",
+                        },
+                    ),
+                    47: (
+                        "blocks.base_blocks.CustomImageChooserBlock",
+                        (),
+                        {
+                            "form_classname": "compact-image-chooser",
+                            "label": "Image",
+                            "required": False,
+                        },
+                    ),
+                    48: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {
+                            "help_text": "A contextual description of the image for screen readers and search engines",
+                            "label": "Description",
+                            "required": False,
+                        },
+                    ),
+                    49: (
+                        "wagtail.blocks.StructBlock",
+                        [[("image", 47), ("description", 48)]],
+                        {
+                            "help_text": "Card Image (approx 1:1.4 ratio - ideally upload 2100x1470px).",
+                            "label": "Optional Card Image",
+                        },
+                    ),
+                    50: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {
+                            "default": 200,
+                            "label": "Minimum width the image can shrink to (pixels)",
+                            "min_value": 100,
+                        },
+                    ),
+                    51: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {
+                            "label": "Optional maximum width the image can grow to (pixels)",
+                            "required": False,
+                        },
+                    ),
+                    52: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                (
+                                    "left-responsive",
+                                    "Responsive Horizontal (Image left of text on widescreen only)",
+                                ),
+                                (
+                                    "right-responsive",
+                                    "Responsive Horizontal (Image right of text on widescreen only)",
+                                ),
+                                (
+                                    "left-fixed",
+                                    "Fixed Horizontal (Image left of text on all screen sizes)",
+                                ),
+                                (
+                                    "right-fixed",
+                                    "Fixed Horizontal (Image right of text on all screen sizes)",
+                                ),
+                                (
+                                    "vertical",
+                                    "Vertical (Image above text on on all screen sizes)",
+                                ),
+                            ],
+                            "label": "Card Format",
+                            "max_length": 15,
+                        },
+                    ),
+                    53: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("sm", "Small screen only"),
+                                ("md", "Small and medium screens"),
+                                ("lg", "Small, medium and large screens"),
+                                ("none", "No breakpoint"),
+                            ],
+                            "label": "Breakpoint for responsive layouts",
+                        },
+                    ),
+                    54: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("text", 43),
+                                ("background", 44),
+                                ("border", 45),
+                                ("link", 46),
+                                ("image", 49),
+                                ("image_min", 50),
+                                ("image_max", 51),
+                                ("layout", 52),
+                                ("breakpoint", 53),
+                            ]
+                        ],
+                        {},
+                    ),
+                    55: (
+                        "blocks.base_blocks.CustomImageChooserBlock",
+                        (),
+                        {
+                            "form_classname": "compact-image-chooser",
+                            "label": "Image",
+                            "required": True,
+                        },
+                    ),
+                    56: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {
+                            "help_text": "A contextual description of the image for screen readers and search engines",
+                            "label": "Description",
+                            "required": True,
+                        },
+                    ),
+                    57: (
+                        "wagtail.blocks.StructBlock",
+                        [[("image", 55), ("description", 56)]],
+                        {},
+                    ),
+                    58: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Title", "required": True},
+                    ),
+                    59: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [("h2", "H2"), ("h3", "H3"), ("h4", "H4")],
+                            "label": "Size",
+                        },
+                    ),
+                    60: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 58),
+                                ("heading_size", 59),
+                                ("alignment", 9),
+                                ("anchor_id", 10),
+                            ]
+                        ],
+                        {},
+                    ),
+                    61: (
+                        "wagtail.blocks.RawHTMLBlock",
+                        (),
+                        {"label": "Enter Django Template Fragment Code"},
+                    ),
+                    62: ("wagtail.blocks.StructBlock", [[("code", 61)]], {}),
+                    63: (
+                        "wagtail.embeds.blocks.EmbedBlock",
+                        (),
+                        {
+                            "help_text": "eg 'https://www.youtube.com/watch?v=kqN1HUMr22I'",
+                            "label": "Video URL",
+                        },
+                    ),
+                    64: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Caption", "required": False},
+                    ),
+                    65: (
+                        "wagtail.blocks.StructBlock",
+                        [[("video", 63), ("caption", 64), ("background", 44)]],
+                        {},
+                    ),
+                    66: (
+                        "wagtail.documents.blocks.DocumentChooserBlock",
+                        (),
+                        {"label": "Document"},
+                    ),
+                    67: ("wagtail.blocks.CharBlock", (), {"label": "Link Label"}),
+                    68: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("h2", "H2"),
+                                ("h3", "H3"),
+                                ("h4", "H4"),
+                                ("h5", "H5"),
+                                ("h6", "H6"),
+                                ("p", "Body"),
+                            ],
+                            "label": "Text Size",
+                        },
+                    ),
+                    69: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {
+                            "default": "far fa-file",
+                            "label": "Link Icon F.A. Code",
+                            "required": False,
+                        },
+                    ),
+                    70: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("btn-primary", "Standard Button"),
+                                ("btn-secondary", "Secondary Button"),
+                                ("btn-link", "Text Only"),
+                                ("btn-success", "Success Button"),
+                                ("btn-danger", "Danger Button"),
+                                ("btn-warning", "Warning Button"),
+                                ("btn-info", "Info Button"),
+                                ("btn-light", "Light Button"),
+                                ("btn-dark", "Dark Button"),
+                            ],
+                            "label": "Link Appearance",
+                            "max_length": 15,
+                        },
+                    ),
+                    71: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("start", "Left"),
+                                ("center", "Centre"),
+                                ("end", "Right"),
+                            ],
+                            "label": "Text Alignment",
+                        },
+                    ),
+                    72: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": True, "label": "Outline Button", "required": False},
+                    ),
+                    73: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": False, "label": "Full Width", "required": False},
+                    ),
+                    74: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("document", 66),
+                                ("link_label", 67),
+                                ("text_size", 68),
+                                ("icon", 69),
+                                ("appearance", 70),
+                                ("alignment", 71),
+                                ("outline", 72),
+                                ("full_width", 73),
+                            ]
+                        ],
+                        {},
+                    ),
+                    75: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("page", "Page Link"),
+                                ("url_link", "URL Link"),
+                                ("document", "Document Link"),
+                                ("product", "Product Link"),
+                            ],
+                            "label": "Link Type",
+                        },
+                    ),
+                    76: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("link_type", 75),
+                                ("page", 36),
+                                ("anchor_target", 37),
+                                ("url_link", 38),
+                                ("document", 39),
+                                ("product", 40),
+                                ("link_text", 41),
+                            ]
+                        ],
+                        {},
+                    ),
+                    77: ("wagtail.blocks.ListBlock", (76,), {}),
+                    78: (
+                        "wagtail.blocks.ListBlock",
+                        (blocks.map.MapWaypointBlock,),
+                        {
+                            "label": "Add Waypoints (minimum 2, maximum 25)",
+                            "max_num": 25,
+                            "min_num": 2,
+                        },
+                    ),
+                    79: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("standard", "Standard Map"),
+                                ("streets", "Street Map"),
+                                ("terrain", "Outdoors / Terrain"),
+                                ("satellite", "Satellite"),
+                                ("satellite_streets", "Satellite Steet Map"),
+                            ],
+                            "label": "Map Type",
+                        },
+                    ),
+                    80: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {
+                            "default": 70,
+                            "label": "Height (% of viewport)",
+                            "min_value": 20,
+                        },
+                    ),
+                    81: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("", "None"),
+                                ("walking", "Walking"),
+                                ("cycling", "Cycling"),
+                                ("driving", "Driving"),
+                                (
+                                    "driving-traffic",
+                                    "Driving (with traffic conditions)",
+                                ),
+                            ],
+                            "required": False,
+                        },
+                    ),
+                    82: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {
+                            "default": True,
+                            "label": "Show Route Info",
+                            "required": False,
+                        },
+                    ),
+                    83: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {
+                            "default": 0,
+                            "label": "Initial Tilt (degrees from vertical)",
+                            "max_value": 90,
+                            "min_value": 0,
+                        },
+                    ),
+                    84: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {
+                            "default": 0,
+                            "label": "Initial Bearing (degrees from North)",
+                            "max_value": 360,
+                            "min_value": -180,
+                        },
+                    ),
+                    85: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 5, "label": "Top Padding", "min_value": 0},
+                    ),
+                    86: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 5, "label": "Bottom Padding", "min_value": 0},
+                    ),
+                    87: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 5, "label": "Left Padding", "min_value": 0},
+                    ),
+                    88: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 5, "label": "Right Padding", "min_value": 0},
+                    ),
+                    89: (
+                        "wagtail.blocks.static_block.StaticBlock",
+                        (),
+                        {
+                            "admin_text": "<span class='help'>Padding left/right should be given as a percentage of the map dimension.</span>"
+                        },
+                    ),
+                    90: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("waypoints", 78),
+                                ("style", 79),
+                                ("height", 80),
+                                ("route_type", 81),
+                                ("show_route_info", 82),
+                                ("pitch", 83),
+                                ("bearing", 84),
+                                ("padding_top", 85),
+                                ("padding_bottom", 86),
+                                ("padding_left", 87),
+                                ("padding_right", 88),
+                                ("padding_help", 89),
+                            ]
+                        ],
+                        {},
+                    ),
+                    91: ("wagtail.blocks.CharBlock", (), {"label": "Title"}),
+                    92: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": True, "label": "Ordered List", "required": False},
+                    ),
+                    93: (
+                        "wagtail.blocks.RichTextBlock",
+                        (),
+                        {
+                            "editor": "minimal",
+                            "features": None,
+                            "label": "Optional Introduction Text",
+                            "required": False,
+                        },
+                    ),
+                    94: (
+                        "wagtail.blocks.RichTextBlock",
+                        (),
+                        {"editor": "procedure", "features": None},
+                    ),
+                    95: ("wagtail.images.blocks.ImageBlock", [], {}),
+                    96: (
+                        "wagtail.blocks.StreamBlock",
+                        [[("rich_text", 94), ("image", 95), ("video", 65)]],
+                        {},
+                    ),
+                    97: (
+                        "wagtail.blocks.StructBlock",
+                        [[("content", 96)]],
+                        {"_depth": 4},
+                    ),
+                    98: (
+                        "wagtail.blocks.StreamBlock",
+                        [
+                            [
+                                ("rich_text", 94),
+                                ("image", 95),
+                                ("video", 65),
+                                ("nested_list_item", 97),
+                            ]
+                        ],
+                        {},
+                    ),
+                    99: (
+                        "wagtail.blocks.StructBlock",
+                        [[("content", 98)]],
+                        {"_depth": 3},
+                    ),
+                    100: (
+                        "wagtail.blocks.StreamBlock",
+                        [
+                            [
+                                ("rich_text", 94),
+                                ("image", 95),
+                                ("video", 65),
+                                ("nested_list_item", 99),
+                            ]
+                        ],
+                        {},
+                    ),
+                    101: (
+                        "wagtail.blocks.StructBlock",
+                        [[("content", 100)]],
+                        {"_depth": 2},
+                    ),
+                    102: (
+                        "wagtail.blocks.StreamBlock",
+                        [
+                            [
+                                ("rich_text", 94),
+                                ("image", 95),
+                                ("video", 65),
+                                ("nested_list_item", 101),
+                            ]
+                        ],
+                        {},
+                    ),
+                    103: (
+                        "wagtail.blocks.StructBlock",
+                        [[("content", 102)]],
+                        {"_depth": 1},
+                    ),
+                    104: ("wagtail.blocks.ListBlock", (103,), {"min": 1}),
+                    105: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 91),
+                                ("heading_size", 59),
+                                ("anchor_id", 10),
+                                ("is_ordered", 92),
+                                ("introduction", 93),
+                                ("items", 104),
+                            ]
+                        ],
+                        {},
+                    ),
+                    106: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Name", "max_length": 255},
+                    ),
+                    107: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "File Name", "max_length": 255},
+                    ),
+                    108: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"label": "File Size (bytes)", "max_length": 50},
+                    ),
+                    109: (
+                        "wagtail.blocks.StructBlock",
+                        [[("name", 107), ("size", 108)]],
+                        {},
+                    ),
+                    110: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Link Text", "max_length": 255},
+                    ),
+                    111: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Target", "max_length": 2048},
+                    ),
+                    112: (
+                        "wagtail.blocks.StructBlock",
+                        [[("name", 110), ("target", 111)]],
+                        {},
+                    ),
+                    113: (
+                        "wagtail.blocks.StreamBlock",
+                        [[("file", 109), ("link", 112)]],
+                        {},
+                    ),
+                    114: (
+                        "wagtail.blocks.StructBlock",
+                        [[("name", 106), ("content", 113)]],
+                        {"_depth": 4},
+                    ),
+                    115: (
+                        "wagtail.blocks.StreamBlock",
+                        [[("folder", 114), ("file", 109), ("link", 112)]],
+                        {},
+                    ),
+                    116: (
+                        "wagtail.blocks.StructBlock",
+                        [[("name", 106), ("content", 115)]],
+                        {"_depth": 3},
+                    ),
+                    117: (
+                        "wagtail.blocks.StreamBlock",
+                        [[("folder", 116), ("file", 109), ("link", 112)]],
+                        {},
+                    ),
+                    118: (
+                        "wagtail.blocks.StructBlock",
+                        [[("name", 106), ("content", 117)]],
+                        {"_depth": 2},
+                    ),
+                    119: (
+                        "wagtail.blocks.StreamBlock",
+                        [[("folder", 118), ("file", 109), ("link", 112)]],
+                        {},
+                    ),
+                    120: (
+                        "wagtail.blocks.StructBlock",
+                        [[("name", 106), ("content", 119)]],
+                        {"_depth": 1},
+                    ),
+                },
+                verbose_name="Page Content",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0030_csv_table_html_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "corpus_hash",
+                    models.CharField(max_length=64, verbose_name="Corpus Hash"),
+                ),
+                (
+                    "term",
+                    models.CharField(
+                        db_index=True, max_length=100, verbose_name="Term"
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Count")),
+                (
+                    "page",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="blog.blogpage",
+                        verbose_name="Page",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Page Term",
+                "verbose_name_plural": "Page Terms",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("page", "term"), name="unique_page_term"
+                    )
+                ],
+            },
+        ),
+    ]
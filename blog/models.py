@@ -1,7 +1,10 @@
+import hashlib
+import json
+
 from django import forms
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from modelcluster.fields import ParentalKey, ParentalManyToManyField
 from wagtail.admin.panels import (FieldPanel, InlinePanel, MultiFieldPanel,
@@ -29,6 +32,8 @@ from product.blocks import ProductChooserBlock
 
 from .categories import BlogCategory
 from .partners import Partnership
+from .term_index import PageTerm, count_terms
+from .wordcloud import WORDCLOUD_FOLDER, get_wordcloud_url
 
 class AuthorPanel(FieldPanel):
     class BoundPanel(FieldPanel.BoundPanel):
@@ -111,6 +116,9 @@ class BlogPage(Page):
     wordcount = models.IntegerField(
         null=True, blank=True, verbose_name="Word Count", default=0
     )
+    corpus_text = models.TextField(blank=True, default="", editable=False)
+    corpus_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     author = models.ForeignKey(
         User,
         null=True,
@@ -308,12 +316,101 @@ class BlogPage(Page):
     class Meta:
         verbose_name = "Blog Page"
 
-    @cached_property
+    CORPUS_FIELDS = ["wordcount", "corpus_text", "corpus_hash", "content_hash"]
+
+    def get_content_hash(self):
+        return hashlib.sha256(
+            json.dumps(list(self.content.raw_data), sort_keys=True, cls=DjangoJSONEncoder).encode()
+        ).hexdigest()
+
+    def update_corpus(self, force=False):
+        """
+        Recompute corpus_text, corpus_hash and wordcount if content has changed since they were
+        last stored (or force=True). Returns True if the fields were updated.
+        """
+        content_hash = self.get_content_hash()
+        if not force and content_hash == self.content_hash:
+            return False
+        self.corpus_text = get_streamfield_text(self.content)
+        self.corpus_hash = hashlib.sha256(self.corpus_text.encode()).hexdigest()
+        self.wordcount = count_words(self.corpus_text)
+        self.content_hash = content_hash
+        return True
+
+    def store_corpus(self, force=False):
+        """
+        update_corpus and write the changed fields with queryset.update(), so no revision is created and no
+        save hooks run. Returns True if the fields were updated.
+        """
+        if not self.update_corpus(force=force):
+            return False
+        BlogPage.objects.filter(pk=self.pk).update(**{field: getattr(self, field) for field in self.CORPUS_FIELDS})
+        return True
+
+    def full_clean(self, *args, **kwargs):
+        # runs before save_revision, so drafts carry their own word count
+        self.update_corpus()
+        super().full_clean(*args, **kwargs)
+
+    def serializable_data(self):
+        # corpus fields are derived from content, keep them out of revision content so every revision doesn't
+        # store a copy of the text. Pages restored from a revision have no content_hash, so the corpus is
+        # recomputed when the revision is published (save) or previewed (ensure_corpus).
+        data = super().serializable_data()
+        for field_name in ["corpus_text", "corpus_hash", "content_hash"]:
+            data.pop(field_name, None)
+        return data
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            if self.update_corpus() and update_fields is not None:
+                kwargs["update_fields"] = list({*update_fields, *self.CORPUS_FIELDS})
+        return super().save(*args, **kwargs)
+
+    def ensure_corpus(self):
+        # stored fields are kept current by save() and full_clean(), only pages saved before they
+        # existed (not yet backfilled by update_wordcounts) are computed here
+        if not self.content_hash:
+            self.update_corpus()
+
+    @property
     def corpus(self):
-        return get_streamfield_text(self.content)
+        self.ensure_corpus()
+        return self.corpus_text
+
+    @property
+    def words(self):
+        self.ensure_corpus()
+        return self.wordcount
+
+    def get_wordcloud_folder(self):
+        return f"{WORDCLOUD_FOLDER}/{self.pk}"
+
+    def get_term_frequencies(self, limit=200):
+        """
+        {term: count} for the most frequent terms of the corpus, from the term index (blog.term_index) when it
+        holds the current corpus, else counted from the corpus (drafts, previews).
+        """
+        self.ensure_corpus()
+        if PageTerm.is_current(self):
+            return PageTerm.objects.filter(page_id=self.pk).frequencies(limit)
+        return dict(count_terms(self.corpus_text).most_common(limit))
 
-    @cached_property
-    def words(self, corpus=None):
-        if not corpus:
-            corpus = self.corpus
-        return count_words(corpus)
+    def get_wordcloud_url(self, mask_image, export_as="webp", generate=True, **wordcloud_options):
+        """
+        Url of the word cloud for this page's term frequencies, see blog.wordcloud.
+        With generate=False, returns None if it hasn't been rendered yet.
+        """
+        self.ensure_corpus()
+        max_words = wordcloud_options.get("max_words", 200)
+        return get_wordcloud_url(
+            None,
+            mask_image,
+            export_as=export_as,
+            wordcloud_options=wordcloud_options,
+            corpus_hash=self.corpus_hash,
+            folder=self.get_wordcloud_folder(),
+            generate=generate,
+            frequencies=lambda: self.get_term_frequencies(max_words),
+        )
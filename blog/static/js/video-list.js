@@ -156,7 +156,7 @@ class VideoList {
     async loadCards(auto = true) {
         // if auto===true load, next set of videos only if bottom of videlist less than 150px below bottom of screen
         // only run if not all pages have loaded
-        if (this.pagination.enabled) {
+        if (this.pagination.enabled && this.pagination.next) {
             const containerRect = this.videoList.getBoundingClientRect();
             const viewportHeight = window.innerHeight;
             const containerBottom = containerRect.bottom;
@@ -165,8 +165,9 @@ class VideoList {
                 try {
                     // triggers fade in/out effect on thumbnail via css
                     this.videoListContainer.dataset.cardsLoading = true;
-                    // increment current_page and fetch data for next page from api
-                    const url = `${window.location.href}api/page/${++this.pagination.current_page}/`;
+                    // fetch data for the cards after the last loaded card from api
+                    const [position, pk] = this.pagination.next;
+                    const url = `${window.location.href}api/after/${position}/${pk}/`;
                     const response = await fetch(url);
                     if (!response.ok) {
                         throw new Error('Network response was not ok');
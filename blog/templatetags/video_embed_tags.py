@@ -1,27 +1,21 @@
-from urllib.parse import urlparse
-
-from bs4 import BeautifulSoup
 from django import template
-from wagtail.embeds.embeds import get_embed
-from wagtail.embeds.exceptions import EmbedException
+
+from core.embeds import get_embed_attrs, get_embed_attrs_many
 
 register = template.Library()
 
 @register.simple_tag()
 def get_embed_code(url):
-    try:
-        embed = get_embed(url)
-        soup = BeautifulSoup(embed.html, 'html.parser')
-        iframe = soup.find('iframe')
-        src = urlparse(iframe['src']).path
+    """
+    Embed attributes (video_id, thumbnail_url, title, author_name, last_updated) for url, None if it can't be embedded.
+    Cached per Embed row, the embed html is only parsed when the row changes.
+    """
+    return get_embed_attrs(url)
 
-        return {
-            'video_id': src.split('/')[-1:][0],
-            'thumbnail_url': embed.thumbnail_url,
-            'title': embed.title,
-            'author_name': embed.author_name,
-            'last_updated': embed.last_updated,
-        }
-    
-    except EmbedException:
-        pass
\ No newline at end of file
+@register.simple_tag()
+def get_embed_codes(urls):
+    """
+    Bulk get_embed_code for lists of urls: {% get_embed_codes urls as embed_codes %}
+    Returns {url: attributes}, one cache lookup and at most one query for the list.
+    """
+    return get_embed_attrs_many(urls)
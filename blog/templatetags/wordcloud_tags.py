@@ -0,0 +1,36 @@
+from django import template
+
+from blog.wordcloud import get_queue
+
+register = template.Library()
+
+@register.simple_tag()
+def wordcloud_url(page, mask_image, export_as="webp", **wordcloud_options):
+    """
+    Url of the cached word cloud rendition for a BlogPage, rendered on the request if missing, e.g.
+    <img src="{% wordcloud_url page mask_image 'webp' max_words=100 %}" alt="">
+    """
+    if not (page and mask_image):
+        return ""
+    try:
+        return page.get_wordcloud_url(mask_image, export_as, **wordcloud_options)
+    except Exception as e:
+        print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+        return ""
+
+@register.inclusion_tag("blog/wordcloud.html")
+def wordcloud(page, mask_image, export_as="webp", **wordcloud_options):
+    """
+    Word cloud image for a BlogPage, or a placeholder while the rendition is rendered in the background, e.g.
+    {% wordcloud page mask_image 'svg' max_words=100 %}
+    """
+    context = {"url": None, "width": getattr(mask_image, "width", None), "height": getattr(mask_image, "height", None)}
+    if not (page and mask_image):
+        return context
+    try:
+        context["url"] = page.get_wordcloud_url(mask_image, export_as, generate=False, **wordcloud_options)
+        if not context["url"]:
+            get_queue().enqueue(page.pk, [(mask_image.pk, export_as, wordcloud_options)])
+    except Exception as e:
+        print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+    return context
@@ -0,0 +1,180 @@
+"""
+Site-wide term frequency index of BlogPage corpora.
+One row per (page, term) holding the number of times the term appears in the page corpus, updated
+incrementally when a page is published. Site-wide or category-wide term and document frequencies are
+then aggregate queries rather than re-tokenizing every corpus:
+
+    PageTerm.objects.live().top_terms(50)
+    PageTerm.objects.live().for_category(category).frequencies(200)
+    get_terms_wordcloud_url(PageTerm.objects.live(), mask_image)
+
+Unpublished pages are dropped from the index.
+"""
+import hashlib
+import json
+import re
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count, Sum
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from wagtail.signals import page_published, page_unpublished
+from wordcloud import STOPWORDS
+
+from .wordcloud import WORDCLOUD_FOLDER, get_wordcloud_url
+
+# same token pattern as WordCloud.process_text
+RE_TOKEN = re.compile(r"\w[\w']*")
+TERM_MAX_LENGTH = 100
+
+
+def tokenize(text, stopwords=STOPWORDS):
+    """Lowercase terms in text without possessives, stopwords, numbers or single characters"""
+    for token in RE_TOKEN.findall(text.lower()):
+        if token.endswith("'s"):
+            token = token[:-2]
+        if len(token) > 1 and not token.isdigit() and token not in stopwords:
+            yield token[:TERM_MAX_LENGTH]
+
+
+def count_terms(text):
+    return Counter(tokenize(text))
+
+
+class PageTermQuerySet(models.QuerySet):
+    def live(self):
+        return self.filter(page__live=True)
+
+    def for_pages(self, pages):
+        # rows for a page queryset or list of page ids
+        if isinstance(pages, models.QuerySet):
+            pages = pages.values("pk")
+        return self.filter(page_id__in=pages)
+
+    def for_category(self, category):
+        return self.filter(page__categories=category)
+
+    def term_totals(self):
+        # term frequency (total count) and document frequency (pages) per term
+        return (
+            self.values("term")
+            .annotate(total=Sum("count"), documents=Count("page_id", distinct=True))
+            .order_by("-total", "term")
+        )
+
+    def top_terms(self, limit=50):
+        """[(term, total count, document count)] for the most frequent terms"""
+        return [(row["term"], row["total"], row["documents"]) for row in self.term_totals()[:limit]]
+
+    def frequencies(self, limit=200):
+        """{term: total count} for the most frequent terms, for WordCloud.generate_from_frequencies"""
+        return {row["term"]: row["total"] for row in self.term_totals()[:limit]}
+
+    def document_frequencies(self, terms=None):
+        """{term: number of pages using it}"""
+        queryset = self.filter(term__in=terms) if terms is not None else self
+        return dict(
+            queryset.values("term")
+            .annotate(documents=Count("page_id", distinct=True))
+            .values_list("term", "documents")
+        )
+
+
+class PageTerm(models.Model):
+    page = models.ForeignKey(
+        "blog.BlogPage",
+        on_delete=models.CASCADE,
+        related_name="terms",
+        verbose_name=_("Page"),
+    )
+    corpus_hash = models.CharField(verbose_name=_("Corpus Hash"), max_length=64)
+    term = models.CharField(verbose_name=_("Term"), max_length=TERM_MAX_LENGTH, db_index=True)
+    count = models.PositiveIntegerField(verbose_name=_("Count"), default=0)
+
+    objects = PageTermQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Page Term")
+        verbose_name_plural = _("Page Terms")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["page", "term"],
+                name="unique_page_term",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.page_id} {self.term}: {self.count}"
+
+    @classmethod
+    def is_current(cls, page):
+        # True if the index already holds the current corpus of page
+        return cls.objects.filter(page_id=page.pk, corpus_hash=page.corpus_hash).exists()
+
+    @classmethod
+    def update_for_page(cls, page, force=False):
+        """
+        Bring the index rows for page in line with its corpus, only changed terms are written.
+        Stored corpus fields that are out of date (pages not yet backfilled by update_wordcounts) are saved first.
+        Returns the number of rows created, updated or deleted.
+        """
+        page.store_corpus()
+        if not force and cls.is_current(page):
+            return 0
+        counts = count_terms(page.corpus_text)
+        existing = {row.term: row for row in cls.objects.filter(page_id=page.pk)}
+
+        removed = [row.pk for term, row in existing.items() if term not in counts]
+        created = [
+            cls(page_id=page.pk, corpus_hash=page.corpus_hash, term=term, count=count)
+            for term, count in counts.items() if term not in existing
+        ]
+        updated = []
+        for term, row in existing.items():
+            if term in counts and (row.count != counts[term] or row.corpus_hash != page.corpus_hash):
+                row.count = counts[term]
+                row.corpus_hash = page.corpus_hash
+                updated.append(row)
+
+        with transaction.atomic():
+            cls.objects.filter(pk__in=removed).delete()
+            cls.objects.bulk_create(created)
+            cls.objects.bulk_update(updated, ["count", "corpus_hash"], batch_size=500)
+        return len(removed) + len(created) + len(updated)
+
+
+def get_terms_wordcloud_url(queryset, mask_image, export_as="webp", limit=200, folder=None, **wordcloud_options):
+    """
+    Word cloud url for the aggregated term frequencies of a PageTerm queryset, e.g. a site-wide or category cloud.
+    Renditions are keyed by a hash of the frequencies so they change with the index.
+    """
+    frequencies = queryset.frequencies(limit)
+    if not frequencies:
+        return None
+    frequency_hash = hashlib.sha256(json.dumps(frequencies, sort_keys=True).encode()).hexdigest()
+    return get_wordcloud_url(
+        None,
+        mask_image,
+        export_as=export_as,
+        wordcloud_options=wordcloud_options,
+        corpus_hash=frequency_hash,
+        folder=folder or f"{WORDCLOUD_FOLDER}/terms",
+        frequencies=frequencies,
+    )
+
+
+@receiver(page_published)
+def update_page_terms(sender, instance, **kwargs):
+    if not hasattr(instance, "corpus_text"):
+        return
+    try:
+        PageTerm.update_for_page(instance)
+    except Exception as e:
+        print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+
+
+@receiver(page_unpublished)
+def remove_page_terms(sender, instance, **kwargs):
+    if hasattr(instance, "corpus_text"):
+        PageTerm.objects.filter(page_id=instance.pk).delete()
@@ -0,0 +1,105 @@
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils.timezone import now
+from wagtail.embeds.embeds import get_embed_hash
+from wagtail.embeds.models import Embed
+from wagtail.models import Locale, Page
+
+from blog.video_page import SimpleVideoOrderable, VideoPage
+
+
+class VideoRangeTests(TestCase):
+    """Keyset paging of the video api on (sort order, pk), sort orders can be tied or null"""
+
+    # sort order per video, in insertion (pk) order
+    sort_orders = [3, 1, 1, None, 2, 1, None]
+
+    def setUp(self):
+        cache.clear()
+        Locale.objects.get_or_create(language_code="en")
+        root = Page.get_first_root_node() or Page.add_root(title="Root", slug="root")
+        self.urls = [f"https://videos.test/video-{i}" for i in range(len(self.sort_orders))]
+        page = VideoPage(title="Videos", slug="videos", intro="Videos")
+        page.videos = [SimpleVideoOrderable(url=url) for url in self.urls]
+        root.add_child(instance=page)
+        for url, sort_order in zip(self.urls, self.sort_orders):
+            SimpleVideoOrderable.objects.filter(page=page, url=url).update(sort_order=sort_order)
+            # stored embeds, so nothing is fetched
+            Embed.objects.create(
+                url=url, hash=get_embed_hash(url), type="video", html="", title=url, thumbnail_url=f"{url}.jpg"
+            )
+        self.page = VideoPage.objects.get(pk=page.pk)
+        self.page.page_size = 2
+        self.card_ids = {
+            video.url: f"video-card-{video.pk}" for video in SimpleVideoOrderable.objects.filter(page=page)
+        }
+
+    def expected_card_ids(self):
+        # descending sort order, nulls last, ties newest first
+        videos = SimpleVideoOrderable.objects.filter(page=self.page)
+        videos = sorted(videos, key=lambda video: (-1 if video.sort_order is None else video.sort_order, video.pk))
+        return [f"video-card-{video.pk}" for video in reversed(videos)]
+
+    def get_api(self, after, etag=None):
+        path = f"/api/after/{after[0]}/{after[1]}/"
+        request = RequestFactory().get(path, headers={"If-None-Match": etag} if etag else {})
+        view, args, kwargs = self.page.resolve_subpage(path)
+        return view(request, *args, **kwargs)
+
+    def test_cursor_paging(self):
+        page = self.page.video_range()
+        card_ids = [video["card_id"] for video in page["videos"]]
+        while page["pagination"]["next"]:
+            self.assertTrue(page["pagination"]["enabled"])
+            self.assertEqual(len(page["videos"]), 2)
+            page = self.page.video_range(after=page["pagination"]["next"])
+            card_ids += [video["card_id"] for video in page["videos"]]
+        # no duplicates or skipped videos across tied and null sort orders
+        self.assertEqual(card_ids, self.expected_card_ids())
+        self.assertFalse(page["pagination"]["enabled"])
+
+    def test_pages_to_load(self):
+        page = self.page.video_range(pages_to_load=2)
+        self.assertEqual([video["card_id"] for video in page["videos"]], self.expected_card_ids()[:4])
+        page = self.page.video_range(after=page["pagination"]["next"], pages_to_load=2)
+        self.assertEqual([video["card_id"] for video in page["videos"]], self.expected_card_ids()[4:])
+        self.assertIsNone(page["pagination"]["next"])
+
+    def test_invalid_cursor(self):
+        for after in (["x", 1], [1], [1, 2, 3], 12):
+            with self.subTest(after=after):
+                page = self.page.video_range(after=after)
+                self.assertEqual([video["card_id"] for video in page["videos"]], self.expected_card_ids()[:2])
+
+    def test_api(self):
+        after = self.page.video_range()["pagination"]["next"]
+        response = self.get_api(after)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [video["card_id"] for video in json.loads(response.content)["videos"]], self.expected_card_ids()[2:4]
+        )
+        # null sort orders are -1 in the cursor
+        newer, older = SimpleVideoOrderable.objects.filter(page=self.page, sort_order=None).order_by("-pk")
+        response = self.get_api([-1, newer.pk])
+        self.assertEqual(
+            [video["card_id"] for video in json.loads(response.content)["videos"]], [f"video-card-{older.pk}"]
+        )
+        response = self.get_api([-1, older.pk])
+        self.assertEqual(json.loads(response.content), {"videos": [], "pagination": {"enabled": False, "next": None}})
+
+    def test_etag(self):
+        after = self.page.video_range()["pagination"]["next"]
+        etag = self.get_api(after)["ETag"]
+        self.assertEqual(self.get_api(after, etag=etag).status_code, 304)
+        self.assertNotEqual(self.get_api([after[0], after[1] + 1])["ETag"], etag)
+
+        # refreshed embed data changes the etag and the cached json
+        Embed.objects.filter(url=self.urls[0]).update(title="New title", last_updated=now() + timedelta(seconds=1))
+        response = self.get_api(after, etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        first = json.loads(self.get_api([99, 0]).content)["videos"][0]
+        self.assertEqual((first["card_id"], first["title"]), (self.card_ids[self.urls[0]], "New title"))
@@ -1,20 +1,26 @@
 import logging
-import random
-import string
+from hashlib import md5
 from urllib.parse import parse_qs, urlparse
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Coalesce
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from modelcluster.fields import ParentalKey
 from wagtail.admin.panels import FieldPanel, InlinePanel, MultiFieldPanel
-from wagtail.contrib.routable_page.models import RoutablePageMixin, path
+from wagtail.contrib.routable_page.models import RoutablePageMixin, path, re_path
 from wagtail.embeds.embeds import get_embed
 from wagtail.embeds.exceptions import EmbedException
 from wagtail.fields import RichTextField
 from wagtail.models import Orderable, Page
 
+from core.embeds import get_embeds, get_embeds_version
+
 
 class SimpleVideoOrderable(Orderable):
     page = ParentalKey("blog.VideoPage", related_name="videos")
@@ -46,20 +52,22 @@ class SimpleVideoOrderable(Orderable):
             id = parse_qs(parse.query).get('v')
         return id[0] if id else ''
     
+    def get_embed_attrs(self, embed):
+        return {
+            'video_id': self.video_id,
+            'thumbnail_url': embed.thumbnail_url,
+            'title': embed.title,
+            'author_name': embed.author_name,
+            'last_updated': embed.last_updated,
+        }
+
     @cached_property
     def embed_attrs(self):
         """
         Get cached embed attributes from the db
         """
         try:
-            embed = get_embed(self.url)
-            return {
-                'video_id': self.video_id,
-                'thumbnail_url': embed.thumbnail_url,
-                'title': embed.title,
-                'author_name': embed.author_name,
-                'last_updated': embed.last_updated,
-            }
+            return self.get_embed_attrs(get_embed(self.url))
         except EmbedException as e:
             logging.warning(
                 f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: Unable to embed {self.url}"
@@ -89,50 +97,82 @@ class VideoPage(RoutablePageMixin, Page):
     class Meta:
         verbose_name = _("Video Page")
 
-    def video_range(self, page=1, pages_to_load=1):
+    def get_videos(self, after=None):
+        """
+        Videos after cursor (position, pk) in reverse sort order, ties and null sort orders are ordered by pk.
+        position is the sort order, -1 for null.
         """
-        Return video card details for requested page.
+        videos = self.videos.all()
+        if not isinstance(videos, models.QuerySet):
+            # previews use modelcluster's in-memory FakeQuerySet
+            videos = list(videos)
+            for video in videos:
+                video.position = -1 if video.sort_order is None else video.sort_order
+            videos.sort(key=lambda video: (video.position, video.pk or 0), reverse=True)
+            if after is not None:
+                videos = [video for video in videos if (video.position, video.pk or 0) < after]
+            return videos
+        videos = videos.annotate(position=Coalesce('sort_order', -1)).order_by('-position', '-pk')
+        if after is not None:
+            position, pk = after
+            videos = videos.filter(Q(position__lt=position) | Q(position=position, pk__lt=pk))
+        return videos
+
+    def video_range(self, after=None, pages_to_load=1):
+        """
+        Return video card details for the page of videos after cursor after, None for the first page.
+        The cursor is the (sort order, pk) of the last video already loaded, sort orders aren't unique.
         Request multiple pages with pages_to_load.
-        Returns dictionary of videos and pagination status.
+        Returns dictionary of videos and pagination status, pagination['next'] is the cursor for the next page
+        (None on the last page).
         Number of cards per page set by page_size class attribute.
         """
-        # ensure parameters are positive whole numbers       
+        # ensure parameters are whole numbers
         try:
-            page = max(int(page), 1)
+            after = tuple(int(value) for value in after) if after is not None else None
+            if after is not None and len(after) != 2:
+                raise ValueError
         except (TypeError, ValueError):
-            page = 1
+            after = None
         try:
             pages_to_load = max(int(pages_to_load), 1)
         except (TypeError, ValueError):
             pages_to_load = 1
 
-        # calculate slice limits
-        slice_start = self.page_size * pages_to_load * (page -1)
-        slice_end = self.page_size * pages_to_load * page
-        # videos are reverse ordered
-        video_slice = self.videos.all().order_by('-sort_order')[slice_start:slice_end]
+        # keyset pagination on (sort_order, pk), videos are reverse ordered
+        # fetch one extra video to find out if there is another page
+        limit = self.page_size * pages_to_load
+        video_slice = self.get_videos(after)
+        video_slice = list(video_slice[:limit + 1])
+        has_next = len(video_slice) > limit
+        video_slice = video_slice[:limit]
+
+        # stored embeds for the slice in one query, missing embeds fetched concurrently
+        embeds = get_embeds([video.url for video in video_slice])
 
-        # get video card set if requested page is <= total pages
         videos = []
         for video in video_slice:
-            details = video.embed_attrs
             # only return card if embed valid
-            if details:
-                # use random id for card to ensure each is unique on the page
-                details['card_id'] = ''.join(random.choice(string.ascii_letters) for _ in range(8))
+            if video.url in embeds:
+                details = video.get_embed_attrs(embeds[video.url])
+                # card id from the video row so responses are repeatable, video ids may not be unique on the page
+                details['card_id'] = f"video-card-{video.pk or video.sort_order}"
                 details['description'] = video.description
                 videos.append(details)
-                    
+
         # disable pagination if last page reached (stops JS class auto-requesting new cards)
-        # assume end reached if video_slice count is anything other than page size
-        # current page calculated from requested page and pages_to_load
         pagination = {
-            'enabled': (video_slice.count() == self.page_size * pages_to_load),
-            'current_page': (page - 1) + pages_to_load,
+            'enabled': has_next,
+            'next': [video_slice[-1].position, video_slice[-1].pk] if has_next else None,
         }
 
         return {'videos': videos, 'pagination': pagination}
 
+    def get_video_api_etag(self, after):
+        # changes with every published revision of the page and whenever embed data (titles, thumbnails) changes
+        revision = self.live_revision_id or self.latest_revision_id or 0
+        embeds_version = get_embeds_version(self.videos.values_list('url', flat=True))
+        return f'"{self.pk}-{revision}-{embeds_version}-{after[0]}.{after[1]}"'
 
     @path("")
     def video_index_page(self, request):
@@ -140,7 +180,7 @@ class VideoPage(RoutablePageMixin, Page):
         # pre-load video cards on page load
         # use initial_pages class attribute to pre-load multiple video card sets
         # e.g. self.page_size = 6, self.initial_pages = 2 : pre-load 6x2=12 cards
-        video_range = self.video_range(page=1, pages_to_load=self.initial_pages)
+        video_range = self.video_range(pages_to_load=self.initial_pages)
         return self.render(
             request,
             context_overrides={
@@ -149,11 +189,26 @@ class VideoPage(RoutablePageMixin, Page):
             },
             template="blog/video-page.html",
         )
-    
-    @path("api/page/<int:page>/")
-    def paginated_video_json_response(self, request, page):
-        """ Endless scroll json response """
-        return JsonResponse(
-            self.video_range(page=page)
-        )
-    
\ No newline at end of file
+
+    # position is -1 for videos without a sort order
+    @re_path(r"^api/after/(?P<position>-?\d+)/(?P<pk>\d+)/$")
+    def paginated_video_json_response(self, request, position, pk):
+        """
+        Endless scroll json response for the cards after the video at cursor (position, pk).
+        Responses are identical for every visitor until the page is republished or an embed changes:
+        served with an ETag and public Cache-Control, and the json cached server side by ETag.
+        """
+        after = (int(position), int(pk))
+        etag = self.get_video_api_etag(after)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            timeout = getattr(settings, "VIDEO_API_CACHE_TIMEOUT", 60 * 5)
+            data = cache.get_or_set(
+                f"video-api-{md5(etag.encode()).hexdigest()}",
+                lambda: self.video_range(after=after),
+                timeout,
+            )
+            response = JsonResponse(data)
+            response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=getattr(settings, "VIDEO_API_CACHE_TIMEOUT", 60 * 5))
+        return response
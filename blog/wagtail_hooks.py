@@ -1,14 +1,10 @@
 from urllib.parse import urlparse
 
-from django.contrib import messages
 from django.urls import resolve
-from django.utils.translation import gettext_lazy as _
 from wagtail import hooks
 from wagtail.images import get_image_model
 from wagtail.models import Collection
 
-from blog.models import BlogPage
-
 from .views import user_chooser_viewset
 
 
@@ -22,20 +18,6 @@ from .views import user_chooser_viewset
 #         return images.filter(width__gte=min_width, height__gte=min_height)
 #     return images
 
-@hooks.register("after_edit_page")
-@hooks.register("after_create_page")
-def get_wordcount(request, page):
-    if page.specific_class == BlogPage:
-        try:
-            page.wordcount = page.words
-            if page.has_unpublished_changes:
-                page.save_revision()
-            else:
-                page.save()
-        except Exception as e:
-            print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")       
-            messages.error(request, _('There was a problem generating the word count'))
-
 @hooks.register('register_admin_viewset')
 def register_user_chooser_viewset():
     return user_chooser_viewset
@@ -1,55 +1,359 @@
-import matplotlib.pyplot as plt
+"""
+Word cloud renditions.
+Clouds are rendered once per (corpus hash, mask image id + file hash, options, format) and written straight
+from the WordCloud image to a WebP/PNG file, or to a minified SVG, in media storage and served by url.
+
+Files for a page are stored under wordclouds/<page id>/ and named <corpus hash>-<rendition key>.<format>,
+a changed corpus gives new names and files for the old corpus are purged when the page is published.
+Clouds without a page (masked_wordcloud without a folder) go in wordclouds/shared/, files there are purged
+WORDCLOUD_SHARED_MAX_AGE seconds after they were written and rendered again when next requested.
+
+Layout is CPU bound (seconds per cloud) so clouds aren't rendered on the request thread when it can be avoided:
+publishing a BlogPage queues the WORDCLOUD_RENDITIONS for it on a process pool (WordCloudQueue), the
+{% wordcloud %} tag queues a missing rendition and shows a placeholder, and the render_wordclouds
+command pre-renders every page across all cores.
+"""
+import base64
+import hashlib
+import json
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import BytesIO
+
 import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
 from PIL import Image
+from wagtail.signals import page_published
 from wordcloud import WordCloud
-from bs4 import BeautifulSoup
-from core.utils import plt_to_png_string
 
-def masked_wordcloud(
-    corpus, 
-    mask_image, 
-    export_as_svg=False,
-    wordcloud_options={
-        'background_color':'rgba(255, 255, 255, 0)',
-        'random_state':1,
-        'mode':'RGBA',
-        'margin':0
-        }
-    ):
+from core.process_pool import init_worker
+
+WORDCLOUD_FOLDER = "wordclouds"
+WORDCLOUD_FORMATS = {"webp": "WEBP", "png": "PNG", "svg": None}
+WORDCLOUD_OPTIONS = {
+    'background_color': 'rgba(255, 255, 255, 0)',
+    'random_state': 1,
+    'mode': 'RGBA',
+    'margin': 0,
+}
+
+RE_SVG_SIZE = re.compile(r'<svg([^>]*) width="(\d+)" height="(\d+)"')
+RE_SVG_STYLE = re.compile(r"<style>.*?</style>", re.DOTALL)
+RE_SVG_FILL = re.compile(r'style="fill:rgb\((\d+), ?(\d+), ?(\d+)\)"')
+
+
+def get_options(wordcloud_options=None):
+    return {**WORDCLOUD_OPTIONS, **(wordcloud_options or {})}
+
+
+def get_corpus_hash(corpus):
+    return hashlib.sha256(corpus.encode()).hexdigest()
+
+
+def get_rendition_key(mask_image, wordcloud_options, export_as):
+    """Hash of everything other than the corpus that changes the rendered cloud"""
+    key = json.dumps(
+        {
+            "mask": [mask_image.pk, mask_image.get_file_hash()],
+            "options": get_options(wordcloud_options),
+            "format": export_as,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_rendition_name(corpus_hash, mask_image, wordcloud_options=None, export_as="webp", folder=None):
+    """Storage name for a word cloud rendition"""
+    if export_as not in WORDCLOUD_FORMATS:
+        raise ValueError(f"export_as must be one of {', '.join(WORDCLOUD_FORMATS)}")
+    key = get_rendition_key(mask_image, wordcloud_options, export_as)
+    return f"{folder or WORDCLOUD_FOLDER + '/shared'}/{corpus_hash[:16]}-{key[:16]}.{export_as}"
+
+
+def get_exists_cache_key(name):
+    return f"wordcloud-exists-{hashlib.md5(name.encode()).hexdigest()}"
+
+
+def rendition_exists(name):
+    # storage lookups are cached, existing renditions never change
+    cache_key = get_exists_cache_key(name)
+    if cache.get(cache_key):
+        return True
+    exists = default_storage.exists(name)
+    if exists:
+        cache.set(cache_key, True, getattr(settings, "WORDCLOUD_CACHE_TIMEOUT", 60 * 60 * 24))
+    return exists
+
+
+def load_mask(mask_image):
     # Get JPEG PIL Image for mask, convert to numpy array
-    pillow = Image.open(mask_image.file.path)
-    if pillow.format != 'JPEG':
-        pillow = Image.open(mask_image.get_rendition("original|format-jpeg").file.path)
-    mask=np.array(pillow)
+    with mask_image.open_file() as file:
+        pillow = Image.open(file)
+        if pillow.format == 'JPEG':
+            return np.array(pillow)
+    rendition = mask_image.get_rendition("original|format-jpeg")
+    with rendition.file.open() as file:
+        return np.array(Image.open(file))
 
-    # Generate Wordcloud plot
+
+def build_wordcloud(mask_image, wordcloud_options=None, corpus=None, frequencies=None):
+    """Lay out a WordCloud for corpus text or a {word: frequency} dict, masked by mask_image"""
     wordcloud = WordCloud(
-        width=mask_image.width, 
-        height=mask_image.height, 
-        mask=mask, 
-        **wordcloud_options
-        ).generate(corpus)
-    
-    if export_as_svg:
-        # generate svg string
-        svg = wordcloud.to_svg()
-        soup = BeautifulSoup(svg,"html.parser")
-        svg = soup.find('svg')
-        # remove hardcoded width/height and replace with viewbox for dynamic sizing
-        svg.attrs['viewbox']=f"0 0 {svg.attrs.pop('width')} {svg.attrs.pop('height')}"
-        svg.attrs['preserveAspectRatio']="xMidYMid meet"
-        # bug returns font-family:\'font-name'\ - replace single quotes with double
-        style = svg.find('style').string
-        style.replace_with(style.replace("'", "\""))
-        return str(soup)
+        width=mask_image.width,
+        height=mask_image.height,
+        mask=load_mask(mask_image),
+        **get_options(wordcloud_options)
+    )
+    if frequencies is not None:
+        return wordcloud.generate_from_frequencies(frequencies)
+    return wordcloud.generate(corpus)
+
+
+def wordcloud_to_svg(wordcloud):
+    """
+    Minified SVG for wordcloud: width/height replaced with a viewBox for dynamic sizing,
+    inline fill styles shortened to hex fill attributes, line breaks removed.
+    """
+    # bug returns font-family:'font-name' - replace single quotes with double
+    svg = RE_SVG_STYLE.sub(lambda m: m.group(0).replace("'", '"'), wordcloud.to_svg(), count=1)
+    svg = RE_SVG_SIZE.sub(r'<svg\1 viewBox="0 0 \2 \3" preserveAspectRatio="xMidYMid meet"', svg, count=1)
+    svg = RE_SVG_FILL.sub(lambda m: 'fill="#{:02x}{:02x}{:02x}"'.format(*map(int, m.groups())), svg)
+    return svg.replace("\n", "")
+
+
+def wordcloud_to_bytes(wordcloud, export_as):
+    if export_as == "svg":
+        return wordcloud_to_svg(wordcloud).encode()
+    image_bytes = BytesIO()
+    image = wordcloud.to_image()
+    if export_as == "webp":
+        image.save(image_bytes, format="WEBP", quality=getattr(settings, "WORDCLOUD_WEBP_QUALITY", 85), method=4)
+    else:
+        image.save(image_bytes, format=WORDCLOUD_FORMATS[export_as], optimize=True)
+    return image_bytes.getvalue()
+
+
+def render_rendition(name, mask_image, wordcloud_options=None, export_as="webp", corpus=None, frequencies=None):
+    """Render a word cloud and write it to storage as name, replacing any existing file"""
+    wordcloud = build_wordcloud(mask_image, wordcloud_options, corpus=corpus, frequencies=frequencies)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(wordcloud_to_bytes(wordcloud, export_as)))
+
+
+def get_wordcloud_url(
+    corpus,
+    mask_image,
+    export_as="webp",
+    wordcloud_options=None,
+    corpus_hash=None,
+    folder=None,
+    generate=True,
+    frequencies=None,
+):
+    """
+    Url of the word cloud rendition for corpus, rendered and stored on first request.
+    Pass frequencies ({word: count}, or a callable returning them, only called if the rendition has to be
+    rendered) with a corpus_hash identifying them instead of corpus to skip tokenizing.
+    With generate=False, returns None if the rendition hasn't been rendered yet.
+    """
+    corpus_hash = corpus_hash or get_corpus_hash(corpus)
+    name = get_rendition_name(corpus_hash, mask_image, wordcloud_options, export_as, folder)
+    if not rendition_exists(name):
+        if not generate:
+            return None
+        if callable(frequencies):
+            frequencies = frequencies()
+        name = render_rendition(
+            name, mask_image, wordcloud_options, export_as, corpus=corpus, frequencies=frequencies
+        )
+    return default_storage.url(name)
+
+
+def get_wordcloud_renditions():
+    """
+    Renditions to render for every BlogPage on publish and in render_wordclouds, from WORDCLOUD_RENDITIONS:
+        [{"mask_image": <image id>, "export_as": "webp", "options": {...}}, ...]
+    Returns a list of (mask image, export_as, options), missing images are skipped.
+    """
+    renditions = getattr(settings, "WORDCLOUD_RENDITIONS", [])
+    if not renditions:
+        return []
+    from wagtail.images import get_image_model
+    images = get_image_model().objects.in_bulk([rendition["mask_image"] for rendition in renditions])
+    return [
+        (images[rendition["mask_image"]], rendition.get("export_as", "webp"), rendition.get("options", {}))
+        for rendition in renditions
+        if rendition["mask_image"] in images
+    ]
+
+
+def render_page_wordclouds(page_pk, renditions=None):
+    """
+    Render any missing word clouds for BlogPage page_pk, renditions is a list of
+    (mask image id, export_as, options) or None for WORDCLOUD_RENDITIONS.
+    Runs in the pool workers, returns the number of renditions checked.
+    """
+    from wagtail.images import get_image_model
+    from .models import BlogPage
+    page = BlogPage.objects.filter(pk=page_pk).only("pk", "content", *BlogPage.CORPUS_FIELDS).first()
+    if not page:
+        return 0
+    if renditions is None:
+        renditions = get_wordcloud_renditions()
     else:
-        # generate pyplot - no axes or margins
-        # figsize must be in inches - get dpi and convert mask pixel dimesions to inches
-        px = 1/plt.rcParams['figure.dpi']
-        plt.figure(figsize=(mask_image.width*px, mask_image.height*px), dpi=plt.rcParams['figure.dpi'])
-        plt.axis("off")
-        plt.margins(x=0, y=0)
-        plt.imshow(wordcloud, interpolation="bilinear")
-        png = plt_to_png_string(plt)
-        plt.close()
-        return png
\ No newline at end of file
+        images = get_image_model().objects.in_bulk([mask_pk for mask_pk, export_as, options in renditions])
+        renditions = [
+            (images[mask_pk], export_as, options) for mask_pk, export_as, options in renditions if mask_pk in images
+        ]
+    for mask_image, export_as, options in renditions:
+        page.get_wordcloud_url(mask_image, export_as, **options)
+    return len(renditions)
+
+
+class WordCloudQueue:
+    """
+    Renders word clouds in the background on a process pool so layout doesn't hold the request thread (or the GIL).
+    Jobs are keyed by (page, renditions), a job already queued or running isn't queued again.
+    """
+    def __init__(self):
+        self.pool = None
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def get_pool(self):
+        if self.pool is None:
+            # spawned rather than forked, the web process keeps its open database connections
+            self.pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, "WORDCLOUD_WORKERS", 1),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+        return self.pool
+
+    def enqueue(self, page_pk, renditions=None):
+        """Queue rendering for page_pk, renditions as for render_page_wordclouds"""
+        key = (page_pk, json.dumps(renditions, sort_keys=True, default=str))
+        with self.lock:
+            if key in self.pending:
+                return self.pending[key]
+            future = self.get_pool().submit(render_page_wordclouds, page_pk, renditions)
+            self.pending[key] = future
+        # outside the lock, the callback runs immediately if the future has already finished
+        future.add_done_callback(lambda f: self._done(key, f))
+        return future
+
+    def _done(self, key, future):
+        e = None if future.cancelled() else future.exception()
+        with self.lock:
+            self.pending.pop(key, None)
+            if isinstance(e, BrokenProcessPool):
+                # a worker died, start a new pool on the next enqueue
+                self.pool = None
+        if e is not None:
+            print(f"{type(e).__name__} rendering word clouds for page {key[0]}: {e}")
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WordCloudQueue()
+    return _queue
+
+
+def purge_renditions(folder, corpus_hash):
+    """Delete renditions in folder that weren't rendered from corpus_hash"""
+    try:
+        directories, files = default_storage.listdir(folder)
+    except FileNotFoundError:
+        return 0
+    stale = [name for name in files if not name.startswith(corpus_hash[:16])]
+    for name in stale:
+        default_storage.delete(f"{folder}/{name}")
+        cache.delete(get_exists_cache_key(f"{folder}/{name}"))
+    return len(stale)
+
+
+def purge_expired_renditions(folder, max_age):
+    """Delete renditions in folder written more than max_age seconds ago"""
+    try:
+        directories, files = default_storage.listdir(folder)
+    except FileNotFoundError:
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    stale = [name for name in files if default_storage.get_modified_time(f"{folder}/{name}") < cutoff]
+    for name in stale:
+        default_storage.delete(f"{folder}/{name}")
+        cache.delete(get_exists_cache_key(f"{folder}/{name}"))
+    return len(stale)
+
+
+def purge_shared_renditions():
+    # at most once an hour per process, shared renditions have no page publish to purge them
+    if cache.add("wordcloud-shared-purge", True, 60 * 60):
+        purge_expired_renditions(
+            f"{WORDCLOUD_FOLDER}/shared", getattr(settings, "WORDCLOUD_SHARED_MAX_AGE", 60 * 60 * 24 * 30)
+        )
+
+
+def masked_wordcloud(
+    corpus,
+    mask_image,
+    export_as_svg=False,
+    wordcloud_options=None,
+    folder=None,
+    ):
+    """
+    Inline word cloud, svg markup or a png data uri, read from the cached rendition.
+    Renditions are stored in folder (e.g. BlogPage.get_wordcloud_folder(), purged on publish) or wordclouds/shared.
+    Prefer get_wordcloud_url (or BlogPage.get_wordcloud_url) to keep the image out of the html.
+    """
+    export_as = "svg" if export_as_svg else "png"
+    name = get_rendition_name(get_corpus_hash(corpus), mask_image, wordcloud_options, export_as, folder)
+    content = None
+    if rendition_exists(name):
+        try:
+            with default_storage.open(name) as file:
+                content = file.read()
+        except FileNotFoundError:
+            # purged since it was cached as existing
+            cache.delete(get_exists_cache_key(name))
+    if content is None:
+        if folder is None:
+            purge_shared_renditions()
+        name = render_rendition(name, mask_image, wordcloud_options, export_as, corpus=corpus)
+        with default_storage.open(name) as file:
+            content = file.read()
+    if export_as_svg:
+        return content.decode()
+    return f'data:image/png;base64,{base64.b64encode(content).decode("utf8")}'
+
+
+@receiver(page_published)
+def update_wordclouds(sender, instance, **kwargs):
+    # renditions are named by corpus hash, drop those from earlier corpora of the published page
+    # and queue the configured renditions for the new corpus
+    if not getattr(instance, "corpus_hash", None) or not hasattr(instance, "get_wordcloud_folder"):
+        return
+    try:
+        purge_renditions(instance.get_wordcloud_folder(), instance.corpus_hash)
+        if getattr(settings, "WORDCLOUD_RENDITIONS", []):
+            page_pk = instance.pk
+            transaction.on_commit(lambda: get_queue().enqueue(page_pk))
+    except Exception as e:
+        print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
@@ -7,4 +7,8 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         from .acyclic import Category, Word
+        from .block_usage import BlockUsage
+        from .css_class_index import CSSClassUsage
+        from .link_metadata import LinkMetadata
         from .news_item import NewsPost
+        from .oembedfinder import YouTubeThumbnail
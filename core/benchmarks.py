@@ -0,0 +1,134 @@
+"""
+Repeatable sitemap benchmarks. Run with ./manage.py benchmark_sitemap, results are written as JSON
+so changes to core.sitemap can be compared run to run.
+"""
+import os
+import platform
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import psutil
+
+from .sitemap import SitemapStore, make_entry, write_urlset
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+BASE_URL = "http://localhost:8000/"
+
+
+def synthetic_entries(count, base_url=BASE_URL):
+    """Yield count sitemap entries with random lastmod dates over the last year"""
+    today = date.today()
+    for i in range(1, count + 1):
+        lastmod = today - timedelta(days=random.randint(0, 365))
+        yield make_entry(f"{base_url}page-{i}", lastmod.isoformat())
+
+
+def generate_test_sitemap(path="test_sitemap.xml", count=10_000):
+    write_urlset(path, synthetic_entries(count))
+
+
+class RSSSampler:
+    """Sample process RSS in a background thread while a block runs, peak is in bytes"""
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def percentile(values, pct):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def measure(operation, size, samples, func):
+    """Run func() samples times, return latency percentiles (ms) and peak RSS (MB)"""
+    timings = []
+    with RSSSampler() as sampler:
+        for n in range(samples):
+            start = time.perf_counter()
+            func(n)
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "operation": operation,
+        "size": size,
+        "samples": samples,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "max_ms": round(max(timings), 3),
+        "peak_rss_mb": round(sampler.peak / 2**20, 1),
+    }
+
+
+def benchmark_size(size, samples, bulk_samples, folder):
+    """
+    Benchmark one synthetic sitemap of size urls:
+    add (new url), update (existing url), remove, compact (journal into xml)
+    and regenerate (stream size urls to a new file and reload the index).
+    """
+    path = os.path.join(folder, f"sitemap-{size}.xml")
+    generate_test_sitemap(path, size)
+    store = SitemapStore(path)
+    results = [measure("load", size, 1, lambda n: store.load())]
+
+    results.append(measure(
+        "add", size, samples,
+        lambda n: store.apply([{"op": "upsert", "entry": make_entry(f"{BASE_URL}new-{n}", date.today())}]),
+    ))
+    results.append(measure(
+        "update", size, samples,
+        lambda n: store.apply([{"op": "upsert", "entry": make_entry(f"{BASE_URL}page-{n + 1}", date.today())}]),
+    ))
+    results.append(measure(
+        "remove", size, samples,
+        lambda n: store.apply([{"op": "delete", "location": f"{BASE_URL}page-{size - n}"}]),
+    ))
+    results.append(measure("compact", size, bulk_samples, lambda n: store.compact()))
+
+    def regenerate(n):
+        store.replace(synthetic_entries(size))
+        store.load()
+
+    results.append(measure("regenerate", size, bulk_samples, regenerate))
+
+    for suffix in ("", ".gz", ".journal", ".lock"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return results
+
+
+def run_sitemap_benchmark(sizes=None, samples=50, bulk_samples=3, folder=None):
+    """Run the benchmark for each size, returns a JSON serialisable report"""
+    sizes = sizes or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory(dir=folder) as workdir:
+        results = []
+        for size in sizes:
+            results += benchmark_size(size, samples, bulk_samples, workdir)
+    return {
+        "benchmark": "sitemap",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
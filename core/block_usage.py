@@ -0,0 +1,176 @@
+"""
+Denormalized block usage index.
+One row per (page, StreamField, block path) holding the block class and the number of instances,
+rebuilt from the raw stream data each time a page revision is saved.
+Answers "which pages use block X" with a single indexed query instead of loading every page:
+
+    BlockUsage.objects.for_block_class(CSVTableBlock).pages()
+    BlockUsage.objects.for_block_type("csv_table").on_live_pages().totals()
+
+The index holds latest revision usage: for a page with unpublished changes the rows describe the draft,
+not the published content, so editors (and rerender_csv_tables) find blocks that are about to go live.
+"""
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Count, Sum
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from wagtail.blocks import ListBlock, StreamBlock, StructBlock
+from wagtail.fields import StreamField
+from wagtail.models import Page, Revision
+
+
+def block_class_path(block):
+    block_class = block if isinstance(block, type) else block.__class__
+    return f"{block_class.__module__}.{block_class.__name__}"
+
+
+def iter_block_usage(block, value, path=""):
+    """
+    Yield (path, block, raw value) for every block instance in the raw (JSON) value of block.
+    Paths are the dotted block names from the top of the stream, list items don't add a level.
+    """
+    if value is None:
+        return
+
+    if isinstance(block, StreamBlock):
+        for item in value:
+            child_block = block.child_blocks.get(item.get("type"))
+            if child_block:
+                child_path = f"{path}.{child_block.name}" if path else child_block.name
+                yield child_path, child_block, item.get("value")
+                yield from iter_block_usage(child_block, item.get("value"), child_path)
+
+    elif isinstance(block, ListBlock):
+        for item in value:
+            if block._item_is_in_block_format(item):
+                item = item["value"]
+            yield from iter_block_usage(block.child_block, item, path)
+
+    elif isinstance(block, StructBlock) and isinstance(value, dict):
+        for name, child_block in block.child_blocks.items():
+            if name in value:
+                child_path = f"{path}.{name}"
+                yield child_path, child_block, value[name]
+                yield from iter_block_usage(child_block, value[name], child_path)
+
+
+def count_block_usage(stream_value):
+    """Return a Counter of (block path, block class path) for a StreamValue, read from raw_data"""
+    return Counter(
+        (path, block_class_path(block))
+        for path, block, value in iter_block_usage(stream_value.stream_block, stream_value.raw_data)
+    )
+
+
+def get_streamfields(model):
+    return [field for field in model._meta.get_fields() if isinstance(field, StreamField)]
+
+
+class BlockUsageQuerySet(models.QuerySet):
+    def for_block_class(self, block_class):
+        # rows for block class (class, instance or dotted path string)
+        if not isinstance(block_class, str):
+            block_class = block_class_path(block_class)
+        return self.filter(block_class=block_class)
+
+    def for_block_type(self, block_type):
+        # rows for block name (e.g. "csv_table") or dotted block path (e.g. "procedure.items")
+        if "." in block_type:
+            return self.filter(block_path=block_type)
+        return self.filter(block_type=block_type)
+
+    def for_field(self, field_name):
+        return self.filter(field_name=field_name)
+
+    def on_live_pages(self):
+        # rows for pages that are live, usage is still from their latest (possibly draft) revision
+        return self.filter(page__live=True)
+
+    def pages(self):
+        # pages with at least one matching row
+        return Page.objects.filter(pk__in=self.values("page_id"))
+
+    def totals(self):
+        # instance and page counts per block class
+        return (
+            self.values("block_class")
+            .annotate(instances=Sum("count"), pages=Count("page_id", distinct=True))
+            .order_by("-instances")
+        )
+
+
+class BlockUsage(models.Model):
+    page = models.ForeignKey(
+        Page,
+        on_delete=models.CASCADE,
+        related_name="block_usage",
+        verbose_name=_("Page"),
+    )
+    revision = models.ForeignKey(
+        Revision,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name=_("Revision"),
+    )
+    field_name = models.CharField(verbose_name=_("Field"), max_length=255)
+    block_path = models.CharField(verbose_name=_("Block Path"), max_length=255, db_index=True)
+    block_type = models.CharField(verbose_name=_("Block Type"), max_length=255, db_index=True)
+    block_class = models.CharField(verbose_name=_("Block Class"), max_length=255, db_index=True)
+    count = models.PositiveIntegerField(verbose_name=_("Count"), default=0)
+
+    objects = BlockUsageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Block Usage")
+        verbose_name_plural = _("Block Usage")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["page", "field_name", "block_path", "block_class"],
+                name="unique_block_usage",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.page_id} {self.field_name}: {self.block_path} ({self.count})"
+
+    @classmethod
+    def update_for_page(cls, page, revision=None):
+        """
+        Replace the index rows for page with the block counts of its StreamFields.
+        page should be the specific page instance, e.g. revision.as_object()
+        """
+        rows = [
+            cls(
+                page_id=page.pk,
+                revision=revision,
+                field_name=field.name,
+                block_path=path,
+                block_type=path.rsplit(".", 1)[-1],
+                block_class=class_path,
+                count=count,
+            )
+            for field in get_streamfields(page.__class__)
+            for (path, class_path), count in count_block_usage(getattr(page, field.name)).items()
+        ]
+        with transaction.atomic():
+            cls.objects.filter(page_id=page.pk).delete()
+            cls.objects.bulk_create(rows)
+        return len(rows)
+
+
+@receiver(post_save, sender=Revision)
+def update_block_usage(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    model = instance.content_type.model_class()
+    if not (model and issubclass(model, Page) and get_streamfields(model)):
+        return
+    try:
+        BlockUsage.update_for_page(instance.as_object(), instance)
+    except Exception as e:
+        print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
@@ -0,0 +1,122 @@
+"""
+Index of the CSS classes used in the rendered StreamFields of live pages.
+Each StreamField is rendered and parsed once when a revision is published, the class names found are
+stored one row per (page, field, class). Lookups are then a single indexed query:
+
+    CSSClassUsage.objects.with_css_class("table-striped").pages()
+
+Unpublished pages are dropped from the index and drafts aren't indexed, unlike the full scan of every page
+this replaced. core.utils.find_all_streamfields_with_css_class(css_class, include_drafts=True) renders the
+pages that aren't live when they're needed.
+"""
+from django.db import models, transaction
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from lxml import etree, html
+from wagtail.models import Page, Revision
+from wagtail.signals import page_published, page_unpublished
+
+from .block_usage import get_streamfields
+
+
+def css_classes_in_html(markup):
+    """Return the set of class names used in an html string"""
+    if not markup or not str(markup).strip():
+        return set()
+    try:
+        root = html.fragment_fromstring(str(markup), create_parent="div")
+    except etree.ParserError:
+        return set()
+    return {css_class for value in root.xpath("//@class") for css_class in value.split()}
+
+
+def css_classes_in_stream(stream_value):
+    return css_classes_in_html(stream_value.render_as_block())
+
+
+class CSSClassUsageQuerySet(models.QuerySet):
+    def with_css_class(self, css_class):
+        return self.filter(css_class=css_class.lstrip("."))
+
+    def for_field(self, field_name):
+        return self.filter(field_name=field_name)
+
+    def pages(self):
+        # pages with at least one matching row
+        return Page.objects.filter(pk__in=self.values("page_id"))
+
+    def page_fields(self):
+        # [(specific page, field name)] for matching rows
+        rows = list(self.values_list("page_id", "field_name").distinct())
+        pages = Page.objects.filter(pk__in={page_id for page_id, field_name in rows}).specific().in_bulk()
+        return [(pages[page_id], field_name) for page_id, field_name in rows if page_id in pages]
+
+
+class CSSClassUsage(models.Model):
+    page = models.ForeignKey(
+        Page,
+        on_delete=models.CASCADE,
+        related_name="css_class_usage",
+        verbose_name=_("Page"),
+    )
+    revision = models.ForeignKey(
+        Revision,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name=_("Revision"),
+    )
+    field_name = models.CharField(verbose_name=_("Field"), max_length=255)
+    css_class = models.CharField(verbose_name=_("CSS Class"), max_length=255, db_index=True)
+
+    objects = CSSClassUsageQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("CSS Class Usage")
+        verbose_name_plural = _("CSS Class Usage")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["page", "field_name", "css_class"],
+                name="unique_css_class_usage",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.page_id} {self.field_name}: .{self.css_class}"
+
+    @classmethod
+    def update_for_page(cls, page, revision=None):
+        """
+        Replace the index rows for page with the classes used in its rendered StreamFields.
+        page should be the specific live page instance.
+        """
+        rows = [
+            cls(page_id=page.pk, revision=revision, field_name=field.name, css_class=css_class[:255])
+            for field in get_streamfields(page.__class__)
+            for css_class in sorted(css_classes_in_stream(getattr(page, field.name)))
+        ]
+        with transaction.atomic():
+            cls.objects.filter(page_id=page.pk).delete()
+            cls.objects.bulk_create(rows)
+        return len(rows)
+
+    @classmethod
+    def is_current(cls, page):
+        # True if the index already holds the live revision of page
+        return cls.objects.filter(page_id=page.pk, revision_id=page.live_revision_id).exists()
+
+
+@receiver(page_published)
+def update_css_class_usage(sender, instance, revision=None, **kwargs):
+    if not get_streamfields(instance.__class__):
+        return
+    try:
+        CSSClassUsage.update_for_page(instance, revision)
+    except Exception as e:
+        print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
+
+
+@receiver(page_unpublished)
+def remove_css_class_usage(sender, instance, **kwargs):
+    CSSClassUsage.objects.filter(page_id=instance.pk).delete()
@@ -0,0 +1,238 @@
+"""
+Bulk version of wagtail.embeds.embeds.get_embed.
+Embeds for a list of urls are read from the database in one query by embed hash, misses are resolved
+through the configured finders concurrently on a bounded thread pool and stored as get_embed would.
+
+    embeds = get_embeds(urls)   # {url: Embed}, urls that can't be embedded are left out
+
+refresh_embeds refetches stale Embed rows outside the request path (refresh_embeds command, run from cron)
+so visitors don't pay for refetching.
+
+get_embed_attrs / get_embed_attrs_many return the template-ready attributes (video_id, thumbnail_url, title,
+author_name, last_updated) from the Django cache, parsing embed.html only once per Embed row version
+(cache keys include last_updated, nothing relies on invalidating a per-process cache).
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Max
+from django.utils.timezone import now
+from wagtail.coreutils import accepts_kwarg
+from wagtail.embeds.embeds import get_embed_hash
+from wagtail.embeds.exceptions import EmbedUnsupportedProviderException
+from wagtail.embeds.finders import get_finders
+from wagtail.embeds.models import Embed
+
+
+def normalize_embed_dict(embed_dict):
+    # Make sure width and height are valid integers before inserting into database
+    for key in ("width", "height"):
+        try:
+            embed_dict[key] = int(embed_dict[key])
+        except (KeyError, TypeError, ValueError):
+            embed_dict[key] = None
+
+    for key in ("html", "thumbnail_url", "title", "author_name", "provider_name"):
+        embed_dict[key] = embed_dict.get(key) or ""
+    return embed_dict
+
+
+def store_embed(url, embed_dict, max_width=None, max_height=None):
+    """Create or update the Embed row for url from a finder result, as get_embed does"""
+    embed_dict = normalize_embed_dict(embed_dict)
+    embed, created = Embed.objects.update_or_create(
+        hash=get_embed_hash(url, max_width, max_height),
+        defaults=dict(url=url, max_width=max_width, **embed_dict),
+    )
+    embed.last_updated = datetime.now()
+    embed.save()
+    return embed
+
+
+def find_embed(url, max_width=None, max_height=None, reprobe=False):
+    """
+    Finder result for url (run in pool threads), or the exception raised.
+    As wagtail's get_finder_for_embed, reprobe is passed to finders that accept it (YouTubeResponsiveFinder).
+    Finders may query the database, the thread's connection is closed when done.
+    """
+    try:
+        for finder in get_finders():
+            if finder.accept(url):
+                kwargs = {}
+                if accepts_kwarg(finder.find_embed, "max_height"):
+                    kwargs["max_height"] = max_height
+                if accepts_kwarg(finder.find_embed, "reprobe"):
+                    kwargs["reprobe"] = reprobe
+                return finder.find_embed(url, max_width=max_width, **kwargs)
+        raise EmbedUnsupportedProviderException
+    except Exception as e:
+        return e
+    finally:
+        connection.close()
+
+
+def get_embeds(urls, max_width=None, max_height=None, fetch=True):
+    """
+    Return {url: Embed} for urls: one query for stored embeds, misses fetched concurrently (unless fetch=False).
+    Urls that can't be embedded are logged and left out.
+    """
+    hashes = {url: get_embed_hash(url, max_width, max_height) for url in urls}
+    rows = Embed.objects.exclude(cache_until__lte=now()).in_bulk(set(hashes.values()), field_name="hash")
+    embeds = {url: rows[embed_hash] for url, embed_hash in hashes.items() if embed_hash in rows}
+
+    misses = [url for url in hashes if url not in embeds]
+    if not (fetch and misses):
+        return embeds
+
+    workers = min(len(misses), getattr(settings, "EMBED_FETCH_WORKERS", 4))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed-finder") as executor:
+        results = executor.map(lambda url: find_embed(url, max_width, max_height), misses)
+        # store from this thread as results arrive, in url order
+        for url, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logging.warning(f"{type(result).__name__}: Unable to embed {url}")
+                continue
+            embeds[url] = store_embed(url, result, max_width, max_height)
+    return embeds
+
+
+class RateLimiter:
+    """Allow at most rate calls to wait() per second across threads, rate=0 for no limit"""
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_call = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(self.next_call, now) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+EMBED_REFRESH_FIELDS = ["title", "author_name", "provider_name", "type", "thumbnail_url", "width", "height", "html"]
+
+
+def get_stale_embeds(max_age=None):
+    """Embed rows last updated more than max_age seconds (EMBED_REFRESH_AGE, default 7 days) ago"""
+    if max_age is None:
+        max_age = getattr(settings, "EMBED_REFRESH_AGE", 60 * 60 * 24 * 7)
+    return Embed.objects.filter(last_updated__lt=now() - timedelta(seconds=max_age)).order_by("last_updated")
+
+
+def refresh_embeds(embeds, workers=None, rate=None, dry_run=False, log=None):
+    """
+    Refetch embeds through the configured finders (YouTubeResponsiveFinder, oEmbed) on a thread pool,
+    at most rate finder calls per second (EMBED_REFRESH_RATE). Rows that fail to refresh are left as they are.
+    Returns a Counter of updated, unchanged and failed embeds.
+    """
+    workers = workers or getattr(settings, "EMBED_FETCH_WORKERS", 4)
+    limiter = RateLimiter(getattr(settings, "EMBED_REFRESH_RATE", 5) if rate is None else rate)
+    summary = Counter()
+
+    def find(embed):
+        limiter.wait()
+        # probe thumbnails again rather than reusing the stored choice
+        return find_embed(embed.url, embed.max_width, reprobe=True)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed-refresh") as executor:
+        futures = {executor.submit(find, embed): embed for embed in embeds}
+        for future in as_completed(futures):
+            embed = futures[future]
+            result = future.result()
+            if isinstance(result, Exception):
+                summary["failed"] += 1
+                if log:
+                    log(f"Failed {embed.url}: {type(result).__name__} {result}")
+                continue
+            result = normalize_embed_dict(result)
+            changed = any(result.get(field) != getattr(embed, field) for field in EMBED_REFRESH_FIELDS)
+            summary["updated" if changed else "unchanged"] += 1
+            if not dry_run:
+                # update in place, the row hash may include a max_height that isn't stored on the row
+                Embed.objects.filter(pk=embed.pk).update(
+                    **{field: result.get(field) for field in EMBED_REFRESH_FIELDS},
+                    cache_until=result.get("cache_until"),
+                    last_updated=now(),
+                )
+    return summary
+
+
+def get_embed_attrs_cache_key(embed):
+    # keyed on the row version, refreshed or refetched rows get a new key in every process
+    return f"embed-attrs-{embed.hash}-{int(embed.last_updated.timestamp() * 1000000)}"
+
+
+def parse_embed_attrs(embed):
+    """Template attributes for embed, video_id is the last part of the iframe src path ('' if no iframe)"""
+    iframe = BeautifulSoup(embed.html, "html.parser").find("iframe")
+    src = urlparse(iframe.get("src", "")).path if iframe else ""
+    return {
+        "video_id": src.split("/")[-1],
+        "thumbnail_url": embed.thumbnail_url,
+        "title": embed.title,
+        "author_name": embed.author_name,
+        "last_updated": embed.last_updated,
+    }
+
+
+def get_embed_attrs_timeout(embed):
+    # EMBED_ATTRS_CACHE_TIMEOUT (default 1 day), not beyond the embed's own cache_until
+    timeout = getattr(settings, "EMBED_ATTRS_CACHE_TIMEOUT", 60 * 60 * 24)
+    if embed.cache_until:
+        timeout = min(timeout, max(int((embed.cache_until - now()).total_seconds()), 1))
+    return timeout
+
+
+def get_embed_attrs_many(urls, max_width=None, max_height=None):
+    """
+    Return {url: attrs} for urls, embeds from get_embeds (one query, missing embeds fetched concurrently)
+    and one cache lookup for the parsed attributes of all of them.
+    Cache keys include the row's last_updated, so entries for refreshed rows are never read again.
+    Urls that can't be embedded are left out.
+    """
+    embeds = get_embeds(urls, max_width, max_height)
+    keys = {url: get_embed_attrs_cache_key(embed) for url, embed in embeds.items()}
+    cached = cache.get_many(set(keys.values()))
+
+    attrs = {}
+    for url, embed in embeds.items():
+        if keys[url] in cached:
+            attrs[url] = cached[keys[url]]
+        else:
+            attrs[url] = parse_embed_attrs(embed)
+            cache.set(keys[url], attrs[url], get_embed_attrs_timeout(embed))
+    return attrs
+
+
+def get_embed_attrs(url, max_width=None, max_height=None):
+    """Cached template attributes for url, None if it can't be embedded"""
+    return get_embed_attrs_many([url], max_width, max_height).get(url)
+
+
+def get_embeds_version(urls, max_width=None, max_height=None):
+    """
+    Token that changes whenever a stored Embed for urls is created, refreshed or deleted,
+    for ETags and cache keys of responses built from embed data (e.g. the VideoPage api).
+    Read from the database (count and latest last_updated) so every process, and the refresh_embeds command,
+    agree on it whatever the cache backend.
+    """
+    hashes = {get_embed_hash(url, max_width, max_height) for url in urls}
+    if not hashes:
+        return "0"
+    stats = Embed.objects.filter(hash__in=hashes).aggregate(count=Count("pk"), latest=Max("last_updated"))
+    latest = int(stats["latest"].timestamp() * 1000) if stats["latest"] else 0
+    return f"{stats['count']}.{latest}"
@@ -0,0 +1,103 @@
+"""
+Shared HTTP client for outbound requests made while serving admin and site requests.
+One pooled, keep-alive requests.Session per process with connect/read timeouts on every request and a cap
+on the bytes read, so latency and worker time don't depend on the third-party server or page size.
+
+    response = get_session().get(url, timeout=get_timeout())
+    url, head = fetch_head(url)
+"""
+import re
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RE_HEAD_END = re.compile(rb"</head\s*>", re.IGNORECASE)
+CHUNK_SIZE = 8192
+
+
+class ResponseTooLarge(requests.RequestException):
+    pass
+
+
+def get_timeout():
+    # (connect, read) seconds
+    return (
+        getattr(settings, "HTTP_CONNECT_TIMEOUT", 3.05),
+        getattr(settings, "HTTP_READ_TIMEOUT", 10),
+    )
+
+
+def get_max_bytes():
+    return getattr(settings, "HTTP_MAX_BYTES", 2 * 1024 * 1024)
+
+
+def build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, "HTTP_POOL_CONNECTIONS", 20),
+        pool_maxsize=getattr(settings, "HTTP_POOL_MAXSIZE", 20),
+        max_retries=Retry(total=1, connect=1, read=0, backoff_factor=0.2, allowed_methods={"GET", "HEAD"}),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = getattr(
+        settings, "HTTP_USER_AGENT", f"Mozilla/5.0 (compatible; {getattr(settings, 'WAGTAIL_SITE_NAME', 'Wagtail')})"
+    )
+    return session
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+    return _session
+
+
+def read_limited(response, max_bytes=None, stop=None):
+    """
+    Read a streamed response body up to max_bytes, raise ResponseTooLarge past the limit.
+    If stop (compiled bytes pattern) is given, reading ends at the chunk where it first matches.
+    """
+    max_bytes = max_bytes or get_max_bytes()
+    content_length = response.headers.get("Content-Length")
+    if stop is None and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ResponseTooLarge(f"Response is larger than {max_bytes} bytes")
+    body = bytearray()
+    for chunk in response.iter_content(CHUNK_SIZE):
+        # look for stop across the chunk boundary
+        search_from = max(len(body) - 16, 0)
+        body.extend(chunk)
+        if stop is not None and stop.search(body, search_from):
+            break
+        if len(body) > max_bytes:
+            if stop is not None:
+                break
+            raise ResponseTooLarge(f"Response is larger than {max_bytes} bytes")
+    return bytes(body[:max_bytes])
+
+
+def decode(response, content):
+    return content.decode(response.encoding or "utf-8", errors="replace")
+
+
+def fetch_head(url):
+    """
+    GET url and return (resolved url, text read up to and including </head>).
+    The body is streamed and the connection released as soon as </head> arrives or HTTP_MAX_BYTES is read.
+    """
+    with get_session().get(url, timeout=get_timeout(), stream=True) as response:
+        content = read_limited(response, stop=RE_HEAD_END)
+        return response.url, decode(response, content)
+
+
+def head(url, **kwargs):
+    """HEAD url on the shared session with the default timeouts, following redirects"""
+    kwargs.setdefault("timeout", get_timeout())
+    kwargs.setdefault("allow_redirects", True)
+    return get_session().head(url, **kwargs)
@@ -0,0 +1,210 @@
+"""
+Persistent cache of external link metadata (title, description, image) for ExternalContentProxy.
+Rows are keyed by the normalized, redirect-resolved url and also found by the normalized url that was
+requested, so http/https, tracking parameter and redirect variants of a link share one fetch.
+The normalized url is only a lookup key, rows keep the url as resolved.
+Metadata is kept for LINK_METADATA_TTL seconds, failed fetches for LINK_METADATA_ERROR_TTL.
+
+Rows can be refreshed from the snippet listing (Refresh bulk action) or with ?refresh=1 on the proxy.
+"""
+import hashlib
+from datetime import timedelta
+from urllib.parse import parse_qsl, urldefrag, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import capfirst
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+from wagtail.admin.ui.tables import Column, DateColumn
+from wagtail.snippets.bulk_actions.snippet_bulk_action import SnippetBulkAction
+from wagtail.snippets.models import register_snippet
+from wagtail.snippets.views.snippets import SnippetViewSet
+
+TRACKING_PARAMETERS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """
+    Lowercase scheme and host, default port, empty path and fragment removed, tracking parameters dropped.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+         if not key.lower().startswith(TRACKING_PARAMETERS)]
+    )
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def get_url_hash(url):
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+def get_ttl():
+    return getattr(settings, "LINK_METADATA_TTL", 60 * 60 * 24 * 7)
+
+
+def get_error_ttl():
+    return getattr(settings, "LINK_METADATA_ERROR_TTL", 60 * 10)
+
+
+class LinkMetadataQuerySet(models.QuerySet):
+    def for_url(self, url):
+        # rows for url as requested or as resolved, newest first
+        url_hash = get_url_hash(url)
+        return self.filter(Q(url_hash=url_hash) | Q(source_hash=url_hash)).order_by("-fetched_at")
+
+    def fresh(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+    def errors(self):
+        return self.exclude(error="")
+
+
+class LinkMetadata(models.Model):
+    url = models.URLField(verbose_name=_("URL"), max_length=2000)
+    url_hash = models.CharField(max_length=64, unique=True, editable=False)
+    source_hash = models.CharField(max_length=64, db_index=True, editable=False)
+    title = models.TextField(verbose_name=_("Title"), blank=True, default="")
+    description = models.TextField(verbose_name=_("Description"), blank=True, default="")
+    image = models.URLField(verbose_name=_("Image"), max_length=2000, blank=True, default="")
+    error = models.TextField(verbose_name=_("Error"), blank=True, default="")
+    fetched_at = models.DateTimeField(verbose_name=_("Fetched"), default=timezone.now)
+    expires_at = models.DateTimeField(verbose_name=_("Expires"), db_index=True)
+
+    objects = LinkMetadataQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Link Metadata")
+        verbose_name_plural = _("Link Metadata")
+
+    def __str__(self) -> str:
+        return self.url
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    def as_json(self, requested_url=None):
+        """
+        Proxy json for the row. If requested_url (as the editor entered it) leads to the same page as the row,
+        it's returned unchanged as the url so fragments and query parameters aren't lost, otherwise the
+        resolved url is returned.
+        """
+        if self.error:
+            return {"error": self.error}
+        same_page = requested_url and get_url_hash(requested_url) == self.url_hash
+        return {
+            "url": requested_url if same_page else self.url,
+            "title": self.title,
+            "description": self.description,
+            "image": self.image,
+        }
+
+    @classmethod
+    def get_cached(cls, url):
+        """Fresh row for url (requested or resolved) or None"""
+        return cls.objects.for_url(url).fresh().first()
+
+    @classmethod
+    def get_cached_many(cls, urls):
+        """{url: fresh row} for the urls in the cache (requested or resolved), in one query"""
+        hashes = {url: get_url_hash(url) for url in urls}
+        rows = {}
+        for row in cls.objects.filter(
+            Q(url_hash__in=hashes.values()) | Q(source_hash__in=hashes.values())
+        ).fresh().order_by("fetched_at"):
+            # newest last, so it wins
+            rows[row.url_hash] = rows[row.source_hash] = row
+        return {url: rows[url_hash] for url, url_hash in hashes.items() if url_hash in rows}
+
+    @classmethod
+    def store(cls, requested_url, metadata=None, error=""):
+        """
+        Save fetched metadata (dict with url, title, description, image) for requested_url,
+        or error with the shorter error TTL if the fetch failed.
+        """
+        now = timezone.now()
+        if error:
+            stale = cls.objects.for_url(requested_url).filter(error="").first()
+            if stale:
+                # keep serving the metadata we have rather than the error
+                stale.expires_at = now + timedelta(seconds=get_error_ttl())
+                stale.save(update_fields=["expires_at"])
+                return stale
+            url, ttl, metadata = requested_url, get_error_ttl(), {}
+        else:
+            url, ttl = metadata.get("url") or requested_url, get_ttl()
+        row, created = cls.objects.update_or_create(
+            url_hash=get_url_hash(url),
+            defaults={
+                # fragments are client side, they belong to the requested url, not the page
+                "url": urldefrag(url).url,
+                "source_hash": get_url_hash(requested_url),
+                "title": metadata.get("title") or "",
+                "description": metadata.get("description") or "",
+                "image": metadata.get("image") or "",
+                "error": error,
+                "fetched_at": now,
+                "expires_at": now + timedelta(seconds=ttl),
+            },
+        )
+        return row
+
+
+class LinkMetadataViewSet(SnippetViewSet):
+    model = LinkMetadata
+    icon = "link"
+    list_display = [
+        "url",
+        "title",
+        Column("error", label=_("Error")),
+        DateColumn("fetched_at", label=_("Fetched")),
+    ]
+    list_filter = {"url": ["icontains"], "title": ["icontains"]}
+    ordering = ["-fetched_at"]
+
+
+register_snippet(LinkMetadataViewSet)
+
+
+class RefreshLinkMetadataBulkAction(SnippetBulkAction):
+    """Fetch the metadata for the selected links again, ignoring the cache"""
+    display_name = _("Refresh")
+    action_type = "refresh"
+    aria_label = _("Refresh metadata for the selected links")
+    template_name = "reports/confirm_refresh_link_metadata.html"
+    action_priority = 20
+    models = [LinkMetadata]
+
+    def check_perm(self, snippet):
+        return self.request.user.has_perm("core.change_linkmetadata")
+
+    @classmethod
+    def execute_action(cls, objects, user=None, **kwargs):
+        from blocks.views.external_link import get_metadata
+        failed = 0
+        for row in objects:
+            if "error" in get_metadata(row.url, refresh=True):
+                failed += 1
+        return len(objects) - failed, 0
+
+    def get_success_message(self, num_parent_objects, num_child_objects):
+        return ngettext(
+            "%(count)d %(model_name)s refreshed.",
+            "%(count)d %(model_name)s refreshed.",
+            num_parent_objects,
+        ) % {
+            "model_name": capfirst(self.model._meta.verbose_name_plural),
+            "count": num_parent_objects,
+        }
@@ -0,0 +1,31 @@
+import json
+
+from django.core.management import BaseCommand
+
+from core.benchmarks import DEFAULT_SIZES, run_sitemap_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark core.sitemap add/update/remove/compact/regenerate on synthetic sitemaps, output JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+        parser.add_argument("--samples", type=int, default=50, help="Samples per add/update/remove")
+        parser.add_argument("--bulk-samples", type=int, default=3, help="Samples per compact/regenerate")
+        parser.add_argument("--folder", default=None, help="Folder for temporary sitemap files")
+        parser.add_argument("--output", default=None, help="Write JSON to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        report = run_sitemap_benchmark(
+            sizes=options["sizes"],
+            samples=options["samples"],
+            bulk_samples=options["bulk_samples"],
+            folder=options["folder"],
+        )
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stdout.write(f"Benchmark results written to {options['output']}")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+from wagtail.models import Page, get_page_models
+
+from core.block_usage import BlockUsage, get_streamfields
+
+
+class Command(BaseCommand):
+    help = "Rebuild the block usage index from the latest revision of every page with StreamFields"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=200, help="Pages loaded per query")
+
+    def handle(self, *args, **options):
+        models = [model for model in get_page_models() if get_streamfields(model)]
+        pages = rows = 0
+        for model in models:
+            # concrete page model only, pages of subclasses are indexed under their own model
+            queryset = model.objects.exact_type(model).select_related("latest_revision")
+            for page in queryset.iterator(chunk_size=options["chunk_size"]):
+                revision = page.latest_revision
+                if revision and page.has_unpublished_changes:
+                    page = revision.as_object()
+                rows += BlockUsage.update_for_page(page, revision)
+                pages += 1
+            self.stdout.write(f"{model._meta.label}: indexed")
+
+        self.stdout.write(self.style.SUCCESS(f"Block usage index rebuilt: {pages} pages, {rows} rows"))
@@ -0,0 +1,52 @@
+import os
+
+from django.core.management import BaseCommand
+from wagtail.models import Page, get_page_models
+
+from core.block_usage import get_streamfields
+from core.css_class_index import CSSClassUsage
+from core.process_pool import delete_not_live, map_chunks
+
+
+def index_chunk(pks, force=False):
+    """
+    Render and index the live pages in pks, skipping pages already indexed at their live revision.
+    Returns (indexed, skipped).
+    """
+    indexed = skipped = 0
+    for page in Page.objects.filter(pk__in=pks).specific():
+        if not force and CSSClassUsage.is_current(page):
+            skipped += 1
+            continue
+        CSSClassUsage.update_for_page(page, page.live_revision)
+        indexed += 1
+    return indexed, skipped
+
+
+class Command(BaseCommand):
+    help = "Rebuild the CSS class index for every live page with StreamFields using a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+        parser.add_argument("--chunk-size", type=int, default=50, help="Pages per worker task")
+        parser.add_argument("--force", action="store_true", help="Re-render pages already indexed at their live revision")
+
+    def handle(self, *args, **options):
+        models = [model for model in get_page_models() if get_streamfields(model)]
+        pks = list(
+            Page.objects.live().type(*models).order_by("pk").values_list("pk", flat=True)
+        ) if models else []
+        if not pks:
+            self.stdout.write("No live pages with StreamFields found")
+            return
+
+        delete_not_live(CSSClassUsage.objects.all())
+        indexed = skipped = 0
+        for done, total, (chunk_indexed, chunk_skipped) in map_chunks(
+            index_chunk, pks, options["chunk_size"], options["workers"], options["force"]
+        ):
+            indexed += chunk_indexed
+            skipped += chunk_skipped
+            self.stdout.write(f"[{done}/{total}] {indexed} indexed, {skipped} unchanged")
+
+        self.stdout.write(self.style.SUCCESS(f"CSS class index rebuilt for {indexed} pages, {skipped} unchanged"))
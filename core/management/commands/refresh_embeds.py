@@ -0,0 +1,41 @@
+"""
+Scheduled from cron (see README), e.g. nightly:
+    15 3 * * * cd /path/to/site && python manage.py refresh_embeds --limit 2000
+"""
+from django.core.management import BaseCommand
+
+from core.embeds import get_stale_embeds, refresh_embeds
+
+
+class Command(BaseCommand):
+    help = "Refetch oEmbed data for Embed rows older than --max-age hours, concurrently and rate limited"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-age", type=float, default=None, help="Refresh embeds older than this many hours (default EMBED_REFRESH_AGE)")
+        parser.add_argument("--limit", type=int, default=None, help="Refresh at most this many embeds, oldest first")
+        parser.add_argument("--workers", type=int, default=None, help="Concurrent requests (default EMBED_FETCH_WORKERS)")
+        parser.add_argument("--rate", type=float, default=None, help="Maximum requests per second, 0 for no limit (default EMBED_REFRESH_RATE)")
+        parser.add_argument("--dry-run", action="store_true", help="Fetch and report changes without saving them")
+
+    def handle(self, *args, **options):
+        max_age = options["max_age"] * 60 * 60 if options["max_age"] is not None else None
+        embeds = get_stale_embeds(max_age)
+        if options["limit"]:
+            embeds = embeds[:options["limit"]]
+        embeds = list(embeds)
+        if not embeds:
+            self.stdout.write("No stale embeds found")
+            return
+
+        self.stdout.write(f"Refreshing {len(embeds)} embeds")
+        summary = refresh_embeds(
+            embeds,
+            workers=options["workers"],
+            rate=options["rate"],
+            dry_run=options["dry_run"],
+            log=lambda message: self.stdout.write(self.style.WARNING(message)),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Checked' if options['dry_run'] else 'Refreshed'} {len(embeds)} embeds: "
+            f"{summary['updated']} updated, {summary['unchanged']} unchanged, {summary['failed']} failed"
+        ))
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_newspost"),
+        ("wagtailcore", "0096_referenceindex_referenceindex_source_object_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BlockUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field_name", models.CharField(max_length=255, verbose_name="Field")),
+                (
+                    "block_path",
+                    models.CharField(
+                        db_index=True, max_length=255, verbose_name="Block Path"
+                    ),
+                ),
+                (
+                    "block_type",
+                    models.CharField(
+                        db_index=True, max_length=255, verbose_name="Block Type"
+                    ),
+                ),
+                (
+                    "block_class",
+                    models.CharField(
+                        db_index=True, max_length=255, verbose_name="Block Class"
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Count")),
+                (
+                    "page",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="block_usage",
+                        to="wagtailcore.page",
+                        verbose_name="Page",
+                    ),
+                ),
+                (
+                    "revision",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="wagtailcore.revision",
+                        verbose_name="Revision",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Block Usage",
+                "verbose_name_plural": "Block Usage",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("page", "field_name", "block_path", "block_class"),
+                        name="unique_block_usage",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_blockusage"),
+        ("wagtailcore", "0096_referenceindex_referenceindex_source_object_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CSSClassUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field_name", models.CharField(max_length=255, verbose_name="Field")),
+                (
+                    "css_class",
+                    models.CharField(
+                        db_index=True, max_length=255, verbose_name="CSS Class"
+                    ),
+                ),
+                (
+                    "page",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="css_class_usage",
+                        to="wagtailcore.page",
+                        verbose_name="Page",
+                    ),
+                ),
+                (
+                    "revision",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="wagtailcore.revision",
+                        verbose_name="Revision",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "CSS Class Usage",
+                "verbose_name_plural": "CSS Class Usage",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("page", "field_name", "css_class"),
+                        name="unique_css_class_usage",
+                    )
+                ],
+            },
+        ),
+    ]
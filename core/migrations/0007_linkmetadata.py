@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_cssclassusage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LinkMetadata",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url", models.URLField(max_length=2000, verbose_name="URL")),
+                (
+                    "url_hash",
+                    models.CharField(editable=False, max_length=64, unique=True),
+                ),
+                (
+                    "source_hash",
+                    models.CharField(db_index=True, editable=False, max_length=64),
+                ),
+                (
+                    "title",
+                    models.TextField(blank=True, default="", verbose_name="Title"),
+                ),
+                (
+                    "description",
+                    models.TextField(
+                        blank=True, default="", verbose_name="Description"
+                    ),
+                ),
+                (
+                    "image",
+                    models.URLField(
+                        blank=True, default="", max_length=2000, verbose_name="Image"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="Error"),
+                ),
+                (
+                    "fetched_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Fetched"
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(db_index=True, verbose_name="Expires"),
+                ),
+            ],
+            options={
+                "verbose_name": "Link Metadata",
+                "verbose_name_plural": "Link Metadata",
+            },
+        ),
+    ]
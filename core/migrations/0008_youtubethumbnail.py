@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_linkmetadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="YouTubeThumbnail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "video_id",
+                    models.CharField(max_length=64, unique=True, verbose_name="Video ID"),
+                ),
+                (
+                    "thumbnail_url",
+                    models.URLField(
+                        blank=True, default="", max_length=255, verbose_name="Thumbnail URL"
+                    ),
+                ),
+                (
+                    "probed_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Probed"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "YouTube Thumbnail",
+                "verbose_name_plural": "YouTube Thumbnails",
+            },
+        ),
+    ]
@@ -1,12 +1,21 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from urllib.parse import parse_qs, urlparse
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
 from bs4 import BeautifulSoup
 from wagtail.embeds.finders.oembed import EmbedNotFoundException, OEmbedFinder
 from wagtail.embeds.oembed_providers import youtube
 import requests
 
+from core import http
+
 def _extract_youtube_id(url: str):
     u = urlparse(url)
     host = u.netloc.lower()
@@ -20,18 +29,78 @@ def _extract_youtube_id(url: str):
             return parts[1]
     return None
 
-def _best_youtube_thumbnail(video_id: str) -> str | None:
-    for name in ("maxresdefault.jpg", "sddefault.jpg", "hqdefault.jpg", "mqdefault.jpg", "default.jpg"):
-        url = f"https://img.youtube.com/vi/{video_id}/{name}"
-        try:
-            r = requests.get(url, stream=True, timeout=3)
-            if r.ok and r.headers.get("Content-Type") == "image/jpeg":
-                size = int(r.headers.get("Content-Length", 0))
-                if size > 5000:  # Placeholder is usually small
-                    return url
-        except requests.RequestException:
-            pass
-    return None
+YOUTUBE_THUMBNAILS = ("maxresdefault.jpg", "sddefault.jpg", "hqdefault.jpg", "mqdefault.jpg", "default.jpg")
+YOUTUBE_THUMBNAIL_URL = "https://img.youtube.com/vi/{video_id}/{name}"
+
+
+def _is_youtube_thumbnail(url: str) -> bool:
+    try:
+        r = http.head(url, timeout=(http.get_timeout()[0], 3))
+        if r.ok and r.headers.get("Content-Type") == "image/jpeg":
+            size = int(r.headers.get("Content-Length", 0))
+            return size > 5000  # Placeholder is usually small
+    except (requests.RequestException, ValueError):
+        pass
+    return False
+
+class YouTubeThumbnail(models.Model):
+    """
+    Thumbnail chosen for a YouTube video by probing, shared by every Embed of the video (watch, youtu.be,
+    shorts urls etc.). thumbnail_url is blank if no candidate was valid, those videos are probed again
+    after YOUTUBE_THUMBNAIL_ERROR_TTL seconds.
+    """
+    video_id = models.CharField(verbose_name=_("Video ID"), max_length=64, unique=True)
+    thumbnail_url = models.URLField(verbose_name=_("Thumbnail URL"), max_length=255, blank=True, default="")
+    probed_at = models.DateTimeField(verbose_name=_("Probed"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("YouTube Thumbnail")
+        verbose_name_plural = _("YouTube Thumbnails")
+
+    def __str__(self) -> str:
+        return self.video_id
+
+def _stored_youtube_thumbnail(video_id: str):
+    """Stored probe result for video_id: (found, thumbnail url or None), negative results expire"""
+    stored = YouTubeThumbnail.objects.filter(video_id=video_id).first()
+    if stored is None:
+        return False, None
+    if stored.thumbnail_url:
+        return True, stored.thumbnail_url
+    error_ttl = getattr(settings, "YOUTUBE_THUMBNAIL_ERROR_TTL", 60 * 60 * 24)
+    return stored.probed_at > timezone.now() - timedelta(seconds=error_ttl), None
+
+_probe_pool = None
+_probe_pool_lock = threading.Lock()
+
+def _get_probe_pool():
+    # one bounded pool per process, concurrent finder calls (e.g. core.embeds.get_embeds) share its connections
+    global _probe_pool
+    with _probe_pool_lock:
+        if _probe_pool is None:
+            _probe_pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "YOUTUBE_THUMBNAIL_WORKERS", len(YOUTUBE_THUMBNAILS)),
+                thread_name_prefix="youtube-thumbnail",
+            )
+    return _probe_pool
+
+def _best_youtube_thumbnail(video_id: str, reprobe: bool = False) -> str | None:
+    """
+    Largest real thumbnail for video_id, candidates are probed with HEAD requests on the shared probe pool.
+    The result is stored by video id (YouTubeThumbnail), including videos without a valid thumbnail, and reused
+    unless reprobe is True (core.embeds.refresh_embeds).
+    """
+    if not reprobe:
+        found, stored = _stored_youtube_thumbnail(video_id)
+        if found:
+            return stored
+    urls = [YOUTUBE_THUMBNAIL_URL.format(video_id=video_id, name=name) for name in YOUTUBE_THUMBNAILS]
+    results = list(_get_probe_pool().map(_is_youtube_thumbnail, urls))
+    best = next((url for url, valid in zip(urls, results) if valid), None)
+    YouTubeThumbnail.objects.update_or_create(
+        video_id=video_id, defaults={"thumbnail_url": best or "", "probed_at": timezone.now()}
+    )
+    return best
 
 
 # class YouTubeShortsFinder(OEmbedFinder):
@@ -55,8 +124,9 @@ class YouTubeResponsiveFinder(OEmbedFinder):
     Raises:
         ImproperlyConfigured: If providers is not [youtube].
     Methods:
-        find_embed(url, max_width=None):
+        find_embed(url, max_width=None, reprobe=False):
             Retrieves and modifies the oEmbed data for a given YouTube URL, ensuring responsive HTML and optimal thumbnail selection.
+            With reprobe=True the thumbnail is probed again rather than reused from YouTubeThumbnail.
     """
 
     def __init__(self, providers=None, options=None):
@@ -69,12 +139,17 @@ class YouTubeResponsiveFinder(OEmbedFinder):
             )
         super().__init__(providers=providers, options=options)
 
-    def find_embed(self, url, max_width=None):
+    def find_embed(self, url, max_width=None, reprobe=False):
         try:
             embed = super().find_embed(url, max_width)
         except EmbedNotFoundException:
-            response = requests.get('https://www.youtube.com/oembed/?url=' + url)   
-            if response.status_code != 200: 
+            try:
+                response = http.get_session().get(
+                    'https://www.youtube.com/oembed', params={'url': url, 'format': 'json'}, timeout=http.get_timeout()
+                )
+            except requests.RequestException as e:
+                raise EmbedNotFoundException(f"Unable to retrieve oEmbed data for {url}: {e}")
+            if response.status_code != 200:
                 raise EmbedNotFoundException(f"Unable to retrieve oEmbed data for {url}")
             result = response.json()
             embed = {
@@ -104,7 +179,7 @@ class YouTubeResponsiveFinder(OEmbedFinder):
         # Prefer a larger thumbnail, without assuming aspect ratio
         video_id = _extract_youtube_id(url)
         if video_id:
-            best = _best_youtube_thumbnail(video_id)
+            best = _best_youtube_thumbnail(video_id, reprobe=reprobe)
             if best:
                 embed['thumbnail_url'] = best
                 # Do not set thumbnail_width/height; let the client decide sizing
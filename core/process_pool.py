@@ -0,0 +1,44 @@
+"""
+Process pool helpers for management commands that work through pages in chunks on every core.
+
+    for done, total, result in map_chunks(index_chunk, pks, chunk_size, workers, force):
+        self.stdout.write(f"[{done}/{total}] ...")
+
+Chunk functions run in worker processes, so they must be module level functions taking picklable arguments.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.db import connections
+
+
+def init_worker():
+    # each worker process needs its own app registry (spawn) and database connections (fork)
+    django.setup()
+    connections.close_all()
+
+
+def chunked(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def map_chunks(func, items, chunk_size, workers=None, *args):
+    """
+    Run func(chunk, *args) for chunk_size slices of items on a process pool of workers (default all cores).
+    Yields (chunks done, total chunks, result) as each chunk completes, nothing if items is empty.
+    """
+    chunks = chunked(items, chunk_size)
+    if not chunks:
+        return
+    # don't hand open connections to forked workers
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=init_worker) as executor:
+        futures = [executor.submit(func, chunk, *args) for chunk in chunks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            yield done, len(chunks), future.result()
+
+
+def delete_not_live(queryset):
+    """Remove page index rows (queryset of a model with a page foreign key) for pages that are no longer live"""
+    return queryset.exclude(page__live=True).delete()
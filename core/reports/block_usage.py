@@ -0,0 +1,53 @@
+import django_filters
+from wagtail.admin.auth import permission_denied
+from wagtail.admin.filters import WagtailFilterSet
+from wagtail.admin.ui.tables import Column, NumberColumn, TitleColumn
+from wagtail.admin.views.reports import ReportView
+
+from ..block_usage import BlockUsage
+
+
+def get_block_classes_for_filter():
+    return [
+        (block_class, block_class.rsplit('.', 1)[-1])
+        for block_class in BlockUsage.objects.order_by('block_class')
+        .values_list('block_class', flat=True).distinct()
+    ]
+
+class BlockUsageReportFilterSet(WagtailFilterSet):
+    block_class = django_filters.ChoiceFilter(choices=get_block_classes_for_filter)
+    block_type = django_filters.CharFilter(field_name='block_path', lookup_expr='icontains')
+    field_name = django_filters.CharFilter(field_name='field_name', lookup_expr='iexact')
+    live = django_filters.BooleanFilter(
+        field_name='page__live',
+        label='Page live',
+        help_text='Usage is from the latest revision of each page, which may be an unpublished draft',
+    )
+    class Meta:
+        model = BlockUsage
+        fields = ["block_class", "block_type", "field_name", "live"]
+
+class BlockUsageReportView(ReportView):
+    index_url_name = "block_usage_report"
+    index_results_url_name = "block_usage_report_results"
+    header_icon = 'table'
+    page_title = "Block usage (latest revisions)"
+
+    columns = [
+        TitleColumn('page', label='Page', accessor='page.title', url_name='wagtailadmin_pages:edit', id_accessor='page_id'),
+        Column('field_name', label='Field'),
+        Column('block_path', label='Block Path'),
+        Column('block_class', label='Block Class'),
+        NumberColumn('count', label='Count'),
+    ]
+    list_export = ['page.title', 'page_id', 'field_name', 'block_path', 'block_class', 'count']
+    export_headings = {'page.title': 'Page', 'page_id': 'Page ID', 'field_name': 'Field'}
+    filterset_class = BlockUsageReportFilterSet
+
+    def get_queryset(self):
+        return BlockUsage.objects.select_related('page').order_by('block_class', 'page__title', 'block_path')
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.request.user.is_superuser:
+            return permission_denied(request)
+        return super().dispatch(request, *args, **kwargs)
@@ -1,9 +1,560 @@
+import atexit
+import gzip
+import json
 import logging
 import os
+import queue
+import shutil
+import tempfile
 import threading
+import time
+from contextlib import contextmanager
+from xml.sax.saxutils import escape, quoteattr
 
-from bs4 import BeautifulSoup
-from django.template.loader import get_template, render_to_string
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from lxml import etree
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+XHTML_NS = "http://www.w3.org/TR/xhtml11/xhtml11_schema.html"
+
+# one store per sitemap file per process, shared by every SiteMap instance
+_stores = {}
+_stores_lock = threading.Lock()
+_manifest_lock = threading.Lock()
+
+
+def _tag(name, ns=SITEMAP_NS):
+    return f"{{{ns}}}{name}"
+
+
+def _format_lastmod(lastmod):
+    if not lastmod:
+        return None
+    if isinstance(lastmod, str):
+        return lastmod
+    return (lastmod.date() if hasattr(lastmod, "date") else lastmod).isoformat()
+
+
+def make_entry(location, lastmod=None, alternates=None, changefreq=None, priority=None):
+    """
+    Normalise get_sitemap_urls() style values to a JSON serialisable sitemap entry.
+    Alternates accept either template keys (lang_code/location) or tag keys (hreflang/href).
+    """
+    return {
+        "location": location,
+        "lastmod": _format_lastmod(lastmod),
+        "changefreq": changefreq,
+        "priority": str(priority) if priority else None,
+        "alternates": [
+            {
+                "lang_code": alternate.get("lang_code", alternate.get("hreflang")),
+                "location": alternate.get("location", alternate.get("href")),
+            }
+            for alternate in (alternates or [])
+        ],
+    }
+
+
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    f'<urlset xmlns="{SITEMAP_NS}" xmlns:xhtml="{XHTML_NS}">\n'
+)
+URLSET_CLOSE = "</urlset>\n"
+
+
+@contextmanager
+def atomic_open(path, mode="w"):
+    """
+    Open a temp file in the same folder as path for writing, renamed over path on success,
+    so readers never see a half written file.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".sitemap-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else "utf-8") as file:
+            yield file
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class UrlsetWriter:
+    """
+    Incremental <urlset> writer, each entry is serialised and written as it arrives.
+    Output goes to a temp file which is renamed over path on close(), abort() discards it.
+    Tracks the entry count and most recent lastmod written.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.lastmod = None
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, self.temp_path = tempfile.mkstemp(dir=folder, prefix=".sitemap-", suffix=".tmp")
+        self.file = os.fdopen(fd, "w", encoding="utf-8")
+        self.file.write(URLSET_OPEN)
+
+    def write(self, entry):
+        self.file.write(url_element(entry))
+        self.count += 1
+        if entry.get("lastmod") and (not self.lastmod or entry["lastmod"] > self.lastmod):
+            self.lastmod = entry["lastmod"]
+
+    def close(self):
+        self.file.write(URLSET_CLOSE)
+        self.file.close()
+        os.chmod(self.temp_path, 0o644)
+        os.replace(self.temp_path, self.path)
+        write_gzip(self.path)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_gzip(path):
+    """
+    Keep a precompressed <path>.gz next to a sitemap file for SitemapView to serve,
+    written after path so an up to date .gz is never older than the file it compresses.
+    Disable with SITEMAP_GZIP = False.
+    """
+    if not getattr(settings, "SITEMAP_GZIP", True):
+        return
+    with open(path, "rb") as source, atomic_open(f"{path}.gz", "wb") as target:
+        with gzip.GzipFile(fileobj=target, mode="wb", compresslevel=6, mtime=0) as compressed:
+            shutil.copyfileobj(source, compressed)
+
+
+def write_urlset(path, entries):
+    """
+    Write entries to path as a <urlset>, one <url> at a time.
+    """
+    with UrlsetWriter(path) as writer:
+        for entry in entries:
+            writer.write(entry)
+
+
+def iter_site_entries(site, chunk_size=None):
+    """
+    Yield (page, entry) for every live, public page in site, streamed in chunks of SITEMAP_CHUNK_SIZE.
+    Chunks are keyed on tree path rather than OFFSET and each chunk resolves specific pages
+    with one query per content type, so memory stays bounded whatever the size of the site.
+    """
+    chunk_size = chunk_size or getattr(settings, "SITEMAP_CHUNK_SIZE", 500)
+    queryset = (
+        site.root_page.get_descendants(inclusive=True).live().public().order_by("path")
+    )
+    last_path = ""
+    while True:
+        chunk = list(queryset.filter(path__gt=last_path)[:chunk_size].values_list("pk", "path", "content_type_id"))
+        if not chunk:
+            break
+        last_path = chunk[-1][1]
+        for page in _specific_pages(chunk):
+            urls = page.get_sitemap_urls()
+            if urls:
+                yield page, make_entry(**urls[0])
+
+
+def _specific_pages(rows):
+    """Resolve (pk, path, content_type_id) rows to specific pages in path order, one query per content type"""
+    pks_by_type = {}
+    for pk, _, content_type_id in rows:
+        pks_by_type.setdefault(content_type_id, []).append(pk)
+    pages = {}
+    for content_type_id, pks in pks_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        pages.update(model.objects.filter(pk__in=pks).defer_streamfields().in_bulk())
+    return [pages[pk] for pk, _, _ in rows if pk in pages]
+
+
+def url_element(entry):
+    """Serialise an entry to a <url> element string"""
+    parts = [f"<url><loc>{escape(entry['location'])}</loc>"]
+    if entry.get("lastmod"):
+        parts.append(f"<lastmod>{escape(entry['lastmod'])}</lastmod>")
+    if entry.get("changefreq"):
+        parts.append(f"<changefreq>{escape(entry['changefreq'])}</changefreq>")
+    if entry.get("priority"):
+        parts.append(f"<priority>{escape(entry['priority'])}</priority>")
+    for alternate in entry.get("alternates") or []:
+        parts.append(
+            f'<xhtml:link rel="alternate" hreflang={quoteattr(alternate["lang_code"])} '
+            f'href={quoteattr(alternate["location"])}/>'
+        )
+    parts.append("</url>\n")
+    return "".join(parts)
+
+
+def _findtext(element, name):
+    text = element.findtext(_tag(name))
+    return text.strip() if text else None
+
+
+def read_urlset(path):
+    """
+    Stream <url> entries from a sitemap file without holding the whole tree in memory.
+    """
+    for _, element in etree.iterparse(path, events=("end",), tag=_tag("url")):
+        entry = {
+            "location": _findtext(element, "loc") or "",
+            "lastmod": _findtext(element, "lastmod"),
+            "changefreq": _findtext(element, "changefreq"),
+            "priority": _findtext(element, "priority"),
+            "alternates": [
+                {"lang_code": link.get("hreflang"), "location": link.get("href")}
+                for link in element.iterfind(_tag("link", XHTML_NS))
+            ],
+        }
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        if entry["location"]:
+            yield entry
+
+
+class FileLock:
+    """
+    Re-entrant cross-process lock held on <path> for the duration of a with block,
+    stops several server processes rewriting the same sitemap files at once.
+    Not thread safe on its own, SitemapStore always takes its thread lock first.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        if self._depth == 0:
+            self._file = open(self.path, "a+")
+            _lock_file(self._file)
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_file(self._file)
+            self._file.close()
+            self._file = None
+
+
+def _lock_file(file):
+    if fcntl:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(file):
+    if fcntl:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SitemapStore:
+    """
+    In memory index of a sitemap file keyed on <loc> with an append-only change journal.
+    Upserts and deletes are O(1): the index is updated and one line appended to
+    <sitemap_path>.journal. The journal is compacted into the xml file, either by the
+    SitemapWorker after each flush or by a debounced timer (SITEMAP_COMPACT_DELAY) for direct calls,
+    after which the journal is truncated.
+    Changes take <sitemap_path>.lock so other processes' journal lines and compactions are
+    picked up by refresh() before each change rather than overwritten.
+    """
+
+    def __init__(self, sitemap_path):
+        self.sitemap_path = sitemap_path
+        self.journal_path = f"{sitemap_path}.journal"
+        self.entries = {}
+        self.lock = threading.RLock()
+        self.file_lock = FileLock(f"{sitemap_path}.lock")
+        self._loaded = False
+        self._xml_mtime = None
+        self._journal_offset = 0
+        self._compact_timer = None
+        # optional callable(store) run after each compaction, e.g. to update a sitemap index
+        self.on_compact = None
+
+    @contextmanager
+    def locked(self):
+        """Hold both the thread and cross-process lock"""
+        with self.lock, self.file_lock:
+            yield self
+
+    def load(self):
+        with self.lock:
+            self.entries = {}
+            self._xml_mtime = None
+            self._journal_offset = 0
+            if os.path.exists(self.sitemap_path):
+                self._xml_mtime = os.path.getmtime(self.sitemap_path)
+                for entry in read_urlset(self.sitemap_path):
+                    self.entries[entry["location"]] = entry
+            self._replay_journal()
+            self._loaded = True
+
+    def refresh(self):
+        """Reload if the xml has been rewritten elsewhere, otherwise replay new journal lines"""
+        with self.lock:
+            if not self._loaded or self._xml_changed():
+                self.load()
+            else:
+                self._replay_journal()
+
+    def _xml_changed(self):
+        mtime = os.path.getmtime(self.sitemap_path) if os.path.exists(self.sitemap_path) else None
+        return mtime != self._xml_mtime
+
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            self._journal_offset = 0
+            return
+        if os.path.getsize(self.journal_path) < self._journal_offset:
+            # truncated by another process's compaction, xml reload will follow
+            self._journal_offset = 0
+        with open(self.journal_path, "rb") as journal:
+            journal.seek(self._journal_offset)
+            for line in journal:
+                if not line.endswith(b"\n"):
+                    # partial line from an interrupted write, pick up on next replay
+                    break
+                self._journal_offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(record)
+
+    def _apply(self, record):
+        if record["op"] == "upsert":
+            self.entries[record["entry"]["location"]] = record["entry"]
+        elif record["op"] == "delete":
+            self.entries.pop(record["location"], None)
+
+    def _append(self, records):
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(lines)
+        self._journal_offset += len(lines.encode("utf-8"))
+
+    def get(self, location):
+        with self.lock:
+            if not self._loaded:
+                self.load()
+            return self.entries.get(location)
+
+    def apply(self, records):
+        """
+        Journal and apply a batch of {"op": "upsert", "entry": ...} / {"op": "delete", "location": ...}
+        records in a single write. Deletes for locations not in the index are dropped.
+        Returns the number of records applied.
+        """
+        with self.locked():
+            self.refresh()
+            records = [
+                record for record in records
+                if record["op"] == "upsert" or record["location"] in self.entries
+            ]
+            if records:
+                self._append(records)
+                for record in records:
+                    self._apply(record)
+            return len(records)
+
+    def upsert(self, entry):
+        self.apply([{"op": "upsert", "entry": entry}])
+        self.schedule_compaction()
+
+    def delete(self, location):
+        if not self.apply([{"op": "delete", "location": location}]):
+            return False
+        self.schedule_compaction()
+        return True
+
+    def replace(self, entries):
+        """Replace the whole index with entries, used after full regeneration"""
+        with self.locked():
+            write_urlset(self.sitemap_path, entries)
+            self.reset()
+
+    def reset(self):
+        """
+        Discard the journal and in memory index after the xml has been rewritten externally,
+        the index is reloaded lazily on next use.
+        """
+        with self.locked():
+            self._cancel_compaction()
+            self._truncate_journal()
+            self.entries = {}
+            self._loaded = False
+
+    def compact(self):
+        """Write the index to the xml file and truncate the journal"""
+        with self.locked():
+            self._cancel_compaction()
+            self.refresh()
+            write_urlset(self.sitemap_path, self.entries.values())
+            self._truncate_journal()
+            self._xml_mtime = os.path.getmtime(self.sitemap_path)
+            if self.on_compact:
+                self.on_compact(self)
+
+    def _truncate_journal(self):
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_offset = 0
+
+    def schedule_compaction(self):
+        """Debounced background compaction, repeated changes within the delay share one write"""
+        delay = getattr(settings, "SITEMAP_COMPACT_DELAY", 5)
+        with self.lock:
+            if self._compact_timer:
+                return
+            self._compact_timer = threading.Timer(delay, self._background_compact)
+            self._compact_timer.daemon = True
+            self._compact_timer.start()
+
+    def _cancel_compaction(self):
+        if self._compact_timer:
+            self._compact_timer.cancel()
+            self._compact_timer = None
+
+    def _background_compact(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logging.error(f"Sitemap compaction failed for {self.sitemap_path}: {e}")
+
+    @property
+    def lastmod(self):
+        """Most recent lastmod of any entry in the store"""
+        with self.lock:
+            if not self._loaded:
+                self.load()
+            return max((entry["lastmod"] for entry in self.entries.values() if entry["lastmod"]), default=None)
+
+    @property
+    def has_pending_changes(self):
+        return os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0
+
+
+def get_store(sitemap_path):
+    with _stores_lock:
+        key = os.path.abspath(sitemap_path)
+        if key not in _stores:
+            _stores[key] = SitemapStore(sitemap_path)
+        return _stores[key]
+
+
+class SitemapWorker:
+    """
+    Single long-lived background thread applying queued sitemap changes.
+    Changes arriving within SITEMAP_FLUSH_INTERVAL seconds of the first are coalesced by store and
+    url (the last change to a url wins), then each store is journalled and compacted with one write.
+    The queue is bounded by SITEMAP_QUEUE_SIZE; when full, the change is applied in the caller instead.
+    """
+    def __init__(self, interval=None, maxsize=None):
+        self.interval = interval if interval is not None else getattr(settings, "SITEMAP_FLUSH_INTERVAL", 2)
+        self.queue = queue.Queue(maxsize=maxsize or getattr(settings, "SITEMAP_QUEUE_SIZE", 1000))
+        self.thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self.thread and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self.run, name="sitemap-worker", daemon=True)
+            self.thread.start()
+
+    def submit(self, store, record):
+        self.start()
+        try:
+            self.queue.put_nowait((store, record))
+        except queue.Full:
+            logging.warning(f"Sitemap queue full, writing {store.sitemap_path} synchronously")
+            self.flush({store: {_record_key(record): record}})
+
+    def stop(self, timeout=None):
+        """Flush anything queued and stop the worker thread"""
+        if self.thread and self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                break
+            pending = {}
+            self._collect(pending, item)
+            deadline = time.monotonic() + self.interval
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                self._collect(pending, item)
+            self.flush(pending)
+
+    def _collect(self, pending, item):
+        store, record = item
+        pending.setdefault(store, {})[_record_key(record)] = record
+
+    def flush(self, pending):
+        for store, records in pending.items():
+            try:
+                if store.apply(records.values()):
+                    store.compact()
+            except Exception as e:
+                logging.error(f"Sitemap flush failed for {store.sitemap_path}: {e}")
+
+
+def _record_key(record):
+    return record["entry"]["location"] if record["op"] == "upsert" else record["location"]
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """Per-process SitemapWorker, created on first use so it starts after any server fork"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = SitemapWorker()
+            atexit.register(_worker.stop, 10)
+        return _worker
 
 
 class SiteMap:
@@ -11,73 +562,26 @@ class SiteMap:
     Class for large sitemaps. Writes sitemap to file, use Django view to serve sitemap.
     Optional sitemap_path defines the path to the sitemap you are working with, defaults to sitemap.xml in web root.
     For wagtail pages, use add_page/remove_page to add/amend/remove relevant entry. Call from appropriate hooks.
-    generate_sitemap_from_page will create a sitemap for the site the passed page is in. 
+    generate_sitemap_from_page will create a sitemap for the site the passed page is in.
+    Entries are held in an indexed SitemapStore, changes are journalled and compacted into the xml in the background.
     """
     def __init__(self, sitemap_path="sitemap.xml"):
         self.sitemap_path = sitemap_path
-        self.soup = None
-
-    def _get_soup(self):
-        """Read and parse sitemap xml"""
-        with open(self.sitemap_path, "r") as file:
-            self.soup = BeautifulSoup(file, "xml")
+        self.store = get_store(sitemap_path)
 
     def find_url_entry(self, location):
         """
-        Look for <url> element with <loc> child that has value=location
-        Return element if found or None
+        Look for entry with location
+        Return entry dict if found or None
         """
-        if not self.soup:
-            self._get_soup()
-
-        def match_loc(element):
-            return element.name == "loc" and element.string.strip() == location
-
-        match = self.soup.find(match_loc)
-        return match.parent if match else None
+        return self.store.get(location)
 
     def add_url(self, location, lastmod, alternates=None, changefreq=None, priority=None):
         """
-        Look for <url> element with <loc> child that has value=location
-        Add <url> element with passed parameters if not found, otherwise amend existing element
+        Add entry with passed parameters if not found, otherwise amend existing entry
         """
         try:
-            url_entry = self.find_url_entry(location)
-            if url_entry:
-                url_entry.clear()
-            else:
-                url_entry = self.soup.new_tag("url")
-                self.soup.urlset.insert(0, url_entry)
-
-            # Populate the <url> element with the supplied values
-            loc_tag = self.soup.new_tag("loc")
-            loc_tag.string = location
-            url_entry.append(loc_tag)
-
-            lastmod_tag = self.soup.new_tag("lastmod")
-            lastmod_tag.string = (
-                lastmod if isinstance(lastmod, str) else lastmod.date().isoformat()
-            )
-            url_entry.append(lastmod_tag)
-
-            if alternates:
-                for alternate in alternates:
-                    alternate_tag = self.soup.new_tag(
-                        "xhtml:link", hreflang=alternate["hreflang"], href=alternate["href"]
-                    )
-                    url_entry.append(alternate_tag)
-
-            if changefreq:
-                changefreq_tag = self.soup.new_tag("changefreq")
-                changefreq_tag.string = changefreq
-                url_entry.append(changefreq_tag)
-
-            if priority:
-                priority_tag = self.soup.new_tag("priority")
-                priority_tag.string = priority
-                url_entry.append(priority_tag)
-
-            self.save()
+            self.store.upsert(make_entry(location, lastmod, alternates, changefreq, priority))
         except Exception as e:
             err = f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}"
             logging.error(err)
@@ -86,14 +590,12 @@ class SiteMap:
     def add_page(self, page, thread=True):
         """
         Add or ammend page entry using page get_sitemap_urls
-        thread=True passes execution back immediately without waiting for completion
+        thread=True queues the change for the background SitemapWorker and returns immediately
         """
         if os.path.exists(self.sitemap_path):
             if thread:
-                threading.Thread(
-                    target=self.add_url,
-                    kwargs=page.get_sitemap_urls()[0],
-                ).start()
+                entry = make_entry(**page.get_sitemap_urls()[0])
+                get_worker().submit(self.store, {"op": "upsert", "entry": entry})
             else:
                 self.add_url(**page.get_sitemap_urls()[0])
         else:
@@ -101,23 +603,18 @@ class SiteMap:
 
     def remove_url(self, location):
         """
-        Remove <url> element that has <loc> value matching location
+        Remove entry that has location
         """
-        url_entry = self.find_url_entry(location)
-        if url_entry:
-            url_entry.extract()
-            self.save()
-            return True
-        return False
+        return self.store.delete(location)
 
     def remove_page(self, page, thread=True):
         """
         Remove page entry
-        thread=True passes execution back immediately without waiting for completion
+        thread=True queues the change for the background SitemapWorker and returns immediately
         """
         if os.path.exists(self.sitemap_path):
             if thread:
-                threading.Thread(target=self.remove_url, args=(page.full_url,)).start()
+                get_worker().submit(self.store, {"op": "delete", "location": page.full_url})
             else:
                 self.remove_url(page.full_url)
         else:
@@ -125,11 +622,9 @@ class SiteMap:
 
     def save(self):
         """
-        Save sitemap soup object to file
+        Compact pending journal changes into the sitemap file
         """
-        if self.soup:
-            with open(self.sitemap_path, "w") as file:
-                file.write(str(self.soup))
+        self.store.compact()
 
     def generate_sitemap_from_page(self, page, thread=True):
         """
@@ -148,22 +643,177 @@ class SiteMap:
 
     def generate_sitemap(self, site):
         """
-        Creates a new sitemap for the passed site 
+        Creates a new sitemap for the passed site
         For multi-lingual, repeat for each of page.get_site().root_page.siblings
         """
-        urlset = []
-        home = site.root_page
-        for child_page in (
-            home.get_descendants(inclusive=True).defer_streamfields().live().public().specific()
-        ):
-            urlset.append(child_page.get_sitemap_urls()[0])
+        writer = UrlsetWriter(self.sitemap_path)
+        try:
+            for _, entry in iter_site_entries(site):
+                writer.write(entry)
+        except BaseException:
+            writer.abort()
+            raise
+        with self.store.locked():
+            writer.close()
+            self.store.reset()
+
+
+class SiteMapIndex:
+    """
+    Sitemap index mode for large or multi-site installs, enable with SITEMAP_SHARDED = True.
+    Each Site gets a folder <SITEMAP_ROOT>/<site.pk>/ containing sitemap.xml (a <sitemapindex>)
+    and one sitemap-<page type>-<n>.xml shard per page type per SITEMAP_SHARD_SIZE block of page ids.
+    Shard membership depends only on the page, so publishing rewrites just the shard it is in,
+    and each shard stays under the 50,000 url protocol limit.
+    Same public API as SiteMap.
+    """
+    def __init__(self, root=None, shard_size=None):
+        self.root = root or getattr(settings, "SITEMAP_ROOT", "sitemaps")
+        self.shard_size = shard_size or getattr(settings, "SITEMAP_SHARD_SIZE", 10000)
+
+    def site_folder(self, site):
+        return os.path.join(self.root, str(site.pk))
+
+    def index_path(self, site):
+        return os.path.join(self.site_folder(site), "sitemap.xml")
+
+    def manifest_path(self, site):
+        return os.path.join(self.site_folder(site), "sitemap.json")
+
+    def shard_path(self, site, shard):
+        return os.path.join(self.site_folder(site), f"sitemap-{shard}.xml")
+
+    def shard_name(self, page):
+        model = ContentType.objects.get_for_id(page.content_type_id).model
+        return f"{model}-{page.pk // self.shard_size}"
+
+    def get_shard(self, site, shard):
+        store = get_store(self.shard_path(site, shard))
+        store.on_compact = lambda store: self.update_index(
+            site, {shard: (store.lastmod or "") if store.entries else None}
+        )
+        return store
+
+    def read_manifest(self, site):
+        """Shard name -> lastmod for every non-empty shard of site"""
+        try:
+            with open(self.manifest_path(site), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def update_index(self, site, shards, replace=False):
+        """
+        Merge shards ({name: lastmod}) into the manifest and rewrite the sitemap index.
+        A lastmod of None drops an (empty) shard from the index.
+        """
+        with _manifest_lock, FileLock(os.path.join(self.site_folder(site), "sitemap.lock")):
+            manifest = {} if replace else self.read_manifest(site)
+            manifest.update(shards)
+            manifest = {name: lastmod for name, lastmod in sorted(manifest.items()) if lastmod is not None}
+            with atomic_open(self.manifest_path(site)) as file:
+                json.dump(manifest, file, indent=1)
+            with atomic_open(self.index_path(site)) as file:
+                file.write(self._render_index(site, manifest))
+            write_gzip(self.index_path(site))
+
+    def _render_index(self, site, manifest):
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n', f'<sitemapindex xmlns="{SITEMAP_NS}">\n']
+        for shard, lastmod in manifest.items():
+            location = site.root_url + reverse("sitemap_shard", args=[shard])
+            lastmod = f"<lastmod>{escape(lastmod)}</lastmod>" if lastmod else ""
+            parts.append(f"<sitemap><loc>{escape(location)}</loc>{lastmod}</sitemap>\n")
+        parts.append("</sitemapindex>\n")
+        return "".join(parts)
+
+    def add_page(self, page, thread=True):
+        """
+        Add or ammend page entry in its shard using page get_sitemap_urls
+        thread=True queues the change for the background SitemapWorker and returns immediately
+        """
+        site = page.get_site()
+        if not os.path.exists(self.index_path(site)):
+            return self.generate_sitemap_from_site(site, thread)
+        urls = page.get_sitemap_urls()
+        if urls:
+            self._submit(site, page, {"op": "upsert", "entry": make_entry(**urls[0])}, thread)
+
+    def remove_page(self, page, thread=True):
+        """
+        Remove page entry from its shard
+        thread=True queues the change for the background SitemapWorker and returns immediately
+        """
+        site = page.get_site()
+        if not os.path.exists(self.index_path(site)):
+            return self.generate_sitemap_from_site(site, thread)
+        self._submit(site, page, {"op": "delete", "location": page.full_url}, thread)
+
+    def _submit(self, site, page, record, thread):
+        store = self.get_shard(site, self.shard_name(page))
+        if thread:
+            get_worker().submit(store, record)
+        elif store.apply([record]):
+            store.compact()
+
+    def _run(self, target, thread, *args):
+        if thread:
+            threading.Thread(target=target, args=args).start()
+        else:
+            target(*args)
+
+    def generate_sitemap_from_page(self, page, thread=True):
+        """
+        Generate sitemap index for site that passed page is on, thread=true will run in background
+        """
+        self.generate_sitemap_from_site(page.get_site(), thread)
+
+    def generate_sitemap_from_site(self, site, thread=True):
+        """
+        Generate sitemap index and shards for site, thread=true will run in background
+        """
+        self._run(self.generate_sitemap, thread, site)
+
+    def generate_sitemaps(self, thread=True):
+        """
+        Generate sitemap index and shards for every Site
+        """
+        from wagtail.models import Site
+        for site in Site.objects.all():
+            self.generate_sitemap_from_site(site, thread)
+
+    def generate_sitemap(self, site):
+        """
+        Rebuild every shard for the passed site, remove stale shard files and rewrite the index
+        """
+        os.makedirs(self.site_folder(site), exist_ok=True)
+        writers = {}
         try:
-            urlset.remove([])
-        except Exception:
-            pass
+            for page, entry in iter_site_entries(site):
+                shard = self.shard_name(page)
+                if shard not in writers:
+                    writers[shard] = UrlsetWriter(self.shard_path(site, shard))
+                writers[shard].write(entry)
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+
+        for shard, writer in writers.items():
+            store = get_store(writer.path)
+            with store.locked():
+                writer.close()
+                store.reset()
+        for shard in set(self.read_manifest(site)) - set(writers):
+            get_store(self.shard_path(site, shard)).replace([])
+        self.update_index(
+            site, {shard: writer.lastmod or "" for shard, writer in writers.items()}, replace=True
+        )
 
-        template = get_template("sitemap.xml")
-        sitemap_xml = render_to_string(template.origin.name, {"urlset": urlset})
 
-        with open(self.sitemap_path, "w") as file:
-            file.write(sitemap_xml)
+def get_sitemap():
+    """
+    Return the configured sitemap writer, SiteMapIndex if SITEMAP_SHARDED is set, otherwise SiteMap
+    """
+    if getattr(settings, "SITEMAP_SHARDED", False):
+        return SiteMapIndex()
+    return SiteMap()
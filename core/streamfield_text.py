@@ -0,0 +1,80 @@
+"""
+Render-free text extraction for StreamFields.
+Walks the raw JSON stream data alongside the block definitions instead of rendering templates,
+rich text fragments are converted to text with lxml.
+
+Blocks control what is extracted:
+    - a StructBlock Meta option text_fields lists the child blocks that carry visible text,
+      text_fields = () excludes the block entirely (e.g. code blocks)
+    - a get_raw_text(value, strip_tags) method on the block returns an iterable of text fragments
+      for the block's raw value, for blocks whose text isn't held in child blocks (e.g. CSV data)
+Otherwise StreamBlock, ListBlock and StructBlock children are walked, RichTextBlock values
+converted to text and CharBlock/TextBlock values included as is. All other blocks are ignored, in BlogPage
+content those are choices, booleans, numbers, images and embeds, which render no visible text. Chooser blocks
+that render text (e.g. product.blocks.ProductChooserBlock) define get_raw_text.
+"""
+from lxml import etree, html
+from wagtail.blocks import (CharBlock, ListBlock, RichTextBlock, StreamBlock,
+                            StructBlock, TextBlock)
+
+DEFAULT_STRIP_TAGS = ("style", "script", "code")
+
+
+def html_to_text(fragment, strip_tags=DEFAULT_STRIP_TAGS):
+    """
+    Return the text content of an html fragment, elements in strip_tags are removed with their content.
+    Text nodes are joined with spaces so block elements don't run together.
+    """
+    if not fragment or not fragment.strip():
+        return ""
+    try:
+        root = html.fragment_fromstring(fragment, create_parent="div")
+    except etree.ParserError:
+        return ""
+    if strip_tags:
+        etree.strip_elements(root, *strip_tags, with_tail=False)
+    return " ".join(root.itertext())
+
+
+def iter_block_text(block, value, strip_tags=DEFAULT_STRIP_TAGS):
+    """Yield text fragments from the raw (JSON) value of block"""
+    if value is None or value == "":
+        return
+
+    get_raw_text = getattr(block, "get_raw_text", None)
+    if get_raw_text:
+        yield from get_raw_text(value, strip_tags)
+
+    elif isinstance(block, StreamBlock):
+        for item in value:
+            child_block = block.child_blocks.get(item.get("type"))
+            if child_block:
+                yield from iter_block_text(child_block, item.get("value"), strip_tags)
+
+    elif isinstance(block, ListBlock):
+        for item in value:
+            if block._item_is_in_block_format(item):
+                item = item["value"]
+            yield from iter_block_text(block.child_block, item, strip_tags)
+
+    elif isinstance(block, StructBlock):
+        text_fields = getattr(block.meta, "text_fields", None)
+        names = block.child_blocks.keys() if text_fields is None else text_fields
+        for name in names:
+            yield from iter_block_text(block.child_blocks[name], value.get(name), strip_tags)
+
+    elif isinstance(block, RichTextBlock):
+        yield html_to_text(value, strip_tags)
+
+    elif isinstance(block, (CharBlock, TextBlock)):
+        yield str(value)
+
+
+def extract_streamfield_text(stream_value, strip_tags=DEFAULT_STRIP_TAGS):
+    """
+    Return the visible text of a StreamValue without rendering it.
+    Uses raw_data so lazy stream values are never converted to python block values.
+    """
+    return " ".join(
+        text for text in iter_block_text(stream_value.stream_block, stream_value.raw_data, strip_tags) if text
+    )
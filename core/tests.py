@@ -1,60 +1,427 @@
-import random
-from datetime import timedelta
-from django.utils import timezone
-from .sitemap import SiteMap
-from .views import SitemapView
+import gzip
+import json
+import os
+import tempfile
+import threading
 import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils.http import http_date
+from django.utils.timezone import now
+from wagtail.embeds.embeds import get_embed_hash
+from wagtail.embeds.finders import get_finders
+from wagtail.embeds.models import Embed
+
+from blocks.views.external_link import MetadataError, get_metadata
+from core.embeds import get_embed_attrs, get_stale_embeds, refresh_embeds
+from core.link_metadata import LinkMetadata
+from core.oembedfinder import YouTubeThumbnail, _best_youtube_thumbnail
+from core.sitemap import SitemapStore, make_entry, read_urlset, write_urlset
+from core.views import SitemapView, accepts_gzip
+
+# Create your tests here.
+# Sitemap timings have moved to core.benchmarks, run with ./manage.py benchmark_sitemap
+
+
+def oembed_response(url):
+    """Stub provider data for url, videos.test/unchanged-* always returns the same data"""
+    name = url.rsplit("/", 1)[-1]
+    return {
+        "type": "video",
+        "title": name if name.startswith("unchanged") else f"{name} (new title)",
+        "author_name": "Author",
+        "provider_name": "Videos",
+        "thumbnail_url": f"https://videos.test/{name}.jpg",
+        "width": 640,
+        "height": 360,
+        "html": f'<iframe src="https://videos.test/embed/{name}"></iframe>',
+    }
+
+
+class OEmbedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = parse_qs(urlparse(self.path).query)["url"][0]
+        self.server.requests.append((url, time.monotonic()))
+        if "/missing-" in url:
+            self.send_error(404)
+            return
+        body = json.dumps(oembed_response(url)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class RefreshEmbedsTests(TestCase):
+    """refresh_embeds against a local stand-in oEmbed provider"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), OEmbedHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        finders = [{
+            "class": "wagtail.embeds.finders.oembed",
+            "providers": [{
+                "endpoint": f"http://127.0.0.1:{cls.server.server_port}/oembed",
+                "urls": [r"^https://videos\.test/.+$"],
+            }],
+        }]
+        cls.settings_override = override_settings(WAGTAILEMBEDS_FINDERS=finders)
+        cls.settings_override.enable()
+        get_finders.cache_clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        get_finders.cache_clear()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests.clear()
+
+    def create_embed(self, name, **fields):
+        url = f"https://videos.test/{name}"
+        embed = Embed.objects.create(
+            url=url, hash=name, **{**oembed_response(f"https://videos.test/unchanged-{name}"), "title": "Old", **fields}
+        )
+        if name.startswith("unchanged"):
+            Embed.objects.filter(pk=embed.pk).update(**oembed_response(url))
+        # last_updated is auto_now
+        Embed.objects.filter(pk=embed.pk).update(last_updated=now() - timedelta(days=30))
+        return Embed.objects.get(pk=embed.pk)
+
+    def test_updated_unchanged_and_failed(self):
+        changed = self.create_embed("changed")
+        unchanged = self.create_embed("unchanged")
+        missing = self.create_embed("missing-video")
+        fresh = self.create_embed("fresh")
+        Embed.objects.filter(pk=fresh.pk).update(last_updated=now())
+
+        summary = refresh_embeds(get_stale_embeds(), rate=0)
+
+        self.assertEqual(summary, {"updated": 1, "unchanged": 1, "failed": 1})
+        self.assertEqual(len(self.server.requests), 3)
+        changed.refresh_from_db()
+        self.assertEqual(changed.title, "changed (new title)")
+        self.assertGreater(changed.last_updated, now() - timedelta(minutes=1))
+        unchanged.refresh_from_db()
+        self.assertGreater(unchanged.last_updated, now() - timedelta(minutes=1))
+        # failed rows keep their data and stay stale, so the next run retries them
+        missing.refresh_from_db()
+        self.assertEqual(missing.title, "Old")
+        self.assertEqual(list(get_stale_embeds()), [missing])
+
+    def test_dry_run(self):
+        embed = self.create_embed("changed")
+        summary = refresh_embeds([embed], rate=0, dry_run=True)
+        self.assertEqual(summary, {"updated": 1})
+        embed.refresh_from_db()
+        self.assertEqual(embed.title, "Old")
+
+    def test_rate_limited(self):
+        embeds = [self.create_embed(f"video-{i}") for i in range(5)]
+        refresh_embeds(embeds, workers=5, rate=20)
+        times = sorted(timestamp for url, timestamp in self.server.requests)
+        self.assertEqual(len(times), 5)
+        # 5 requests at 20/s span at least 4 intervals of 50ms
+        self.assertGreaterEqual(times[-1] - times[0], 0.19)
+
+    def test_command(self):
+        self.create_embed("changed")
+        self.create_embed("missing-video")
+        out = StringIO()
+        call_command("refresh_embeds", "--rate", "0", stdout=out)
+        self.assertIn("Refreshed 2 embeds: 1 updated, 0 unchanged, 1 failed", out.getvalue())
+
+    def test_embed_attrs_follow_refresh(self):
+        embed = self.create_embed("changed")
+        Embed.objects.filter(pk=embed.pk).update(hash=get_embed_hash(embed.url))
+        embed.refresh_from_db()
+        self.assertEqual(get_embed_attrs(embed.url)["title"], "Old")
+        # the cached attrs of the old row version are not read again
+        refresh_embeds([embed], rate=0)
+        self.assertEqual(get_embed_attrs(embed.url)["title"], "changed (new title)")
+
+
+class YouTubeThumbnailTests(TestCase):
+    """Thumbnail probe results stored by video id"""
+
+    def probe(self, video_id, valid=(), reprobe=False):
+        def is_valid(url):
+            return url.rsplit("/", 1)[-1] in valid
+
+        with mock.patch("core.oembedfinder._is_youtube_thumbnail", side_effect=is_valid) as probe:
+            best = _best_youtube_thumbnail(video_id, reprobe=reprobe)
+        return best, probe.call_count
+
+    def test_choice_stored(self):
+        self.assertEqual(self.probe("abc", ("sddefault.jpg", "default.jpg")), ("https://img.youtube.com/vi/abc/sddefault.jpg", 5))
+        self.assertEqual(self.probe("abc"), ("https://img.youtube.com/vi/abc/sddefault.jpg", 0))
+        self.assertEqual(self.probe("abc", ("maxresdefault.jpg",), reprobe=True)[0], "https://img.youtube.com/vi/abc/maxresdefault.jpg")
+        self.assertEqual(YouTubeThumbnail.objects.get(video_id="abc").thumbnail_url, "https://img.youtube.com/vi/abc/maxresdefault.jpg")
+
+    @override_settings(YOUTUBE_THUMBNAIL_ERROR_TTL=60)
+    def test_negative_result_stored(self):
+        self.assertEqual(self.probe("none"), (None, 5))
+        self.assertEqual(self.probe("none"), (None, 0))
+        YouTubeThumbnail.objects.filter(video_id="none").update(probed_at=now() - timedelta(seconds=61))
+        self.assertEqual(self.probe("none", ("default.jpg",)), ("https://img.youtube.com/vi/none/default.jpg", 5))
+
+
+
+@override_settings(LINK_METADATA_TTL=3600, LINK_METADATA_ERROR_TTL=60)
+class LinkMetadataTests(TestCase):
+    """Metadata kept for LINK_METADATA_TTL, failed fetches for LINK_METADATA_ERROR_TTL"""
+
+    metadata = {"url": "https://example.test/page/", "title": "Page", "description": "About", "image": ""}
+
+    def get_metadata(self, url, result=None, refresh=False):
+        result = result or self.metadata
+        with mock.patch("blocks.views.external_link.fetch_metadata", side_effect=[result]) as fetch:
+            data = get_metadata(url, refresh=refresh)
+        return data, fetch.call_count
+
+    def expire(self, seconds):
+        LinkMetadata.objects.update(expires_at=now() - timedelta(seconds=seconds))
+
+    def test_ttl(self):
+        row = LinkMetadata.store("https://example.test/old/?utm_source=feed", self.metadata)
+        self.assertEqual(row.expires_at - row.fetched_at, timedelta(seconds=3600))
+        # found by the requested url, its tracking variants and the resolved url
+        for url in ("https://example.test/old/", "https://EXAMPLE.test/old/?utm_medium=x", "https://example.test/page/"):
+            with self.subTest(url=url):
+                self.assertEqual(LinkMetadata.get_cached(url), row)
+        cached = LinkMetadata.get_cached_many(["https://example.test/old/", "https://example.test/new/"])
+        self.assertEqual(cached, {"https://example.test/old/": row})
+
+        self.expire(1)
+        self.assertIsNone(LinkMetadata.get_cached("https://example.test/old/"))
+        self.assertEqual(LinkMetadata.get_cached_many(["https://example.test/old/"]), {})
+        self.assertEqual(list(LinkMetadata.objects.expired()), [row])
+
+    def test_cached_until_expired(self):
+        self.assertEqual(self.get_metadata("https://example.test/page/")[1], 1)
+        self.assertEqual(self.get_metadata("https://example.test/page/"), (self.metadata, 0))
+        self.assertEqual(self.get_metadata("https://example.test/page/", refresh=True)[1], 1)
+        self.expire(1)
+        self.assertEqual(self.get_metadata("https://example.test/page/")[1], 1)
+
+    def test_errors_cached(self):
+        error = MetadataError("Timed out fetching https://example.test/slow/.")
+        self.assertEqual(self.get_metadata("https://example.test/slow/", error), ({"error": str(error)}, 1))
+        row = LinkMetadata.objects.errors().get()
+        self.assertEqual(row.expires_at - row.fetched_at, timedelta(seconds=60))
+        # the failure is served from the cache until the error ttl runs out
+        self.assertEqual(self.get_metadata("https://example.test/slow/"), ({"error": str(error)}, 0))
+        self.expire(1)
+        data, fetches = self.get_metadata("https://example.test/slow/", {**self.metadata, "url": "https://example.test/slow/"})
+        self.assertEqual((data["title"], fetches), ("Page", 1))
+        self.assertFalse(LinkMetadata.objects.errors().exists())
+
+    def test_error_keeps_stale_metadata(self):
+        self.get_metadata("https://example.test/page/")
+        self.expire(1)
+        data, fetches = self.get_metadata("https://example.test/page/", MetadataError("Failed"))
+        self.assertEqual((data["title"], fetches), ("Page", 1))
+        row = LinkMetadata.objects.get()
+        self.assertEqual(row.error, "")
+        # retried after the error ttl rather than the full ttl
+        self.assertLessEqual(row.expires_at, now() + timedelta(seconds=60))
+        self.assertEqual(self.get_metadata("https://example.test/page/")[1], 0)
+
+
+@override_settings(SITEMAP_COMPACT_DELAY=3600)
+class SitemapStoreTests(SimpleTestCase):
+    """Journal replay and compaction, two stores on one file stand in for two processes"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "sitemap.xml")
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store._cancel_compaction()
+        self.folder.cleanup()
+
+    def get_store(self):
+        store = SitemapStore(self.path)
+        self.stores.append(store)
+        return store
+
+    def entry(self, name, lastmod="2026-01-01"):
+        return make_entry(f"https://example.test/{name}/", lastmod=lastmod)
+
+    def test_journal_replay(self):
+        store = self.get_store()
+        store.upsert(self.entry("a"))
+        store.upsert(self.entry("b"))
+        store.upsert(self.entry("a", "2026-02-01"))
+        self.assertTrue(store.delete("https://example.test/b/"))
+        self.assertFalse(store.delete("https://example.test/missing/"))
+        self.assertFalse(os.path.exists(self.path))
+
+        # a new process rebuilds the index from the journal alone
+        other = self.get_store()
+        self.assertEqual(list(other.entries), [])
+        self.assertEqual(other.get("https://example.test/a/")["lastmod"], "2026-02-01")
+        self.assertIsNone(other.get("https://example.test/b/"))
+
+        # and picks up lines appended elsewhere on refresh
+        store.upsert(self.entry("c"))
+        other.refresh()
+        self.assertIsNotNone(other.get("https://example.test/c/"))
+
+    def test_partial_journal_line(self):
+        store = self.get_store()
+        store.upsert(self.entry("a"))
+        line = json.dumps({"op": "upsert", "entry": self.entry("b")})
+        with open(store.journal_path, "a") as journal:
+            journal.write(line[:10])
+        store.refresh()
+        self.assertIsNone(store.get("https://example.test/b/"))
+        # the rest of the line arrives, replay resumes from the start of it
+        with open(store.journal_path, "a") as journal:
+            journal.write(line[10:] + "\n")
+        store.refresh()
+        self.assertIsNotNone(store.get("https://example.test/b/"))
+
+    def test_compaction(self):
+        store = self.get_store()
+        other = self.get_store()
+        other.get("https://example.test/a/")
+        for name in ("a", "b", "c"):
+            store.upsert(self.entry(name))
+        store.delete("https://example.test/b/")
+        self.assertTrue(store.has_pending_changes)
+
+        store.compact()
+        self.assertFalse(store.has_pending_changes)
+        self.assertFalse(os.path.exists(store.journal_path))
+        self.assertEqual(
+            [entry["location"] for entry in read_urlset(self.path)],
+            ["https://example.test/a/", "https://example.test/c/"],
+        )
+        self.assertTrue(os.path.exists(f"{self.path}.gz"))
+
+        # other stores reload the rewritten xml rather than replaying a truncated journal
+        store.upsert(self.entry("d"))
+        other.refresh()
+        self.assertEqual(
+            sorted(other.entries), ["https://example.test/a/", "https://example.test/c/", "https://example.test/d/"]
+        )
+        self.assertEqual(self.get_store().lastmod, "2026-01-01")
+
+
+@override_settings(SITEMAP_SHARDED=False, SITEMAP_GZIP=True)
+class SitemapViewTests(SimpleTestCase):
+    """Conditional requests and the precompressed variant, sitemap.xml is served from the working directory"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.folder = tempfile.TemporaryDirectory()
+        os.chdir(self.folder.name)
+        write_urlset("sitemap.xml", [make_entry("https://example.test/a/", lastmod="2026-01-01")])
+        with open("sitemap.xml", "rb") as sitemap:
+            self.body = sitemap.read()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def get(self, accept_encoding="", if_none_match=None, if_modified_since=None):
+        headers = {"Accept-Encoding": accept_encoding}
+        if if_none_match:
+            headers["If-None-Match"] = if_none_match
+        if if_modified_since:
+            headers["If-Modified-Since"] = if_modified_since
+        request = RequestFactory().get("/sitemap.xml", headers=headers)
+        response = SitemapView.as_view()(request)
+        if response.streaming:
+            response.content_bytes = b"".join(response.streaming_content)
+            response.close()
+        return response
+
+    def test_gzip_variant(self):
+        response = self.get(accept_encoding="br, gzip;q=0.8")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertTrue(response.headers["ETag"].endswith('-gz"'))
+        self.assertEqual(gzip.decompress(response.content_bytes), self.body)
+
+    def test_plain_variant(self):
+        for accept_encoding in ("", "br", "gzip;q=0", "*;q=0"):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get(accept_encoding=accept_encoding)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Content-Encoding", response.headers)
+                self.assertFalse(response.headers["ETag"].endswith('-gz"'))
+                self.assertEqual(response.content_bytes, self.body)
+
+    def test_stale_gzip_ignored(self):
+        # a .gz older than the sitemap is left over from a previous write
+        stat = os.stat("sitemap.xml")
+        os.utime("sitemap.xml.gz", ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        response = self.get(accept_encoding="gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.content_bytes, self.body)
+
+    def test_not_modified(self):
+        for accept_encoding in ("", "gzip"):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get(accept_encoding=accept_encoding)
+                etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+                response = self.get(accept_encoding=accept_encoding, if_none_match=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.headers["ETag"], etag)
+                self.assertEqual(self.get(accept_encoding=accept_encoding, if_modified_since=last_modified).status_code, 304)
+
+        # the etag of one representation doesn't validate the other
+        etag = self.get(accept_encoding="gzip").headers["ETag"]
+        self.assertEqual(self.get(if_none_match=etag).status_code, 200)
+
+    def test_modified(self):
+        last_modified = self.get().headers["Last-Modified"]
+        write_urlset("sitemap.xml", [make_entry("https://example.test/b/", lastmod="2026-02-01")])
+        stat = os.stat("sitemap.xml")
+        os.utime("sitemap.xml", ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        self.assertEqual(self.get(if_modified_since=last_modified).status_code, 200)
+        self.assertEqual(self.get(if_modified_since=http_date(stat.st_mtime + 3600)).status_code, 304)
 
-def generate_test_sitemap():
-    base_url = "http://localhost:8000/"
-    locs = [f"{base_url}page-{i}" for i in range(1, 10001)]
-
-    with open("test_sitemap.xml", "w") as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
-
-        for loc in locs:
-            lastmod = timezone.now() - timedelta(days=random.randint(0, 365))
-            lastmod_str = lastmod.strftime("%Y-%m-%d")
-            f.write('  <url>\n')
-            f.write(f'    <loc>{loc}</loc>\n')
-            f.write(f'    <lastmod>{lastmod_str}</lastmod>\n')
-            f.write('  </url>\n')
-
-        f.write('</urlset>\n')
-
-def test_add_page_no_thread(pg):
-    start_time = time.time()
-    SiteMap().add_page(pg, False)
-    print(f"Elapsed time: {time.time() - start_time:.6f} seconds")
-
-def test_add_page_with_thread(pg):
-    start_time = time.time()
-    SiteMap().add_page(pg)
-    print(f"Elapsed time: {time.time() - start_time:.6f} seconds")
-
-def test_remove_no_thread(pg):
-    start_time = time.time()
-    SiteMap().remove_page(pg, False)    
-    print(f"Elapsed time: {time.time() - start_time:.6f} seconds")
-
-def test_remove_with_thread(pg):
-    start_time = time.time()
-    SiteMap().remove_page(pg)    
-    print(f"Elapsed time: {time.time() - start_time: 6f} seconds")
-
-def test_sitemap_gen(pg):
-    start_time = time.time()
-    SiteMap().generate_sitemap_from_page(pg)
-    print(f"Elapsed time: {time.time() - start_time:.6f} seconds")
-
-def test_sitemap_view():
-    start_time = time.time()
-    SitemapView().get(None)
-    print(f"Elapsed time: {time.time() - start_time:.6f} seconds")
-
-def test_init_sitemap():
-    start_time = time.time()
-    SiteMap()
-    print(f"Elapsed time: {time.time() - start_time:.6f} seconds")
+    def test_missing(self):
+        os.remove("sitemap.xml")
+        with self.assertRaises(Http404):
+            self.get()
 
+    def test_accepts_gzip(self):
+        cases = {
+            "gzip": True,
+            "GZIP": True,
+            "deflate, gzip;q=0.5": True,
+            "*": True,
+            "gzip;q=0": False,
+            "gzip; q=0.0": False,
+            "gzip;q=x": False,
+            "deflate": False,
+            "": False,
+        }
+        for accept_encoding, expected in cases.items():
+            with self.subTest(accept_encoding=accept_encoding):
+                request = RequestFactory().get("/", headers={"Accept-Encoding": accept_encoding})
+                self.assertIs(accepts_gzip(request), expected)
@@ -7,7 +7,6 @@ import math
 import os
 import re
 from collections import OrderedDict
-from html import unescape
 from html.parser import HTMLParser
 
 from bs4 import BeautifulSoup
@@ -20,11 +19,20 @@ from wagtail.blocks import ListBlock
 from wagtail.blocks.stream_block import StreamValue
 from wagtail.models import Page
 
+from .streamfield_text import extract_streamfield_text
+
 
 def page_url(slug, target=None):
     pg = Page.objects.filter(slug=slug).first()
     return f'{pg.url}{"#" + target if target else ""}' if pg else ''
 
+RE_FONT_AWESOME = re.compile(r'\bfa-[^ ]*')
+RE_NEWLINES = re.compile(r'([\n]+.?)+')
+RE_SLASH_WORDS = re.compile(r'(?<=\D)/(?=\D)')
+RE_FULL_STOPS = re.compile(r'\.(?=\s)')
+RE_SPACES = re.compile(r' +')
+PUNCTUATION_TABLE = str.maketrans('', '', '!"#$%&\'()*+,-:;<=>?@[\\]^_`{|}~“”‘’–«»‹›¿¡')
+
 def get_streamfield_text(
     streamfield, 
     strip_newlines=True, 
@@ -32,17 +40,11 @@ def get_streamfield_text(
     lowercase=False,
     strip_tags=['style', 'script', 'code']
     ):
-    
-    html = streamfield.render_as_block()
-    soup = BeautifulSoup(unescape(html), "html.parser")
-
-    # strip unwanted tags tags (e.g. ['code', 'script', 'style'])
-    # <style> & <script> by default
-    if strip_tags:
-        for script in soup(strip_tags):
-            script.extract()
-
-    inner_text = ' '.join(soup.findAll(text=True))
+    """
+    Return the text content of a StreamValue.
+    Text is read from the raw stream data by core.streamfield_text, blocks are not rendered.
+    """
+    inner_text = extract_streamfield_text(streamfield, strip_tags)
 
     # replace &nbsp; with space
     inner_text = inner_text.replace('\xa0',' ')
@@ -51,24 +53,23 @@ def get_streamfield_text(
     inner_text = inner_text.replace(' & ',' and ')
 
     # strip font awesome text
-    inner_text = re.sub(r'\bfa-[^ ]*', '', inner_text)
+    inner_text = RE_FONT_AWESOME.sub('', inner_text)
 
     if strip_newlines:
-        inner_text = re.sub(r'([\n]+.?)+', ' ', inner_text)
+        inner_text = RE_NEWLINES.sub(' ', inner_text)
 
     if strip_punctuation:
         # replace xx/yy with xx yy, leave fractions (1/2)
-        inner_text = re.sub(r'(?<=\D)/(?=\D)', ' ', inner_text)
+        inner_text = RE_SLASH_WORDS.sub(' ', inner_text)
         # strip full stops, leave decimal points and point separators
-        inner_text = re.sub(r'\.(?=\s)', '', inner_text)
-        punctuation = '!"#$%&\'()*+,-:;<=>?@[\\]^_`{|}~“”‘’–«»‹›¿¡'
-        inner_text = inner_text.translate(str.maketrans('', '', punctuation))
+        inner_text = RE_FULL_STOPS.sub('', inner_text)
+        inner_text = inner_text.translate(PUNCTUATION_TABLE)
 
     if lowercase:
         inner_text = inner_text.lower()
 
     # strip excess whitespace
-    inner_text = re.sub(r' +', ' ', inner_text).strip()
+    inner_text = RE_SPACES.sub(' ', inner_text).strip()
 
     return inner_text
 
@@ -103,24 +104,30 @@ def has_role(user, groups):
         print(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")       
         return False
 
-def find_all_streamfields_with_css_class(css_class):
-    
-    found_pages = []
-    pages = Page.objects.all().specific()
-
-    for page in pages:
-
-        for item in page.__dict__.items():
-            if item[1].__class__ == StreamValue:
-                if stream_has_css_class(item[1], css_class): 
-                    found_pages.append((page, item[0]))
-                print(page.title)
-    
-    return [*set(found_pages)]
+def find_all_streamfields_with_css_class(css_class, include_drafts=False):
+    """
+    Return [(page, field name)] for live pages with StreamFields rendering css_class.
+    Reads the CSS class index built on publish (core.css_class_index), nothing is rendered.
+    The index holds published content only, pages that aren't live are left out unless include_drafts=True,
+    which renders the latest revision of each of them (slow, one render per page and field).
+    """
+    from .block_usage import get_streamfields
+    from .css_class_index import CSSClassUsage
+    found = CSSClassUsage.objects.with_css_class(css_class).page_fields()
+    if include_drafts:
+        for page in Page.objects.not_live().specific():
+            fields = get_streamfields(page.__class__)
+            if not fields:
+                continue
+            page = page.get_latest_revision_as_object()
+            found += [
+                (page, field.name) for field in fields if stream_has_css_class(getattr(page, field.name), css_class)
+            ]
+    return found
 
 def stream_has_css_class(streamvalue, css_class):
-    render = BeautifulSoup(streamvalue.render_as_block(), 'html.parser')
-    return (render.select_one(f'.{css_class}') is not None) if render else False
+    from .css_class_index import css_classes_in_stream
+    return css_class.lstrip('.') in css_classes_in_stream(streamvalue)
 
 def import_text_field_button(field):
     return '''
@@ -235,7 +242,7 @@ def list_block_instances(streamfield):
         return list
     
     if streamfield.is_lazy: 
-        streamfield.render_as_block() # force lazy object to load
+        streamfield[:] # force lazy object to load, bulk converts each block type without rendering
     return list_bound_blocks(streamfield)
 
 def block_instances_by_class(streamfield, block_class):
@@ -270,7 +277,7 @@ def block_instances_by_class(streamfield, block_class):
         except Exception:
             return ['Unable to parse class path. Try passing the class object instead.']    
     if streamfield.is_lazy: 
-        streamfield.render_as_block() # force lazy object to load
+        streamfield[:] # force lazy object to load, bulk converts each block type without rendering
 
     return find_blocks(streamfield, block_class)
 
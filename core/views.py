@@ -1,23 +1,78 @@
 import os
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.utils.cache import get_conditional_response
 from django.utils.http import http_date
 from django.views.generic import View
+from wagtail.models import Site
+
+from .sitemap import SiteMapIndex
+
+
+def accepts_gzip(request):
+    """True if Accept-Encoding allows gzip, either by name or *, with a non-zero q value"""
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        if name.lower() not in ("gzip", "*"):
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
 
 
 class SitemapView(View):
-    def get(self, request):
-        sitemap_path = "sitemap.xml"
-        with open(sitemap_path, "r") as file:
-            content = file.read()
-        last_modified = os.path.getmtime(sitemap_path)
-        response = HttpResponse(
-            content,
-            content_type="application/xml",
-            headers={
-                "X-Robots-Tag": "noindex, noodp, noarchive",
-                "last-modified": http_date(last_modified),
-                "vary": "Accept-Encoding",
-            },
+    """
+    Serve sitemap.xml, or with SITEMAP_SHARDED the sitemap index and shards for the requested Site.
+    Files are streamed, the precompressed .gz variant is sent to clients that accept gzip,
+    and If-None-Match / If-Modified-Since requests are answered with 304 when unchanged.
+    """
+    def get_sitemap_path(self, request, shard=None):
+        if getattr(settings, "SITEMAP_SHARDED", False):
+            site = Site.find_for_request(request)
+            if not site:
+                raise Http404
+            index = SiteMapIndex()
+            return index.shard_path(site, shard) if shard else index.index_path(site)
+        if shard:
+            raise Http404
+        return "sitemap.xml"
+
+    def get(self, request, shard=None):
+        sitemap_path = self.get_sitemap_path(request, shard)
+        try:
+            sitemap_stat = os.stat(sitemap_path)
+        except FileNotFoundError:
+            raise Http404
+
+        # only use the .gz if it was written after the current sitemap
+        gzip_path = f"{sitemap_path}.gz"
+        gzip_stat = os.stat(gzip_path) if os.path.exists(gzip_path) else None
+        use_gzip = bool(
+            gzip_stat and gzip_stat.st_mtime_ns >= sitemap_stat.st_mtime_ns and accepts_gzip(request)
         )
-        return response
\ No newline at end of file
+
+        # strong etag per representation, the file is only ever replaced whole so mtime + size identify it
+        etag = f'"{sitemap_stat.st_mtime_ns:x}-{sitemap_stat.st_size:x}{"-gz" if use_gzip else ""}"'
+        last_modified = int(sitemap_stat.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = FileResponse(
+                open(gzip_path if use_gzip else sitemap_path, "rb"),
+                content_type="application/xml",
+                filename=os.path.basename(sitemap_path),
+            )
+            if use_gzip:
+                response.headers["Content-Encoding"] = "gzip"
+        response.headers["X-Robots-Tag"] = "noindex, noodp, noarchive"
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
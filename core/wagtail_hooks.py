@@ -19,8 +19,10 @@ from .documents.views.chooser import viewset as document_chooser_viewset
 from .draftail_extensions import (register_block_feature,
                                   register_inline_styling)
 from .images.image_operations import ThumbnailOperation
+from .link_metadata import RefreshLinkMetadataBulkAction
+from .reports.block_usage import BlockUsageReportView
 from .reports.unpublished_changes import UnpublishedChangesReportView
-from .sitemap import SiteMap
+from .sitemap import get_sitemap
 from .utils import get_custom_icons, has_role
 
 
@@ -251,15 +253,15 @@ def register_admin_css():
 @hooks.register('after_publish_page')
 def add_page_sitemap_entry(request, page):
     if page.live and not page.view_restrictions.exists():
-        SiteMap().add_page(page)
+        get_sitemap().add_page(page)
     else:
-        SiteMap().remove_page(page)
+        get_sitemap().remove_page(page)
 
 
 @hooks.register('after_unpublish_page')
 @hooks.register('after_delete_page')
 def remove_page_sitemap_entry(request, page):
-    SiteMap().remove_page(page)
+    get_sitemap().remove_page(page)
 
 
 @hooks.register('register_image_operations')
@@ -292,3 +294,21 @@ def register_unpublished_changes_report_url():
         path('reports/unpublished-changes/results/', UnpublishedChangesReportView.as_view(
             results_only=True), name='unpublished_changes_report_results'),
     ]
+
+
+@hooks.register('register_reports_menu_item')
+def register_block_usage_report_menu_item():
+    return AdminOnlyMenuItem("Block usage", reverse('block_usage_report'), icon_name=BlockUsageReportView.header_icon, order=710)
+
+
+@hooks.register('register_admin_urls')
+def register_block_usage_report_url():
+    return [
+        path('reports/block-usage/', BlockUsageReportView.as_view(),
+             name='block_usage_report'),
+        path('reports/block-usage/results/', BlockUsageReportView.as_view(
+            results_only=True), name='block_usage_report_results'),
+    ]
+
+
+hooks.register('register_bulk_action', RefreshLinkMetadataBulkAction)
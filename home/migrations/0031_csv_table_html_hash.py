@@ -0,0 +1,161 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:01
+
+import wagtail.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0030_alter_homepage_content"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="homepage",
+            name="content",
+            field=wagtail.fields.StreamField(
+                [
+                    ("cleaned_rich_text", 0),
+                    ("csv_table", 18),
+                    ("import_text_block", 19),
+                ],
+                blank=True,
+                block_lookup={
+                    0: ("blocks.parsed_richtext.ParsedRichTextBlock", (), {}),
+                    1: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Title", "required": False},
+                    ),
+                    2: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [("h3", "H3"), ("h4", "H4"), ("h5", "H5")],
+                            "label": "Size",
+                        },
+                    ),
+                    3: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("justify", "Justified"),
+                                ("start", "Left"),
+                                ("center", "Centre"),
+                                ("end", "Right"),
+                            ],
+                            "label": "Alignment",
+                        },
+                    ),
+                    4: (
+                        "wagtail.blocks.CharBlock",
+                        (),
+                        {"label": "Optional Anchor Identifier", "required": False},
+                    ),
+                    5: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 1),
+                                ("heading_size", 2),
+                                ("alignment", 3),
+                                ("anchor_id", 4),
+                            ]
+                        ],
+                        {"label": "Optional Table Title"},
+                    ),
+                    6: (
+                        "blocks.import_text.ImportTextBlock",
+                        (),
+                        {
+                            "file_type_filter": ".csv",
+                            "help_text": "Paste in CSV data or import from .csv file",
+                            "label": "Comma Separated Data",
+                        },
+                    ),
+                    7: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 2, "label": "Float Precision"},
+                    ),
+                    8: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": True, "label": "Column Headers", "required": False},
+                    ),
+                    9: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"label": "Row Headers", "required": False},
+                    ),
+                    10: (
+                        "wagtail.blocks.BooleanBlock",
+                        (),
+                        {"default": True, "label": "Compact", "required": False},
+                    ),
+                    11: (
+                        "wagtail.blocks.RichTextBlock",
+                        (),
+                        {
+                            "editor": "minimal",
+                            "help_text": "Caption displayed beneath the table. Use as explanation or annotation.",
+                            "label": "Table Caption",
+                            "required": False,
+                        },
+                    ),
+                    12: (
+                        "wagtail.blocks.ChoiceBlock",
+                        [],
+                        {
+                            "choices": [
+                                ("justify", "Justified"),
+                                ("start", "Left"),
+                                ("center", "Centre"),
+                                ("end", "Right"),
+                            ],
+                            "label": "Caption Alignment",
+                        },
+                    ),
+                    13: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"default": 100, "label": "Table Width (%)"},
+                    ),
+                    14: (
+                        "wagtail.blocks.IntegerBlock",
+                        (),
+                        {"label": "Maximum Table Width (rem)", "required": False},
+                    ),
+                    15: ("blocks.hidden.HiddenCharBlock", (), {}),
+                    16: ("blocks.hidden.HiddenIntegerBlock", (), {}),
+                    17: ("blocks.hidden.HiddenBooleanBlock", (), {"default": True}),
+                    18: (
+                        "wagtail.blocks.StructBlock",
+                        [
+                            [
+                                ("title", 5),
+                                ("data", 6),
+                                ("precision", 7),
+                                ("column_headers", 8),
+                                ("row_headers", 9),
+                                ("compact", 10),
+                                ("caption", 11),
+                                ("caption_alignment", 12),
+                                ("width", 13),
+                                ("max_width", 14),
+                                ("html", 15),
+                                ("html_hash", 15),
+                                ("html_version", 16),
+                                ("rendered", 17),
+                            ]
+                        ],
+                        {},
+                    ),
+                    19: ("blocks.import_text.ImportTextBlock", (), {}),
+                },
+                verbose_name="Page body",
+            ),
+        ),
+    ]
@@ -1,5 +1,13 @@
 from .views import product_chooser_viewset
 
-ProductChooserBlock = product_chooser_viewset.get_block_class(
-    name="ProductChooserBlock", module_path="product.blocks",
+BaseProductChooserBlock = product_chooser_viewset.get_block_class(
+    name="BaseProductChooserBlock", module_path="product.blocks",
 )
+
+
+class ProductChooserBlock(BaseProductChooserBlock):
+    def get_raw_text(self, value, strip_tags):
+        # rendered without a template as str(product), see core.streamfield_text
+        product = self.to_python(value)
+        if product:
+            yield str(product)
@@ -17,6 +17,7 @@ urlpatterns = [
     path("documents/", include(wagtaildocs_urls)),
     path("search/", search_views.search, name="search"),
     path('sitemap.xml', SitemapView.as_view(), name='sitemap'),
+    path('sitemap-<slug:shard>.xml', SitemapView.as_view(), name='sitemap_shard'),
     path('blocks/', include('blocks.urls')),
 ]
 